@@ -0,0 +1,206 @@
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.index import ScoredQuery, SearchIndex, top_k_rows
+from app.metrics import timed
+from app.text import tokenize, tokenize_corpus
+
+
+class Postings:
+    """Rows containing a term, in increasing order, with their BM25 impacts"""
+
+    __slots__ = ("rows", "impacts", "max_impact", "_pending_rows", "_pending_impacts")
+
+    def __init__(self, rows: List[int], impacts: List[float]):
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.impacts = np.asarray(impacts, dtype=np.float32)
+        self.max_impact = float(self.impacts.max()) if len(impacts) else 0.0
+        self._pending_rows: List[int] = []
+        self._pending_impacts: List[float] = []
+
+    def append(self, row: int, impact: float) -> None:
+        self._pending_rows.append(row)
+        self._pending_impacts.append(impact)
+        self.max_impact = max(self.max_impact, impact)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Row and impact arrays, folding in rows appended since the last call"""
+        if self._pending_rows:
+            self.rows = np.concatenate([self.rows, np.asarray(self._pending_rows, dtype=np.int64)])
+            self.impacts = np.concatenate([self.impacts, np.asarray(self._pending_impacts, dtype=np.float32)])
+            self._pending_rows, self._pending_impacts = [], []
+        return self.rows, self.impacts
+
+
+class Bm25Index(SearchIndex):
+    """
+    Okapi BM25 over an inverted index of `app.text.tokenize` tokens.
+
+    Each posting stores its BM25 impact, computed with the IDF and average
+    document length of the last fit, so the largest impact in a list bounds
+    what that term can add to any document. Queries run term-at-a-time
+    MaxScore: terms are processed by decreasing bound, and once the bounds of
+    the remaining terms cannot lift an unseen document into the top k, those
+    lists are only probed for existing candidates by binary search.
+
+    Scores are divided by the query's total bound, so they fall in [0, 1] like
+    cosine similarities and `min_score` means the same thing for both engines.
+
+    Filter masks drop rows as candidates are merged, so the pruning bound is
+    the k-th best filtered score. Facet counts need every document above
+    `min_score`, so queries asking for them are scored without pruning.
+
+    Unlike the TF-IDF engine, new terms in ingested documents are indexed right
+    away; they still count as drift so the next refit recomputes their IDF.
+    """
+
+    def __init__(
+        self, refit_drift: float = 0.2, workers: int = 1, k1: float = 1.2, b: float = 0.75, pruning: bool = True
+    ):
+        super().__init__(refit_drift, workers)
+        self.k1 = k1
+        self.b = b
+        self.pruning = pruning
+        self._postings: Dict[str, Postings] = {}
+        self._idf: Dict[str, float] = {}
+        self._doc_count = 0
+        self._avg_length = 1.0
+
+    def _score_batch(
+        self, texts: List[str], top_ks: List[int], min_scores: List[float], filters: List[Optional[dict]], facet_counts: bool
+    ) -> List[ScoredQuery]:
+        return [
+            self._score(text, top_k, min_score, query_filters, facet_counts)
+            for text, top_k, min_score, query_filters in zip(texts, top_ks, min_scores, filters)
+        ]
+
+    def _score(self, text: str, top_k: int, min_score: float, filters: Optional[dict], facet_counts: bool) -> ScoredQuery:
+        no_counts = {} if facet_counts else None
+        with timed("preprocess"):
+            tokens = tokenize(text)
+        with timed("vectorize"):
+            query_terms = Counter(tokens)
+        with self._lock:
+            if not self._fitted:
+                return [], no_counts
+            lists = []
+            for term, query_tf in query_terms.items():
+                postings = self._postings.get(term)
+                if postings is not None:
+                    rows, impacts = postings.arrays()
+                    lists.append((postings.max_impact * query_tf, query_tf, rows, impacts))
+            documents = self.row_documents
+            dead_rows = self._dead_row_mask()
+            facets = self.facets
+            mask = facets.mask(filters)
+        if not lists:
+            return [], no_counts
+        pruning = self.pruning and not facet_counts
+
+        with timed("score"):
+            lists.sort(key=lambda item: item[0], reverse=True)
+            # remaining[i] bounds the score still obtainable from lists i onwards
+            remaining = np.append(np.cumsum([item[0] for item in lists][::-1])[::-1], 0.0)
+            max_score = float(remaining[0])
+            cand_rows = np.empty(0, dtype=np.int64)
+            cand_scores = np.empty(0, dtype=np.float64)
+            threshold = min_score * max_score
+
+            for i, (_, query_tf, rows, impacts) in enumerate(lists):
+                if not pruning or remaining[i] >= threshold:
+                    # An unseen document could still make the top k: scan the whole list
+                    merged_rows = np.concatenate([cand_rows, rows])
+                    merged_scores = np.concatenate([cand_scores, impacts * query_tf])
+                    cand_rows, inverse = np.unique(merged_rows, return_inverse=True)
+                    cand_scores = np.bincount(inverse, weights=merged_scores)
+                    if dead_rows is not None:
+                        alive = ~dead_rows[cand_rows]
+                        cand_rows, cand_scores = cand_rows[alive], cand_scores[alive]
+                    if mask is not None:
+                        allowed = mask[cand_rows]
+                        cand_rows, cand_scores = cand_rows[allowed], cand_scores[allowed]
+                else:
+                    # Only existing candidates can still qualify: probe them in this list
+                    positions = np.minimum(np.searchsorted(rows, cand_rows), len(rows) - 1)
+                    hits = rows[positions] == cand_rows
+                    cand_scores[hits] += impacts[positions[hits]] * query_tf
+                    viable = cand_scores + remaining[i + 1] >= threshold
+                    cand_rows, cand_scores = cand_rows[viable], cand_scores[viable]
+                if pruning and len(cand_scores) >= top_k:
+                    # Partial scores only grow, so the current k-th best is a safe bound
+                    threshold = max(threshold, float(np.partition(cand_scores, -top_k)[-top_k]))
+
+        with timed("topk"):
+            cand_scores /= max_score
+            keep = cand_scores > min_score
+            rows, scores = top_k_rows(cand_rows[keep], cand_scores[keep], top_k)
+        return self._results(documents, rows, scores), self._counts(facets, cand_rows[keep], facet_counts)
+
+    def _build(self, texts: List[str]):
+        term_counts = [Counter(tokens) for tokens in tokenize_corpus(texts, workers=self.workers)]
+        lengths = [sum(counts.values()) for counts in term_counts]
+        doc_count = len(texts)
+        avg_length = (sum(lengths) / doc_count) or 1.0
+
+        document_frequency = Counter()
+        for counts in term_counts:
+            document_frequency.update(counts.keys())
+        idf = {term: self._idf_for(df, doc_count) for term, df in document_frequency.items()}
+
+        rows: Dict[str, List[int]] = {term: [] for term in idf}
+        impacts: Dict[str, List[float]] = {term: [] for term in idf}
+        for row, (counts, length) in enumerate(zip(term_counts, lengths)):
+            length_norm = self._length_norm(length, avg_length)
+            for term, tf in counts.items():
+                rows[term].append(row)
+                impacts[term].append(idf[term] * tf * (self.k1 + 1) / (tf + length_norm))
+
+        postings = {term: Postings(rows[term], impacts[term]) for term in idf}
+        return postings, idf, doc_count, avg_length
+
+    def _load(self, model) -> None:
+        if model is None:
+            model = {}, {}, 0, 1.0
+        self._postings, self._idf, self._doc_count, self._avg_length = model
+
+    def _prepare_rows(self, texts: List[str], documents: List[Any]):
+        """(term, impact) pairs of each text, with the token and out-of-vocabulary token totals"""
+        idf_by_term, avg_length = self._idf, self._avg_length
+        new_term_idf = self._idf_for(1, self._doc_count)
+        total_tokens = oov_tokens = 0
+        impacts = []
+        for text in texts:
+            counts = Counter(tokenize(text))
+            length = sum(counts.values())
+            length_norm = self._length_norm(length, avg_length)
+            row_impacts = []
+            for term, tf in counts.items():
+                idf = idf_by_term.get(term)
+                if idf is None:
+                    idf = new_term_idf
+                    oov_tokens += tf
+                row_impacts.append((term, idf * tf * (self.k1 + 1) / (tf + length_norm)))
+            impacts.append(row_impacts)
+            total_tokens += length
+        return impacts, total_tokens, oov_tokens
+
+    def _append_rows(self, prepared, documents: List[Any]) -> Tuple[int, int]:
+        impacts, total_tokens, oov_tokens = prepared
+        first_row = len(self.row_documents)
+        for offset, row_impacts in enumerate(impacts):
+            for term, impact in row_impacts:
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = Postings([], [])
+                postings.append(first_row + offset, impact)
+        return total_tokens, oov_tokens
+
+    def _length_norm(self, length: int, avg_length: float) -> float:
+        return self.k1 * (1 - self.b + self.b * length / avg_length)
+
+    @staticmethod
+    def _idf_for(document_frequency: int, doc_count: int) -> float:
+        return math.log(1 + (doc_count - document_frequency + 0.5) / (document_frequency + 0.5))
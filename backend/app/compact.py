@@ -0,0 +1,210 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from app.index import ScoredQuery, TfidfIndex, block_products, query_hits, select_top_k, tfidf_tokens, vectorize_tokens
+from app.metrics import timed
+
+
+# Storage of posting weights: one byte per posting scaled per term, or float16
+COMPACT_WEIGHTS = ("uint8", "float16")
+
+# A query accumulates scores in a dense array over all rows when its postings
+# outnumber the rows by this fraction, and by sorting them otherwise
+_DENSE_ACCUMULATE = 1 / 16
+
+
+class CompactPostings:
+    """
+    Read-only term-major postings of a TF-IDF matrix in compressed form.
+
+    For every term, the rows containing it are stored in increasing order as
+    varint-encoded gaps (the first one relative to row 0), so most postings
+    take one or two bytes instead of a four-byte column index. Weights are
+    float16, or a byte each with a per-term scale (the term's largest weight
+    maps to 255 and every posting keeps at least 1, so no posting vanishes).
+
+    Scoring decodes only the posting lists of the query's terms and adds up
+    their weighted contributions per row, without rebuilding a sparse matrix.
+    """
+
+    def __init__(self, matrix: sparse.csr_matrix, weights: str = "uint8"):
+        if weights not in COMPACT_WEIGHTS:
+            raise ValueError(f"Unknown compact weights {weights!r}; expected one of {COMPACT_WEIGHTS}")
+        self.shape = matrix.shape
+        by_term = matrix.tocsc()
+        by_term.sort_indices()
+        starts = by_term.indptr[:-1]
+        nonempty = starts[np.diff(by_term.indptr) > 0]
+        gaps = by_term.indices.astype(np.int64)
+        gaps[1:] -= by_term.indices[:-1]
+        gaps[nonempty] = by_term.indices[nonempty]
+
+        self.gaps, lengths = encode_varints(gaps)
+        # Byte offset of each term's gaps, indexed like the postings' indptr
+        self.gap_offsets = np.concatenate([[0], np.cumsum(lengths)])[by_term.indptr]
+        self.postings_offsets = by_term.indptr.astype(np.int64)
+        if weights == "float16":
+            self.weights = by_term.data.astype(np.float16)
+            self.scales = None
+        else:
+            peaks = np.zeros(by_term.shape[1])
+            counts = np.diff(by_term.indptr)
+            peaks[counts > 0] = np.maximum.reduceat(by_term.data, nonempty)
+            self.scales = (peaks / 255).astype(np.float32)
+            per_posting = np.repeat(self.scales, counts)
+            self.weights = np.clip(np.rint(by_term.data / per_posting), 1, 255).astype(np.uint8)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.gaps, self.gap_offsets, self.postings_offsets, self.weights, self.scales]
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    def postings(self, term: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows containing `term` and their weights"""
+        rows = np.cumsum(decode_varints(self.gaps[self.gap_offsets[term]:self.gap_offsets[term + 1]]))
+        weights = self.weights[self.postings_offsets[term]:self.postings_offsets[term + 1]].astype(np.float32)
+        if self.scales is not None:
+            weights *= self.scales[term]
+        return rows, weights
+
+    def score(self, query: sparse.csr_matrix) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows sharing a term with the one-row `query` and their dot products with it"""
+        lists = [self.postings(term) for term in query.indices]
+        if not lists:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        rows = np.concatenate([term_rows for term_rows, _ in lists])
+        contributions = np.concatenate([weights * value for (_, weights), value in zip(lists, query.data)])
+        if len(rows) > self.shape[0] * _DENSE_ACCUMULATE:
+            totals = np.bincount(rows, weights=contributions, minlength=self.shape[0])
+            scored = np.flatnonzero(totals)
+            return scored, totals[scored]
+        scored, inverse = np.unique(rows, return_inverse=True)
+        return scored, np.bincount(inverse, weights=contributions)
+
+    def to_csr(self) -> sparse.csr_matrix:
+        """The dequantized matrix, with rows for documents and columns for terms"""
+        rows = np.concatenate(
+            [np.cumsum(decode_varints(self.gaps[start:end])) for start, end in zip(self.gap_offsets[:-1], self.gap_offsets[1:])]
+            or [np.empty(0, dtype=np.int64)]
+        )
+        weights = self.weights.astype(np.float64)
+        if self.scales is not None:
+            weights *= np.repeat(self.scales, np.diff(self.postings_offsets))
+        return sparse.csc_matrix((weights, rows, self.postings_offsets), shape=self.shape).tocsr()
+
+
+def encode_varints(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """LEB128 bytes of non-negative integers (seven bits per byte, high bit set on all but the last), and each value's length"""
+    values = np.asarray(values, dtype=np.int64)
+    lengths = np.ones(len(values), dtype=np.int64)
+    for shift in range(7, 63, 7):
+        lengths += values >= (1 << shift)
+    starts = np.cumsum(lengths) - lengths
+    data = np.empty(int(lengths.sum()), dtype=np.uint8)
+    for byte in range(int(lengths.max(initial=0))):
+        present = np.flatnonzero(lengths > byte)
+        chunk = (values[present] >> (7 * byte)) & 0x7F
+        chunk |= np.where(lengths[present] > byte + 1, 0x80, 0)
+        data[starts[present] + byte] = chunk
+    return data, lengths
+
+
+def decode_varints(data: np.ndarray) -> np.ndarray:
+    """Integers of concatenated LEB128 bytes"""
+    ends = np.flatnonzero(data < 0x80)
+    if len(ends) == len(data):
+        return data.astype(np.int64)  # Every value fits in one byte
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    shifts = 7 * (np.arange(len(data)) - np.repeat(starts, ends - starts + 1))
+    return np.add.reduceat((data & 0x7F).astype(np.int64) << shifts, starts)
+
+
+class CompactTfidfIndex(TfidfIndex):
+    """
+    TF-IDF index keeping the fitted matrix as `CompactPostings` instead of a
+    float64 CSR matrix, for several times less memory per document.
+
+    Vocabulary, IDF and query vectors are those of `TfidfIndex`; only
+    document weights are quantized, so scores stay within a small tolerance
+    of the float64 index (see benchmarks/bench_compact.py). Documents added
+    after a fit are kept in uncompressed row blocks, scored with the sparse
+    product, until the next refit compresses them.
+    """
+
+    # The fitted matrix lives in the postings, so every block is an appended one
+    _fitted_blocks = 0
+
+    def __init__(self, refit_drift: float = 0.2, workers: int = 1, weights: str = "uint8"):
+        super().__init__(refit_drift, workers)
+        if weights not in COMPACT_WEIGHTS:
+            raise ValueError(f"Unknown compact weights {weights!r}; expected one of {COMPACT_WEIGHTS}")
+        self.weights = weights
+        self.postings: Optional[CompactPostings] = None
+
+    @property
+    def matrix(self) -> Optional[sparse.csr_matrix]:
+        """Dequantized document-term matrix, including documents added since the fit"""
+        with self._lock:
+            postings, blocks = self.postings, list(self._blocks)
+        if postings is None:
+            return None
+        if not blocks:
+            return postings.to_csr()
+        return sparse.vstack([postings.to_csr(), *blocks], format="csr")
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the compressed postings and the uncompressed appended rows"""
+        with self._lock:
+            postings, blocks = self.postings, list(self._blocks)
+        total = postings.nbytes if postings is not None else 0
+        for block in blocks:
+            total += block.data.nbytes + block.indices.nbytes + block.indptr.nbytes
+        return total
+
+    def _score_batch(
+        self, texts: List[str], top_ks: List[int], min_scores: List[float], filters: List[Optional[dict]], facet_counts: bool
+    ) -> List[ScoredQuery]:
+        """Score every query against the compressed postings and the appended rows"""
+        with self._lock:
+            vectorizer, postings = self.vectorizer, self.postings
+            if vectorizer is None or postings is None:
+                return [([], {} if facet_counts else None) for _ in texts]
+            blocks = list(self._blocks)
+            documents = self.row_documents
+            dead_rows = self._dead_row_mask()
+            facets = self.facets
+            masks = [facets.mask(query_filters) for query_filters in filters]
+        with timed("preprocess"):
+            tokens = tfidf_tokens(texts)
+        with timed("vectorize"):
+            queries = vectorize_tokens(tokens, vectorizer)[0]
+        with timed("score"):
+            scored = [postings.score(queries[i]) for i in range(len(texts))]
+            if blocks:
+                # Rows added since the fit are scored with sparse products, as in TfidfIndex
+                products = block_products(queries, blocks)
+                for i, (rows, scores) in enumerate(scored):
+                    appended_rows, appended_scores = query_hits(products, i)
+                    scored[i] = (
+                        np.concatenate([rows, postings.shape[0] + appended_rows]),
+                        np.concatenate([scores, appended_scores]),
+                    )
+        with timed("topk"):
+            selected = [
+                select_top_k(rows, scores, top_k, min_score, dead_rows, mask)
+                for (rows, scores), top_k, min_score, mask in zip(scored, top_ks, min_scores, masks)
+            ]
+        return [
+            (self._results(documents, rows, scores), self._counts(facets, matched, facet_counts))
+            for rows, scores, matched in selected
+        ]
+
+    def _load(self, model) -> None:
+        vectorizer, matrix = model if model is not None else (None, None)
+        self.vectorizer = vectorizer
+        # The float64 matrix is released once its postings are compressed
+        self.postings = CompactPostings(matrix, self.weights) if matrix is not None else None
+        self._blocks = []
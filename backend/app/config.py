@@ -0,0 +1,122 @@
+import os
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+# --- Index settings ---
+
+# Share of documents ingested (or out-of-vocabulary tokens seen) since the last
+# full fit that triggers a background refit of the vocabulary and IDF weights.
+INDEX_REFIT_DRIFT = _env_float("INDEX_REFIT_DRIFT", 0.2)
+
+# Retrieval engine behind /generate: "tfidf" (cosine similarity), "bm25", or
+# "tfidf-compact" (TF-IDF with quantized weights and compressed postings)
+SEARCH_ENGINE = os.getenv("SEARCH_ENGINE", "tfidf")
+
+# Processes used by full index builds and refits: TF-IDF counts terms in
+# shards across them, BM25 tokenizes over them. 1 builds in the calling thread
+INDEX_BUILD_WORKERS = _env_int("INDEX_BUILD_WORKERS", 1)
+
+# Number of TF-IDF index shards queried in parallel, and the document field
+# ("id" or "jurisdiction") whose hash picks a document's shard
+INDEX_SHARDS = _env_int("INDEX_SHARDS", 1)
+INDEX_SHARD_KEY = os.getenv("INDEX_SHARD_KEY", "id")
+
+# Index document passages (paragraphs within their sections) instead of whole
+# documents: documents rank by their best passage and results carry the
+# offsets of their best INDEX_PASSAGES_PER_RESULT passages
+INDEX_PASSAGES = os.getenv("INDEX_PASSAGES", "0") not in ("0", "false", "no")
+INDEX_PASSAGES_PER_RESULT = _env_int("INDEX_PASSAGES_PER_RESULT", 3)
+
+# Directory of a prebuilt index snapshot (see app/build_index.py). When set,
+# workers memory-map it read-only instead of fitting the corpus at startup.
+INDEX_SNAPSHOT = os.getenv("INDEX_SNAPSHOT")
+
+# Verify snapshot checksums at load; the read also warms the shared page cache
+INDEX_SNAPSHOT_VERIFY = os.getenv("INDEX_SNAPSHOT_VERIFY", "1") not in ("0", "false", "no")
+
+# --- Dense retrieval ---
+
+# Fuse the engine's results with dense (embedding) retrieval by reciprocal
+# rank fusion, so queries also match paraphrases sharing few of their terms
+DENSE_RETRIEVAL = os.getenv("DENSE_RETRIEVAL", "0") not in ("0", "false", "no")
+
+# Embedding model: "lsa" (TF-IDF projected onto DENSE_DIMENSIONS latent
+# dimensions learned from the corpus) or the name of a local
+# sentence-transformers model, which needs that package installed
+DENSE_MODEL = os.getenv("DENSE_MODEL", "lsa")
+DENSE_DIMENSIONS = _env_int("DENSE_DIMENSIONS", 256)
+
+# Store embeddings as int8 codes with a scale per vector (a quarter of the
+# memory of float32) rather than float32
+DENSE_QUANTIZED = os.getenv("DENSE_QUANTIZED", "1") not in ("0", "false", "no")
+
+# IVF lists scanned per query: more lists trade latency for recall. Indexes
+# under 10,000 rows keep a single list and are always searched exactly
+DENSE_PROBES = _env_int("DENSE_PROBES", 16)
+
+# Cosine similarity a dense match needs to take part in fusion, and the k
+# constant of reciprocal rank fusion
+DENSE_MIN_SCORE = _env_float("DENSE_MIN_SCORE", 0.3)
+DENSE_RRF_K = _env_int("DENSE_RRF_K", 60)
+
+# --- Document store ---
+
+# Directory for the memory-mapped file holding document content (default: the
+# system temporary directory). The file is rebuilt at every start.
+CONTENT_DIR = os.getenv("CONTENT_DIR")
+
+# --- Query cache ---
+
+# Maximum cached /generate responses (0 disables the cache) and their lifetime
+QUERY_CACHE_SIZE = _env_int("QUERY_CACHE_SIZE", 1024)
+QUERY_CACHE_TTL = _env_float("QUERY_CACHE_TTL", 300.0)
+
+# --- Search requests ---
+
+# JSON file mapping legal concepts to their keywords, replacing the built-in
+# taxonomy in app/features.py; compiled into one matcher at startup
+CONCEPT_TAXONOMY = os.getenv("CONCEPT_TAXONOMY")
+
+# Threads dedicated to /generate scoring, and how many more searches may wait
+# for one before new ones are rejected with 503
+SCORING_WORKERS = _env_int("SCORING_WORKERS", os.cpu_count() or 1)
+SCORING_QUEUE_SIZE = _env_int("SCORING_QUEUE_SIZE", 64)
+
+# Allow requests sending `X-Server-Timing: 1` to get a Server-Timing header
+# with the time spent in each search stage; 0 ignores the request header
+SERVER_TIMING = os.getenv("SERVER_TIMING", "1") not in ("0", "false", "no")
+
+# Maximum number of queries accepted by POST /generate/batch
+GENERATE_BATCH_MAX = _env_int("GENERATE_BATCH_MAX", 1000)
+
+# Default and maximum page size for GET /api/documents
+LIST_PAGE_SIZE = _env_int("LIST_PAGE_SIZE", 50)
+LIST_PAGE_SIZE_MAX = _env_int("LIST_PAGE_SIZE_MAX", 500)
+
+# --- Summaries ---
+
+# Where /generate summaries come from: "template" for the built-in templates,
+# or "http" for a local inference server with an OpenAI-compatible
+# chat completions endpoint at SUMMARY_URL
+SUMMARY_PROVIDER = os.getenv("SUMMARY_PROVIDER", "template")
+SUMMARY_URL = os.getenv("SUMMARY_URL", "http://localhost:8080/v1/chat/completions")
+SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "default")
+
+# Seconds a summary may take, including the wait for a free slot, before the
+# template summary is returned instead, and how many are generated at once
+SUMMARY_TIMEOUT = _env_float("SUMMARY_TIMEOUT", 10.0)
+SUMMARY_MAX_CONCURRENCY = _env_int("SUMMARY_MAX_CONCURRENCY", 4)
+
+# Maximum cached provider summaries, keyed by query and summarized documents,
+# and their lifetime in seconds
+SUMMARY_CACHE_SIZE = _env_int("SUMMARY_CACHE_SIZE", 1024)
+SUMMARY_CACHE_TTL = _env_float("SUMMARY_CACHE_TTL", 3600.0)
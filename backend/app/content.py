@@ -0,0 +1,93 @@
+import mmap
+import tempfile
+import threading
+from array import array
+from typing import NamedTuple, Optional
+
+
+# Characters between the byte offsets recorded for non-ASCII content, so a
+# character range only decodes up to this many characters beyond itself
+CONTENT_CHECKPOINT_CHARS = 4096
+
+
+class ContentRef(NamedTuple):
+    """Location of one document's UTF-8 content in a ContentFile"""
+    offset: int
+    size: int  # bytes
+    length: int  # characters
+    # Byte offset of every CONTENT_CHECKPOINT_CHARS-th character, relative to
+    # `offset`; None for ASCII content, where characters and bytes coincide
+    checkpoints: Optional[array]
+
+
+class ContentFile:
+    """
+    Append-only file of document content, read through a read-only mmap.
+
+    Document text lives in the file (and the OS page cache) rather than as
+    Python strings, and reading a character or byte range touches only the
+    pages it spans. The file is anonymous: it is created in `directory` (the
+    system temporary directory by default), removed as soon as it is closed,
+    and rebuilt from the corpus at startup. Content of replaced or deleted
+    documents is not reclaimed until then.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self._file = tempfile.TemporaryFile(dir=directory or None)
+        self._size = 0
+        self._map: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Bytes written, including the content of replaced documents"""
+        return self._size
+
+    def append(self, text: str) -> ContentRef:
+        chunks = [
+            text[start:start + CONTENT_CHECKPOINT_CHARS].encode()
+            for start in range(0, len(text), CONTENT_CHECKPOINT_CHARS)
+        ]
+        data = b"".join(chunks)
+        checkpoints = None
+        if len(data) != len(text):
+            checkpoints = array("Q", [0])
+            for chunk in chunks[:-1]:
+                checkpoints.append(checkpoints[-1] + len(chunk))
+        with self._lock:
+            offset = self._size
+            self._file.seek(offset)
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+        return ContentRef(offset, len(data), len(text), checkpoints)
+
+    def read(self, ref: ContentRef, start: int = 0, end: Optional[int] = None) -> str:
+        """Characters [start, end) of the content, clamped to its length"""
+        end = ref.length if end is None else min(end, ref.length)
+        start = min(max(start, 0), end)
+        if ref.checkpoints is None:
+            return self.read_bytes(ref, start, end).decode()
+        first = start // CONTENT_CHECKPOINT_CHARS
+        last = -(-end // CONTENT_CHECKPOINT_CHARS)
+        byte_start = ref.checkpoints[first]
+        byte_end = ref.checkpoints[last] if last < len(ref.checkpoints) else ref.size
+        skipped = first * CONTENT_CHECKPOINT_CHARS
+        return self.read_bytes(ref, byte_start, byte_end).decode()[start - skipped:end - skipped]
+
+    def read_bytes(self, ref: ContentRef, start: int = 0, end: Optional[int] = None) -> bytes:
+        """Bytes [start, end) of the UTF-8 content, clamped to its size"""
+        end = ref.size if end is None else min(end, ref.size)
+        start = min(max(start, 0), end)
+        if start == end:
+            return b""
+        return self._mapping(ref.offset + end)[ref.offset + start:ref.offset + end]
+
+    def _mapping(self, needed: int) -> mmap.mmap:
+        mapping = self._map
+        if mapping is None or len(mapping) < needed:
+            with self._lock:
+                if self._map is None or len(self._map) < needed:
+                    # Earlier maps are left to the garbage collector, as readers may still hold them
+                    self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                mapping = self._map
+        return mapping
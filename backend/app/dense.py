@@ -0,0 +1,358 @@
+import math
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+from sklearn.utils.extmath import randomized_svd
+
+from app.index import ScoredQuery, SearchIndex, build_tfidf, tfidf_tokens, top_k_rows, vectorize_tokens
+from app.metrics import timed
+
+
+# Rows sampled to fit the LSA projection and train the IVF centroids, so
+# builds over millions of rows stay bounded
+DENSE_TRAIN_SAMPLE = 100_000
+
+# Below this many rows the vectors are kept in a single list, which makes
+# every search exhaustive and exact
+IVF_MIN_ROWS = 10_000
+# Lists per square root of the row count, and k-means rounds training them
+IVF_LISTS_PER_SQRT = 2
+IVF_TRAIN_ITERATIONS = 10
+
+# Rows embedded or assigned to lists per matrix product during builds
+_CHUNK_ROWS = 65_536
+
+
+class LsaEmbedder:
+    """
+    Latent semantic analysis: TF-IDF vectors projected onto the top
+    `dimensions` singular vectors of the corpus' TF-IDF matrix.
+
+    Terms used in the same documents get nearby directions, so a query can
+    match a document sharing few of its words. The projection is learned
+    from the indexed corpus on CPU, with nothing to download, and frozen
+    between fits like the TF-IDF vocabulary.
+    """
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+        self.vectorizer = None
+        self.components: Optional[np.ndarray] = None
+
+    def fit(self, texts: List[str], workers: int = 1) -> Tuple["LsaEmbedder", np.ndarray]:
+        """A new embedder fit on `texts`, and their vectors"""
+        vectorizer, matrix = build_tfidf(texts, workers)
+        sample = matrix
+        if matrix.shape[0] > DENSE_TRAIN_SAMPLE:
+            rows = np.random.default_rng(0).choice(matrix.shape[0], DENSE_TRAIN_SAMPLE, replace=False)
+            sample = matrix[np.sort(rows)]
+        dimensions = min(self.dimensions, *sample.shape)
+        _, _, components = randomized_svd(sample, dimensions, n_iter=5, random_state=0)
+        fitted = LsaEmbedder(self.dimensions)
+        fitted.vectorizer, fitted.components = vectorizer, components.astype(np.float32)
+        vectors = np.vstack([
+            fitted._project(matrix[start:start + _CHUNK_ROWS]) for start in range(0, matrix.shape[0], _CHUNK_ROWS)
+        ])
+        return fitted, vectors
+
+    def embed(self, texts: List[str]) -> Tuple[np.ndarray, int, int]:
+        """Unit vectors for `texts`, with their total and in-vocabulary token counts"""
+        return self.embed_tokens(self.tokenize(texts))
+
+    def tokenize(self, texts: List[str]) -> List[List[str]]:
+        return tfidf_tokens(texts)
+
+    def embed_tokens(self, tokens: List[List[str]]) -> Tuple[np.ndarray, int, int]:
+        """`embed` for texts already split by `tokenize`"""
+        rows, total_tokens, known_tokens = vectorize_tokens(tokens, self.vectorizer)
+        return self._project(rows), total_tokens, known_tokens
+
+    def _project(self, rows) -> np.ndarray:
+        return _unit(np.asarray(rows @ self.components.T, dtype=np.float32))
+
+
+class SentenceTransformerEmbedder:
+    """
+    A pretrained sentence-transformers model run locally on CPU, such as
+    "sentence-transformers/all-MiniLM-L6-v2". Needs the optional
+    sentence-transformers package. Fitting only embeds the corpus.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 64):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ValueError(f"Dense model {model_name!r} needs the sentence-transformers package")
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.batch_size = batch_size
+
+    def fit(self, texts: List[str], workers: int = 1) -> Tuple["SentenceTransformerEmbedder", np.ndarray]:
+        return self, self._encode(texts)
+
+    def embed(self, texts: List[str]) -> Tuple[np.ndarray, int, int]:
+        # A pretrained model has no vocabulary to drift from
+        return self._encode(texts), 0, 0
+
+    def tokenize(self, texts: List[str]) -> List[str]:
+        # The model tokenizes while encoding, so texts are passed through
+        return texts
+
+    def embed_tokens(self, texts: List[str]) -> Tuple[np.ndarray, int, int]:
+        return self.embed(texts)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        vectors = self.model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+def create_embedder(model: str, dimensions: int = 256):
+    """LSA for "lsa", otherwise the sentence-transformers model named `model`"""
+    if model == "lsa":
+        return LsaEmbedder(dimensions)
+    return SentenceTransformerEmbedder(model)
+
+
+class IvfVectors:
+    """
+    Inverted-file (IVF) index over unit vectors, for approximate maximum
+    inner product search.
+
+    Vectors are clustered around `centroids` by spherical k-means and stored
+    grouped by list, so scanning a list reads one contiguous slice. A query
+    scans only the `probes` lists whose centroids are closest to it. Vectors
+    are stored as float32 or, with int8 quantization, as int8 codes with one
+    scale per vector, a quarter of the memory.
+
+    Vectors appended after the build are assigned to their nearest list but
+    kept in a separate tail, scanned for the same lists, until the next build.
+    """
+
+    def __init__(self, centroids: np.ndarray, offsets: np.ndarray, rows: np.ndarray, codes: np.ndarray, scales):
+        self.centroids = centroids
+        self.offsets = offsets  # Start of each list in `rows` and `codes`, plus the end
+        self.rows = rows
+        self.codes = codes
+        self.scales = scales
+        self.quantized = scales is not None
+        self._tail: List[tuple] = []  # (lists, rows, codes, scales) blocks
+
+    def __len__(self) -> int:
+        return len(self.rows) + sum(len(block[1]) for block in self._tail)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.centroids, self.offsets, self.rows, self.codes, self.scales]
+        arrays += [array for block in self._tail for array in block]
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    def append(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        lists = _nearest(vectors, self.centroids)
+        self._tail.append((lists, rows, *quantize(vectors, self.quantized)))
+
+    def snapshot(self) -> "IvfVectors":
+        """A view that later appends leave untouched, folding pending tail blocks into one"""
+        if len(self._tail) > 1:
+            blocks = list(zip(*self._tail))
+            self._tail = [tuple(None if block[0] is None else np.concatenate(block) for block in blocks)]
+        view = IvfVectors(self.centroids, self.offsets, self.rows, self.codes, self.scales)
+        view._tail = list(self._tail)
+        return view
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        min_score: float,
+        probes: int,
+        dead_rows: Optional[np.ndarray] = None,
+        mask: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Best (row, score) pairs among the probed lists, and all probed rows
+        scoring above `min_score`. When `mask` leaves fewer than `top_k`
+        matches, the probe widens until it covers every list.
+        """
+        list_count = len(self.centroids)
+        probes = min(max(probes, 1), list_count)
+        centroid_scores = self.centroids @ query
+        while True:
+            if probes < list_count:
+                lists = np.argpartition(-centroid_scores, probes - 1)[:probes]
+            else:
+                lists = None
+            rows, scores = self._scan(query, lists)
+            keep = scores > min_score
+            if dead_rows is not None:
+                keep &= ~dead_rows[rows]
+            if mask is not None:
+                keep &= mask[rows]
+            if mask is None or lists is None or np.count_nonzero(keep) >= top_k:
+                break
+            probes = min(probes * 4, list_count)
+        matched = rows[keep]
+        return (*top_k_rows(matched, scores[keep], top_k), matched)
+
+    def _scan(self, query: np.ndarray, lists: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        # Scores of the rows in `lists` (all rows for None), tail included
+        if lists is None:
+            parts = [(self.rows, self.codes, self.scales)]
+        else:
+            spans = [(self.offsets[number], self.offsets[number + 1]) for number in np.sort(lists)]
+            parts = [(
+                np.concatenate([self.rows[start:end] for start, end in spans]),
+                np.concatenate([self.codes[start:end] for start, end in spans]),
+                None if self.scales is None else np.concatenate([self.scales[start:end] for start, end in spans]),
+            )]
+        for tail_lists, tail_rows, tail_codes, tail_scales in self._tail:
+            hit = slice(None) if lists is None else np.isin(tail_lists, lists)
+            parts.append((tail_rows[hit], tail_codes[hit], None if tail_scales is None else tail_scales[hit]))
+        rows, scores = [], []
+        for part_rows, codes, scales in parts:
+            part_scores = codes @ query
+            if scales is not None:
+                part_scores *= scales
+            rows.append(part_rows)
+            scores.append(part_scores)
+        return np.concatenate(rows), np.concatenate(scores)
+
+
+def build_ivf(vectors: np.ndarray, quantized: bool = True, lists: Optional[int] = None) -> IvfVectors:
+    """
+    IVF index over the rows of `vectors`, with about IVF_LISTS_PER_SQRT *
+    sqrt(rows) lists unless `lists` is given, and a single list (exact
+    search) below IVF_MIN_ROWS rows
+    """
+    count = len(vectors)
+    if lists is None:
+        lists = 1 if count < IVF_MIN_ROWS else int(IVF_LISTS_PER_SQRT * math.sqrt(count))
+    lists = max(1, min(lists, count))
+    if lists == 1:
+        centroids = _unit(vectors.mean(axis=0, keepdims=True)) if count else np.zeros((1, vectors.shape[1]), np.float32)
+        assignment = np.zeros(count, dtype=np.int64)
+    else:
+        centroids = train_centroids(vectors, lists)
+        assignment = _nearest(vectors, centroids)
+    order = np.argsort(assignment, kind="stable")
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=lists))])
+    codes, scales = quantize(vectors[order], quantized)
+    return IvfVectors(centroids, offsets, order.astype(np.int64), codes, scales)
+
+
+def train_centroids(vectors: np.ndarray, lists: int, iterations: int = IVF_TRAIN_ITERATIONS) -> np.ndarray:
+    """Spherical k-means centroids over a sample of `vectors`"""
+    rng = np.random.default_rng(0)
+    sample = vectors
+    if len(vectors) > DENSE_TRAIN_SAMPLE:
+        sample = vectors[np.sort(rng.choice(len(vectors), DENSE_TRAIN_SAMPLE, replace=False))]
+    centroids = sample[rng.choice(len(sample), lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = _nearest(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        empty = np.flatnonzero(np.bincount(assignment, minlength=lists) == 0)
+        # Lists left empty restart from random sample vectors
+        sums[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+        centroids = _unit(sums)
+    return centroids
+
+
+def quantize(vectors: np.ndarray, quantized: bool = True) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """int8 codes and per-vector scales, or the float32 vectors and None"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if not quantized:
+        return vectors, None
+    scales = np.abs(vectors).max(axis=1) / 127
+    scales[scales == 0] = 1.0
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    return np.concatenate([
+        np.argmax(vectors[start:start + _CHUNK_ROWS] @ centroids.T, axis=1)
+        for start in range(0, len(vectors), _CHUNK_ROWS)
+    ] or [np.empty(0, dtype=np.int64)])
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class DenseIndex(SearchIndex):
+    """
+    Dense retrieval: documents are embedded into unit vectors (see
+    `create_embedder`) and queries are answered by approximate nearest
+    neighbour search over an IVF index (see `IvfVectors`). Scores are cosine
+    similarities.
+
+    A fit trains the embedder (for LSA) and the IVF lists over the corpus;
+    documents added afterwards are embedded with the frozen model and
+    appended to their nearest list, and drift triggers a background refit as
+    for the sparse engines. Filters are applied to the probed rows, and facet
+    counts cover the probed rows only, as the rest are never scored.
+    """
+
+    def __init__(
+        self,
+        refit_drift: float = 0.2,
+        workers: int = 1,
+        model: str = "lsa",
+        dimensions: int = 256,
+        quantized: bool = True,
+        probes: int = 16,
+    ):
+        super().__init__(refit_drift, workers)
+        self.model = model
+        self.dimensions = dimensions
+        self.quantized = quantized
+        self.probes = probes
+        self.embedder = None
+        self.vectors: Optional[IvfVectors] = None
+
+    def _score_batch(
+        self, texts: List[str], top_ks: List[int], min_scores: List[float], filters: List[Optional[dict]], facet_counts: bool
+    ) -> List[ScoredQuery]:
+        """Embed all queries in one call and search the IVF lists for each"""
+        with self._lock:
+            embedder, vectors = self.embedder, self.vectors
+            if embedder is None or vectors is None:
+                return [([], {} if facet_counts else None) for _ in texts]
+            vectors = vectors.snapshot()
+            documents = self.row_documents
+            dead_rows = self._dead_row_mask()
+            facets = self.facets
+            masks = [facets.mask(query_filters) for query_filters in filters]
+        with timed("preprocess"):
+            tokens = embedder.tokenize(texts)
+        with timed("vectorize"):
+            queries = embedder.embed_tokens(tokens)[0]
+        # The IVF search selects its top k as it scans, so both are timed as scoring
+        with timed("score"):
+            hits = [
+                vectors.search(query, top_k, min_score, self.probes, dead_rows, mask)
+                for query, top_k, min_score, mask in zip(queries, top_ks, min_scores, masks)
+            ]
+        return [
+            (self._results(documents, rows, scores), self._counts(facets, matched, facet_counts))
+            for rows, scores, matched in hits
+        ]
+
+    def _build(self, texts: List[str]):
+        # Pretrained embedders are reused across refits; LSA is refit on the corpus
+        embedder = self.embedder or create_embedder(self.model, self.dimensions)
+        embedder, vectors = embedder.fit(texts, self.workers)
+        return embedder, build_ivf(vectors, self.quantized)
+
+    def _load(self, model) -> None:
+        self.embedder, self.vectors = model if model is not None else (None, None)
+
+    def _prepare_rows(self, texts: List[str], documents: List[Any]):
+        return self.embedder.embed(texts)
+
+    def _append_rows(self, prepared, documents: List[Any]) -> Tuple[int, int]:
+        vectors, total_tokens, known_tokens = prepared
+        first_row = len(self.row_documents)
+        self.vectors.append(np.arange(first_row, first_row + len(documents), dtype=np.int64), vectors)
+        return total_tokens, total_tokens - known_tokens
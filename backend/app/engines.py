@@ -0,0 +1,53 @@
+from typing import Dict, Optional, Type
+
+from app.bm25 import Bm25Index
+from app.compact import CompactTfidfIndex
+from app.dense import DenseIndex
+from app.hybrid import HybridIndex
+from app.index import SearchIndex, TfidfIndex
+from app.passages import PassageIndex
+from app.shards import ShardedTfidfIndex
+
+
+# Retrieval engines selectable through the SEARCH_ENGINE setting
+ENGINES: Dict[str, Type[SearchIndex]] = {
+    "tfidf": TfidfIndex,
+    "bm25": Bm25Index,
+    "tfidf-compact": CompactTfidfIndex,
+}
+
+
+def create_index(
+    engine: str,
+    shards: int = 1,
+    shard_key: str = "id",
+    passages: bool = False,
+    passages_per_document: int = 3,
+    dense: Optional[dict] = None,
+    **options
+):
+    """
+    Instantiate the retrieval engine registered under `engine`, split into
+    `shards` by `shard_key` when more than one shard is asked for. With
+    `passages`, the engine indexes document passages and is wrapped in a
+    PassageIndex returning the best `passages_per_document` of each result.
+    With `dense`, a dict of DenseIndex options plus the HybridIndex's
+    `dense_min_score` and `rrf_k`, its results are fused with dense retrieval.
+    """
+    if passages:
+        inner = create_index(engine, shards=shards, shard_key=shard_key, dense=dense, **options)
+        return PassageIndex(inner, per_document=passages_per_document)
+    if dense is not None:
+        dense = dict(dense)
+        fusion = {name: dense.pop(name) for name in ("dense_min_score", "rrf_k") if name in dense}
+        sparse = create_index(engine, shards=shards, shard_key=shard_key, **options)
+        return HybridIndex(sparse, DenseIndex(**options, **dense), **fusion)
+    try:
+        engine_class = ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"Unknown search engine {engine!r}; expected one of {sorted(ENGINES)}")
+    if shards > 1:
+        if engine_class is not TfidfIndex:
+            raise ValueError(f"Sharding is only supported for the tfidf engine, not {engine!r}")
+        return ShardedTfidfIndex(shards=shards, shard_key=shard_key, **options)
+    return engine_class(**options)
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+from contextvars import copy_context
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class ExecutorSaturated(Exception):
+    """Raised when a task is submitted while every worker is busy and the queue is full"""
+
+
+class BoundedExecutor:
+    """
+    Fixed-size thread pool with a bounded wait queue and admission control.
+
+    At most `workers` tasks run and `queue_size` more wait at any time.
+    Beyond that, `submit` raises ExecutorSaturated right away instead of
+    queueing, so callers can shed load while the event loop and other
+    threadpools stay free for cheap requests.
+    """
+
+    def __init__(self, workers: int, queue_size: int, name: str = "executor"):
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def submit(self, fn: Callable[..., Any], *args) -> Future:
+        """Queue `fn` to run in a copy of the caller's context, so context variables reach the worker"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise ExecutorSaturated(f"All {self.workers} workers are busy and {self.queue_size} tasks are queued")
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(copy_context().run, fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run `fn` on the pool and await its result; cancelling drops it if still queued"""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def _release(self, future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += future is not None
+        self._slots.release()
@@ -0,0 +1,211 @@
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Document fields with a bitmap per value, filterable by exact value
+FACET_FIELDS = ("category", "court", "jurisdiction")
+
+# Set bits in each byte value
+_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.int64)
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+class FacetIndex:
+    """
+    Per-value bitmaps of the facet fields and a sorted date index over the
+    rows of a search index, so filters become row masks and facet counts
+    are computed without touching documents.
+
+    Each value of a facet field has a packed bitmap (one bit per row). A
+    filter ORs the bitmaps of the accepted values of a field, ANDs the
+    fields together and intersects the rows whose date falls in the range,
+    found by binary search in the date index. Rows are appended as documents
+    are indexed; tombstoned rows keep their bits and are excluded by the
+    search index itself.
+
+    A row's document is the row document itself, or the first element of a
+    (document, passage) pair, and every row records the first row of its
+    document so counts are per document even when a document has many rows,
+    whether they arrive in one append or several. A new version of a
+    document (a different object under the same id) starts from its own rows.
+
+    Appends, masks and the stacked bitmaps used for counting share one lock,
+    so counts running alongside an append never see (or cache) bitmaps
+    narrower than the rows already indexed.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self._bitmaps: Dict[str, Dict[str, np.ndarray]] = {field: {} for field in FACET_FIELDS}
+        self._capacity = 0  # Bytes per bitmap
+        # First row of each row's document; only the first `rows` entries are set
+        self._first_rows = np.empty(0, dtype=np.int64)
+        # Document id -> (document, its first row)
+        self._document_rows: Dict[str, Tuple[Any, int]] = {}
+        self._date_days = np.empty(0, dtype=np.int64)
+        self._date_rows = np.empty(0, dtype=np.int64)
+        self._pending_dates: List[tuple] = []
+        # All bitmaps stacked into one matrix for counting, rebuilt after appends
+        self._stacked: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+    def add(self, documents: List[Any]) -> None:
+        """Index the facet values of rows appended after the current ones"""
+        with self._lock:
+            self._add(documents)
+
+    def _add(self, documents: List[Any]) -> None:
+        first_row = self.rows
+        self._reserve(first_row + len(documents))
+        values: Dict[str, Dict[str, List[int]]] = {field: {} for field in FACET_FIELDS}
+        first_rows = np.arange(first_row, first_row + len(documents), dtype=np.int64)
+        days, dated_rows = [], []
+        for offset, row_document in enumerate(documents):
+            doc = row_document[0] if isinstance(row_document, tuple) else row_document
+            if doc is None:
+                continue
+            row = first_row + offset
+            known = self._document_rows.get(doc["id"])
+            if known is None or known[0] is not doc:
+                known = self._document_rows[doc["id"]] = (doc, row)
+            first_rows[offset] = known[1]
+            for field in FACET_FIELDS:
+                value = doc.get(field)
+                if value:
+                    values[field].setdefault(value, []).append(row)
+            day = _parse_day(doc.get("date"))
+            if day is not None:
+                days.append(day)
+                dated_rows.append(row)
+        for field, rows_by_value in values.items():
+            bitmaps = self._bitmaps[field]
+            for value, rows in rows_by_value.items():
+                bitmap = bitmaps.get(value)
+                if bitmap is None:
+                    bitmap = bitmaps[value] = np.zeros(self._capacity, dtype=np.uint8)
+                rows = np.asarray(rows, dtype=np.int64)
+                np.bitwise_or.at(bitmap, rows >> 3, (0x80 >> (rows & 7)).astype(np.uint8))
+        if len(self._first_rows) < self.rows + len(documents):
+            # Grow geometrically, like the bitmaps, so appends are amortized
+            grown = np.empty(max(self.rows + len(documents), len(self._first_rows) * 2, 512), dtype=np.int64)
+            grown[:self.rows] = self._first_rows[:self.rows]
+            self._first_rows = grown
+        self._first_rows[first_row:first_row + len(documents)] = first_rows
+        self._stacked = None
+        if days:
+            self._pending_dates.append((np.asarray(days, dtype=np.int64), np.asarray(dated_rows, dtype=np.int64)))
+        self.rows += len(documents)
+
+    def mask(self, filters: Optional[dict]) -> Optional[np.ndarray]:
+        """
+        Boolean mask over the rows accepted by `filters`, a dict of accepted
+        values per facet field plus optional `date_from`/`date_to` bounds
+        (inclusive); None when nothing is filtered
+        """
+        if not filters:
+            return None
+        with self._lock:
+            return self._mask(filters)
+
+    def _mask(self, filters: dict) -> Optional[np.ndarray]:
+        packed = None
+        for field in FACET_FIELDS:
+            accepted = filters.get(field)
+            if not accepted:
+                continue
+            field_bits = np.zeros(self._capacity, dtype=np.uint8)
+            for value in accepted:
+                bitmap = self._bitmaps[field].get(value)
+                if bitmap is not None:
+                    field_bits |= bitmap
+            packed = field_bits if packed is None else packed & field_bits
+        if filters.get("date_from") or filters.get("date_to"):
+            date_bits = np.zeros(self._capacity, dtype=np.uint8)
+            dated = np.packbits(self._date_mask(filters.get("date_from"), filters.get("date_to")))
+            date_bits[:len(dated)] = dated
+            packed = date_bits if packed is None else packed & date_bits
+        if packed is None:
+            return None
+        return np.unpackbits(packed, count=self.rows).astype(bool)
+
+    def counts(self, rows: np.ndarray) -> Dict[str, Dict[str, int]]:
+        """
+        Number of documents among `rows` with each facet value, leaving out
+        values with none. Safe to call while rows are being appended: the
+        stacked bitmaps cover every row indexed when they were taken, and
+        only bits of the given rows are read.
+        """
+        labels, matrix, first_rows = self._stacked_bitmaps()
+        firsts = first_rows[rows]
+        if len(firsts) < matrix.shape[1]:
+            # Fewer documents than bitmap bytes: look up their bits directly
+            firsts = np.unique(firsts)
+            shifts = (7 - (firsts & 7)).astype(np.uint8)
+            totals = ((matrix[:, firsts >> 3] >> shifts) & 1).sum(axis=1, dtype=np.int64)
+        else:
+            selected = np.zeros(firsts.max() + 1, dtype=bool)
+            selected[firsts] = True
+            selected = np.packbits(selected)
+            totals = _POPCOUNT[matrix[:, :len(selected)] & selected].sum(axis=1)
+        counts: Dict[str, Dict[str, int]] = {field: {} for field in FACET_FIELDS}
+        for position in np.argsort(-totals, kind="stable"):
+            if not totals[position]:
+                break
+            field, value = labels[position]
+            counts[field][value] = int(totals[position])
+        return counts
+
+    def _stacked_bitmaps(self) -> tuple:
+        """(labels, stacked bitmaps, first rows), built once per append and never modified afterwards"""
+        with self._lock:
+            if self._stacked is None:
+                labels = [(field, value) for field in FACET_FIELDS for value in self._bitmaps[field]]
+                matrix = np.zeros((len(labels), self._capacity), dtype=np.uint8)
+                for position, (field, value) in enumerate(labels):
+                    matrix[position] = self._bitmaps[field][value]
+                # Later appends only write past this view, or into a grown copy
+                self._stacked = labels, matrix, self._first_rows[:self.rows]
+            return self._stacked
+
+    def _date_mask(self, date_from: Optional[date], date_to: Optional[date]) -> np.ndarray:
+        if self._pending_dates:
+            days = np.concatenate([self._date_days] + [days for days, _ in self._pending_dates])
+            rows = np.concatenate([self._date_rows] + [rows for _, rows in self._pending_dates])
+            order = np.argsort(days, kind="stable")
+            self._date_days, self._date_rows = days[order], rows[order]
+            self._pending_dates = []
+        low = 0 if date_from is None else np.searchsorted(self._date_days, _day(date_from), side="left")
+        high = len(self._date_days) if date_to is None else np.searchsorted(self._date_days, _day(date_to), side="right")
+        mask = np.zeros(self.rows, dtype=bool)
+        mask[self._date_rows[low:high]] = True
+        return mask
+
+    def _reserve(self, rows: int) -> None:
+        needed = (rows + 7) // 8
+        if needed <= self._capacity:
+            return
+        # Grow geometrically so appends are amortized over many rows
+        capacity = max(needed, self._capacity * 2, 64)
+        for bitmaps in self._bitmaps.values():
+            for value, bitmap in bitmaps.items():
+                grown = np.zeros(capacity, dtype=np.uint8)
+                grown[:len(bitmap)] = bitmap
+                bitmaps[value] = grown
+        self._capacity = capacity
+
+
+def _day(value: date) -> int:
+    return int((np.datetime64(value, "D") - _EPOCH).astype(np.int64))
+
+
+def _parse_day(value: Optional[str]) -> Optional[int]:
+    # Documents carry ISO dates as strings; anything else is left out of the date index
+    if not value:
+        return None
+    try:
+        return _day(date.fromisoformat(value[:10]))
+    except ValueError:
+        return None
@@ -0,0 +1,105 @@
+import json
+import re
+from typing import Dict, List
+
+from app.config import CONCEPT_TAXONOMY
+from app.matcher import ConceptMatcher
+from app.passages import split_passages
+
+
+# Legal concepts and the keywords that signal them, in query or document text.
+# Keywords match whole words, so inflected forms are listed explicitly.
+CONCEPT_KEYWORDS: Dict[str, List[str]] = {
+    "Breach of Contract": ["breach", "breached", "breaches", "contract", "contracts", "contractual",
+                           "agreement", "agreements", "violation", "violations"],
+    "Implied Contract": ["implied", "handbook", "handbooks", "policy", "policies", "expectation", "expectations"],
+    "At-Will Employment": ["at-will", "at will", "employment", "termination", "terminated", "fire", "fired"],
+    "Consumer Privacy Rights": ["privacy", "data", "personal information", "ccpa"],
+    "Right to Delete": ["delete", "deletion", "removal", "erasure", "data"],
+    "Commercial Lease": ["lease", "leases", "rent", "landlord", "tenant", "tenants"],
+    "Progressive Discipline": ["discipline", "disciplinary", "warning", "warnings", "progressive", "termination"],
+    "Damages and Remedies": ["damages", "remedy", "remedies", "compensation", "penalty", "penalties"],
+    "Good Faith": ["good faith", "fair dealing", "honest"],
+    "Legal Compliance": ["compliance", "statute", "statutes", "regulation", "regulations", "law", "laws"],
+}
+
+
+def load_taxonomy() -> Dict[str, List[str]]:
+    """The taxonomy file named by CONCEPT_TAXONOMY, or the built-in CONCEPT_KEYWORDS"""
+    if not CONCEPT_TAXONOMY:
+        return CONCEPT_KEYWORDS
+    with open(CONCEPT_TAXONOMY) as f:
+        return json.load(f)
+
+
+# Compiled once at import and shared by ingest-time tagging and query matching
+CONCEPT_MATCHER = ConceptMatcher(load_taxonomy())
+
+# Fallback key points for documents without a conclusion or summary
+CATEGORY_KEY_POINTS = {
+    "case_law": "Establishes precedent on implied contract formation; demonstrates how employer policies can create enforceable obligations",
+    "contract": "Details comprehensive lease terms including rent escalation, maintenance obligations, and early termination provisions",
+    "statute": "Grants consumers rights to access, delete, and control sale of personal information; establishes enforcement mechanisms",
+}
+DEFAULT_KEY_POINTS = "Relevant legal document providing guidance on applicable law and precedent"
+
+# Headings whose opening sentences state what a document decides, best first
+KEY_POINT_SECTIONS = ("HOLDING", "CONCLUSION", "DECISION", "DISPOSITION")
+KEY_POINT_SENTENCES = 2
+KEY_POINTS_MAX_LENGTH = 400
+MAX_CONCEPT_TAGS = 5
+
+# A heading line such as "CONCLUSION:" and the paragraph that follows it
+_SECTION_PATTERN = re.compile(r"^([A-Z][A-Z &'()/-]+):[ \t]*\n+(.+?)(?:\n\s*\n|\Z)", re.MULTILINE | re.DOTALL)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z(])")
+
+
+def document_features(doc: dict) -> dict:
+    """Key points, concept tags and passage offsets of a document, computed once when it is stored"""
+    return {
+        "key_points": extract_key_points(doc),
+        "concept_tags": extract_concept_tags(doc),
+        "passages": split_passages(doc.get("content", "")),
+    }
+
+
+def extract_key_points(doc: dict) -> str:
+    """
+    Opening sentences of the document's holding or conclusion when it has one,
+    otherwise its summary, otherwise a default for its category.
+    """
+    sections = {heading.strip(): body for heading, body in _SECTION_PATTERN.findall(doc.get("content", ""))}
+    for heading in KEY_POINT_SECTIONS:
+        if heading in sections:
+            sentences = _SENTENCE_END.split(" ".join(sections[heading].split()))
+            return _truncate(" ".join(sentences[:KEY_POINT_SENTENCES]))
+    if doc.get("summary"):
+        return _truncate(doc["summary"])
+    return CATEGORY_KEY_POINTS.get(doc.get("category", ""), DEFAULT_KEY_POINTS)
+
+
+def extract_concept_tags(doc: dict) -> List[str]:
+    """
+    The document's leading keywords, then the taxonomy concepts found in its
+    full text, most occurrences first. Tags differing only in case are kept
+    once.
+    """
+    tags = [_as_tag(keyword) for keyword in (doc.get("keywords") or [])[:2]]
+    text = "\n".join([doc.get("title") or "", doc.get("summary") or "", *(doc.get("keywords") or []), doc.get("content") or ""])
+    hits = CONCEPT_MATCHER.counts(text)
+    tags.extend(sorted(hits, key=hits.get, reverse=True))
+    unique = {}
+    for tag in tags:
+        unique.setdefault(tag.lower(), tag)
+    return list(unique.values())[:MAX_CONCEPT_TAGS]
+
+
+def _as_tag(keyword: str) -> str:
+    # Title-case plain keywords but keep acronyms such as "CCPA" as written
+    return keyword if any(char.isupper() for char in keyword) else keyword.title()
+
+
+def _truncate(text: str) -> str:
+    if len(text) <= KEY_POINTS_MAX_LENGTH:
+        return text
+    return text[:KEY_POINTS_MAX_LENGTH].rsplit(" ", 1)[0] + "..."
@@ -0,0 +1,134 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.dense import DenseIndex
+from app.index import CorpusLoader
+from app.metrics import timed
+
+
+class HybridIndex:
+    """
+    Sparse retrieval fused with dense retrieval by reciprocal rank fusion.
+
+    Every document is indexed by both engines. A query takes the top
+    `top_k * fanout` results of each: sparse results above the query's
+    `min_score`, dense results above `dense_min_score` (a cosine between
+    embeddings). A document's fused score is the sum of 1 / (rrf_k + rank)
+    over the lists it appears in, divided by the score of a document ranked
+    first in both, so scores fall in (0, 1]. Documents only the dense engine
+    finds, such as paraphrases sharing no terms with the query, can still
+    make the results.
+
+    Filters apply to both engines. Facet counts are the sparse engine's, as
+    it scores every matching document rather than the probed ones only.
+
+    Like `PassageIndex`, it takes the ids, texts and documents of a
+    `SearchIndex` and can itself be wrapped by a PassageIndex, in which case
+    both engines index passages.
+    """
+
+    def __init__(self, sparse, dense: DenseIndex, dense_min_score: float = 0.3, rrf_k: int = 60, fanout: int = 4):
+        self.sparse = sparse
+        self.dense = dense
+        self.dense_min_score = dense_min_score
+        self.rrf_k = rrf_k
+        self.fanout = max(1, fanout)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.sparse)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.sparse
+
+    @property
+    def generation(self) -> int:
+        return self.sparse.generation + self.dense.generation
+
+    @property
+    def needs_refit(self) -> bool:
+        return self.sparse.needs_refit or self.dense.needs_refit
+
+    @property
+    def refitting(self) -> bool:
+        return self.sparse.refitting or self.dense.refitting
+
+    def fit(self, ids: List[str], texts: List[str], documents: List[Any]) -> None:
+        with self._lock:
+            self.sparse.fit(ids, texts, documents)
+            self.dense.fit(ids, texts, documents)
+
+    def add(self, ids: List[str], texts: List[str], documents: List[Any]) -> None:
+        with self._lock:
+            self.sparse.add(ids, texts, documents)
+            self.dense.add(ids, texts, documents)
+
+    def remove(self, ids: List[str]) -> None:
+        with self._lock:
+            self.sparse.remove(ids)
+            self.dense.remove(ids)
+
+    def replace(self, ids: List[str], texts: List[str], documents: List[Any]) -> None:
+        with self._lock:
+            self.sparse.replace(ids, texts, documents)
+            self.dense.replace(ids, texts, documents)
+
+    def schedule_refit(self, load_corpus: CorpusLoader) -> bool:
+        """Refit whichever engines have drifted, each in its own background thread"""
+        started = False
+        for engine in (self.sparse, self.dense):
+            if engine.needs_refit:
+                started = engine.schedule_refit(load_corpus) or started
+        return started
+
+    def search(
+        self, text: str, top_k: int, min_score: float = 0.0, filters: Optional[dict] = None
+    ) -> List[Tuple[Any, float]]:
+        return self.search_batch([text], [top_k], [min_score], [filters])[0]
+
+    def search_batch(
+        self,
+        texts: List[str],
+        top_ks: List[int],
+        min_scores: List[float],
+        filters: Optional[List[Optional[dict]]] = None,
+        facet_counts: bool = False,
+    ) -> list:
+        """Fused results of each query, paired with the sparse facet counts when asked for"""
+        depths = [top_k * self.fanout for top_k in top_ks]
+        lexical = self.sparse.search_batch(texts, depths, min_scores, filters, facet_counts)
+        semantic = self.dense.search_batch(texts, depths, [self.dense_min_score] * len(texts), filters)
+        if not facet_counts:
+            lexical = [(sparse_hits, None) for sparse_hits in lexical]
+        with timed("topk"):
+            fused = [
+                (reciprocal_rank_fusion([sparse_hits, dense_hits], top_k, self.rrf_k), counts)
+                for (sparse_hits, counts), dense_hits, top_k in zip(lexical, semantic, top_ks)
+            ]
+        return fused if facet_counts else [results for results, _ in fused]
+
+    def first_documents(self, count: int, filters: Optional[dict] = None) -> List[Any]:
+        return self.sparse.first_documents(count, filters)
+
+
+def reciprocal_rank_fusion(rankings: List[List[Tuple[Any, float]]], top_k: int, k: int = 60) -> List[Tuple[Any, float]]:
+    """
+    The `top_k` best row documents of several rankings by reciprocal rank
+    fusion, with scores normalized so a row ranked first everywhere scores 1.
+    Ties keep the order in which rows were first seen, earlier rankings first.
+    """
+    fused: Dict[Any, list] = {}
+    for ranking in rankings:
+        for rank, (row_document, _) in enumerate(ranking, start=1):
+            entry = fused.setdefault(_row_key(row_document), [row_document, 0.0])
+            entry[1] += 1.0 / (k + rank)
+    best = len(rankings) / (k + 1)
+    ranked = sorted(fused.values(), key=lambda entry: entry[1], reverse=True)[:top_k]
+    return [(row_document, score / best) for row_document, score in ranked]
+
+
+def _row_key(row_document: Any):
+    # Passage rows are (document, passage) pairs; each engine builds its own on refits
+    if isinstance(row_document, tuple):
+        return row_document[0]["id"], row_document[1]["start"]
+    return row_document["id"]
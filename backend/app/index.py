@@ -0,0 +1,591 @@
+import math
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfTransformer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from app.facets import FacetIndex
+from app.metrics import timed
+from app.text import process_pool, tokenize
+
+
+# Maps a list of document ids to their (text, document) pairs, in
+# order, with None for documents deleted in the meantime
+CorpusLoader = Callable[[List[str]], List[Optional[Tuple[str, Any]]]]
+
+# Ranked (document, score) pairs of one query, and its facet counts when asked for
+ScoredQuery = Tuple[List[Tuple[Any, float]], Optional[Dict[str, Dict[str, int]]]]
+
+
+class SearchIndex:
+    """
+    Base class for retrieval engines over document text.
+
+    Engines tokenize raw text themselves with `app.text.tokenize`, the same
+    way for documents and queries, so no normalized copy of the text is kept.
+    Full builds tokenize over a pool of `workers` processes when above one.
+
+    A full fit learns the corpus statistics (vocabulary, IDF, lengths).
+    Documents added afterwards are indexed against those frozen statistics, so
+    ingest cost scales with the new documents only, and the statistics are
+    refit in a background thread once drift since the last fit passes
+    `refit_drift`.
+
+    Every indexed row has an entry in `row_documents`, and `_rows` maps live
+    document ids to their row. Removing a document tombstones its row (the
+    document slot becomes None, and its flag in a boolean dead-row mask is
+    set) until the next refit compacts the index.
+
+    `generation` increases with every change to the indexed corpus, so callers
+    can tell whether results computed earlier are still current.
+
+    `facets` holds bitmaps of the facet fields of every row (see
+    `app.facets`). Search filters become row masks applied inside top-k
+    selection, so filtered-out documents are never ranked and never crowd out
+    matching ones.
+
+    New rows are prepared (tokenized, vectorized) before the lock is taken,
+    so searches only wait for them to be appended.
+
+    Subclasses implement `_build`, `_load`, `_prepare_rows`, `_append_rows`
+    and `_score_batch`.
+    """
+
+    def __init__(self, refit_drift: float = 0.2, workers: int = 1):
+        self.refit_drift = refit_drift
+        self.workers = workers
+        self.row_documents: List[Any] = []
+        self.facets = FacetIndex()
+        self.generation = 0
+        self._rows: Dict[str, int] = {}
+        # Tombstoned rows flagged True; only the first len(row_documents) entries are used
+        self._dead = np.zeros(0, dtype=bool)
+        self._dead_count = 0
+        self._fitted = False
+        # Bumped on every install, so rows prepared against older statistics are redone
+        self._model_version = 0
+        self._fitted_count = 0
+        self._changed_since_fit = 0
+        self._tokens_since_fit = 0
+        self._oov_tokens_since_fit = 0
+        self._lock = threading.RLock()
+        self._refit_thread: Optional[threading.Thread] = None
+        self._refit_backlog: Optional[List[Tuple[str, Optional[str], Any]]] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    def get(self, doc_id: str) -> Optional[Any]:
+        """Document stored for a live id, or None"""
+        row = self._rows.get(doc_id)
+        return None if row is None else self.row_documents[row]
+
+    @property
+    def drift(self) -> float:
+        """Share of changed documents or out-of-vocabulary tokens since the last fit"""
+        doc_drift = self._changed_since_fit / max(self._fitted_count, 1)
+        token_drift = self._oov_tokens_since_fit / max(self._tokens_since_fit, 1)
+        return max(doc_drift, token_drift)
+
+    @property
+    def needs_refit(self) -> bool:
+        return self.drift > self.refit_drift
+
+    @property
+    def refitting(self) -> bool:
+        return self._refit_thread is not None and self._refit_thread.is_alive()
+
+    def fit(self, ids: List[str], texts: List[str], documents: List[Any]) -> None:
+        """Fit corpus statistics over the full corpus and rebuild the index"""
+        model = self._build(texts) if texts else None
+        with self._lock:
+            self._install(model, list(ids), list(documents))
+
+    def restore(self, model: Any, ids: List[str], documents: List[Any]) -> None:
+        """Install a prebuilt model, e.g. from a snapshot; None documents are tombstoned"""
+        with self._lock:
+            self._install(model, list(ids), list(documents))
+            self.remove([doc_id for doc_id, doc in zip(ids, documents) if doc is None])
+
+    def add(self, ids: List[str], texts: List[str], documents: List[Any]) -> None:
+        """Append documents using the statistics of the last fit"""
+        if not ids:
+            return
+        version = self._model_version
+        prepared = self._prepare_rows(texts, documents) if self._fitted else None
+        with self._lock:
+            if not self._fitted:
+                # Nothing has been fit yet, so these documents are the whole corpus
+                self.fit(ids, texts, documents)
+                return
+            if prepared is None or version != self._model_version:
+                # A refit installed new statistics while the rows were prepared
+                prepared = self._prepare_rows(texts, documents)
+            if self._refit_backlog is not None:
+                self._refit_backlog.extend(zip(ids, texts, documents))
+            first_row = len(self.row_documents)
+            tokens, oov_tokens = self._append_rows(prepared, documents)
+            self.row_documents.extend(documents)
+            self._reserve_dead(len(self.row_documents))
+            self.facets.add(documents)
+            self._rows.update((doc_id, first_row + offset) for offset, doc_id in enumerate(ids))
+            self._tokens_since_fit += tokens
+            self._oov_tokens_since_fit += oov_tokens
+            self._changed_since_fit += len(ids)
+            self.generation += 1
+
+    def remove(self, ids: List[str]) -> None:
+        """Tombstone the rows of the given documents"""
+        with self._lock:
+            for doc_id in ids:
+                row = self._rows.pop(doc_id, None)
+                if row is None:
+                    continue
+                self.row_documents[row] = None
+                self._dead[row] = True
+                self._dead_count += 1
+                self._changed_since_fit += 1
+                self.generation += 1
+                if self._refit_backlog is not None:
+                    self._refit_backlog.append((doc_id, None, None))
+
+    def replace(self, ids: List[str], texts: List[str], documents: List[Any]) -> None:
+        """Swap existing documents for new versions under the same ids"""
+        with self._lock:
+            self.remove(ids)
+            self.add(ids, texts, documents)
+
+    def schedule_refit(self, load_corpus: CorpusLoader) -> bool:
+        """Start a background refit unless one is already running"""
+        with self._lock:
+            if self.refitting:
+                return False
+            self._refit_thread = threading.Thread(
+                target=self._refit, args=(load_corpus,), name="index-refit", daemon=True
+            )
+            self._refit_thread.start()
+            return True
+
+    def search(
+        self, text: str, top_k: int, min_score: float = 0.0, filters: Optional[dict] = None
+    ) -> List[Tuple[Any, float]]:
+        """
+        Top `top_k` documents for a query, best first, keeping only
+        scores above `min_score` and documents accepted by `filters`.
+        """
+        return self.search_batch([text], [top_k], [min_score], [filters])[0]
+
+    def search_batch(
+        self,
+        texts: List[str],
+        top_ks: List[int],
+        min_scores: List[float],
+        filters: Optional[List[Optional[dict]]] = None,
+        facet_counts: bool = False,
+    ) -> list:
+        """
+        Search several queries at once; engines may score them together.
+        `filters` holds one facet filter (see `FacetIndex.mask`) or None per
+        query. With `facet_counts`, each query's results come paired with the
+        facet counts of all documents scoring above its `min_score` that pass
+        its filters.
+        """
+        scored = self._score_batch(texts, top_ks, min_scores, filters or [None] * len(texts), facet_counts)
+        return scored if facet_counts else [results for results, _ in scored]
+
+    def first_documents(self, count: int, filters: Optional[dict] = None) -> List[Any]:
+        """
+        Row documents of the first `count` live rows accepted by `filters`, in
+        row order, found from the facet bitmaps without reading any document
+        """
+        with self._lock:
+            documents = self.row_documents
+            mask = self.facets.mask(filters)
+        found = []
+        for row in (np.flatnonzero(mask) if mask is not None else range(len(documents))):
+            # Tombstoned rows hold None
+            if documents[row] is not None:
+                found.append(documents[row])
+                if len(found) == count:
+                    break
+        return found
+
+    def _score_batch(
+        self, texts: List[str], top_ks: List[int], min_scores: List[float], filters: List[Optional[dict]], facet_counts: bool
+    ) -> List[ScoredQuery]:
+        raise NotImplementedError
+
+    def _build(self, texts: List[str]) -> Any:
+        """Fit corpus statistics and index `texts`; returns the state for `_load`"""
+        raise NotImplementedError
+
+    def _load(self, model: Any) -> None:
+        """Install the state built by `_build`, or reset the index for None"""
+        raise NotImplementedError
+
+    def _prepare_rows(self, texts: List[str], documents: List[Any]) -> Any:
+        """
+        Tokenize and vectorize new rows with the frozen statistics, without the
+        lock; returns the state for `_append_rows`
+        """
+        raise NotImplementedError
+
+    def _append_rows(self, prepared: Any, documents: List[Any]) -> Tuple[int, int]:
+        """Append rows built by `_prepare_rows`; returns (tokens, out-of-vocabulary tokens)"""
+        raise NotImplementedError
+
+    def _counts(self, facets: FacetIndex, matched: np.ndarray, facet_counts: bool) -> Optional[Dict[str, Dict[str, int]]]:
+        """Facet counts of the matched rows when they were asked for"""
+        if not facet_counts:
+            return None
+        with timed("facets"):
+            return facets.counts(matched)
+
+    def _dead_row_mask(self) -> Optional[np.ndarray]:
+        """Boolean mask over the rows, True for tombstoned ones; None while there are none"""
+        return self._dead[:len(self.row_documents)] if self._dead_count else None
+
+    def _reserve_dead(self, rows: int) -> None:
+        if rows <= len(self._dead):
+            return
+        # Grow geometrically; masks handed out earlier keep the old array
+        grown = np.zeros(max(rows, len(self._dead) * 2), dtype=bool)
+        grown[:len(self._dead)] = self._dead
+        self._dead = grown
+
+    def _results(self, documents: List[Any], rows: np.ndarray, scores: np.ndarray) -> List[Tuple[Any, float]]:
+        # A document removed since the caller took its snapshot leaves a None behind
+        return [(documents[row], float(score)) for row, score in zip(rows, scores) if documents[row] is not None]
+
+    def _install(self, model: Any, ids: List[str], documents: List[Any]) -> None:
+        self._load(model)
+        self._model_version += 1
+        self.generation += 1
+        self._fitted = model is not None
+        self.row_documents = documents
+        self.facets = FacetIndex()
+        self.facets.add(documents)
+        self._rows = {doc_id: row for row, doc_id in enumerate(ids)}
+        self._dead = np.zeros(len(documents), dtype=bool)
+        self._dead_count = 0
+        self._fitted_count = len(ids)
+        self._changed_since_fit = 0
+        self._tokens_since_fit = 0
+        self._oov_tokens_since_fit = 0
+
+    def _refit(self, load_corpus: CorpusLoader) -> None:
+        with self._lock:
+            ids = list(self._rows)
+            self._refit_backlog = []
+        try:
+            loaded = load_corpus(ids)
+            ids = [doc_id for doc_id, item in zip(ids, loaded) if item is not None]
+            corpus = [item for item in loaded if item is not None]
+            texts = [text for text, _ in corpus]
+            model = self._build(texts) if texts else None
+        except Exception:
+            with self._lock:
+                self._refit_backlog = None
+            raise
+        with self._lock:
+            backlog, self._refit_backlog = self._refit_backlog, None
+            self._install(model, ids, [doc for _, doc in corpus])
+            # Replay changes made while the refit was running in one batch: the
+            # latest version of every changed document, or nothing if it was removed
+            latest = {}
+            for doc_id, text, doc in backlog:
+                latest.pop(doc_id, None)
+                latest[doc_id] = (text, doc)
+            self.remove(list(latest))
+            added = [(doc_id, text, doc) for doc_id, (text, doc) in latest.items() if text is not None]
+            self.add([doc_id for doc_id, _, _ in added], [text for _, text, _ in added], [doc for _, _, doc in added])
+            self._refit_thread = None
+            if self.needs_refit:
+                self.schedule_refit(load_corpus)
+
+
+class TfidfIndex(SearchIndex):
+    """
+    TF-IDF cosine similarity over a scikit-learn document-term matrix.
+
+    New documents are vectorized against the frozen vocabulary and appended as
+    row blocks after the fitted matrix, which is never copied. Appended blocks
+    are merged geometrically (see `append_block`) and every block is scored
+    with its own sparse product, so ingest cost does not grow with the corpus.
+    Rows are L2-normalized, so cosine similarity is a sparse dot product and
+    only rows sharing a term with the query are ever scored.
+
+    Full builds count terms in shards, over a process pool when there is
+    more than one worker (see `build_tfidf`).
+    """
+
+    # Leading blocks never merged with appended ones: the fitted matrix, which
+    # may be memory-mapped from a snapshot
+    _fitted_blocks = 1
+
+    def __init__(self, refit_drift: float = 0.2, workers: int = 1):
+        super().__init__(refit_drift, workers)
+        self.vectorizer: Optional[TfidfVectorizer] = None
+        self._blocks: List[sparse.csr_matrix] = []
+
+    @property
+    def matrix(self) -> Optional[sparse.csr_matrix]:
+        """Document-term matrix, a stacked copy when documents were added since the fit"""
+        with self._lock:
+            blocks = list(self._blocks)
+        if not blocks:
+            return None
+        return blocks[0] if len(blocks) == 1 else sparse.vstack(blocks, format="csr")
+
+    def _score_batch(
+        self, texts: List[str], top_ks: List[int], min_scores: List[float], filters: List[Optional[dict]], facet_counts: bool
+    ) -> List[ScoredQuery]:
+        """Vectorize all queries in one call and score them with one sparse product"""
+        with self._lock:
+            vectorizer, blocks = self.vectorizer, list(self._blocks)
+            if vectorizer is None or not blocks:
+                return [([], {} if facet_counts else None) for _ in texts]
+            documents = self.row_documents
+            dead_rows = self._dead_row_mask()
+            facets = self.facets
+            masks = [facets.mask(query_filters) for query_filters in filters]
+        with timed("preprocess"):
+            tokens = tfidf_tokens(texts)
+        with timed("vectorize"):
+            queries = vectorize_tokens(tokens, vectorizer)[0]
+        return [
+            (self._results(documents, rows, scores), self._counts(facets, matched, facet_counts))
+            for rows, scores, matched in score_top_k(queries, blocks, top_ks, min_scores, dead_rows, masks=masks)
+        ]
+
+    def _build(self, texts: List[str]):
+        return build_tfidf(texts, self.workers)
+
+    def _load(self, model) -> None:
+        self.vectorizer, matrix = model if model is not None else (None, None)
+        self._blocks = [matrix] if matrix is not None else []
+
+    def _prepare_rows(self, texts: List[str], documents: List[Any]):
+        return vectorize(texts, self.vectorizer)
+
+    def _append_rows(self, prepared, documents: List[Any]) -> Tuple[int, int]:
+        block, total_tokens, known_tokens = prepared
+        append_block(self._blocks, block, self._fitted_blocks)
+        return total_tokens, total_tokens - known_tokens
+
+
+def append_block(
+    blocks: List[sparse.csr_matrix],
+    block: sparse.csr_matrix,
+    fixed: int = 0,
+    row_ids: Optional[List[np.ndarray]] = None,
+    block_row_ids: Optional[np.ndarray] = None,
+) -> None:
+    """
+    Append a row block, then stack the last two blocks for as long as the
+    earlier one has no more rows than the later, leaving the first `fixed`
+    blocks alone. Block sizes halve from the front, like the digits of a
+    binary counter, so there are O(log n) blocks to score and each appended
+    row is copied O(log n) times. `row_ids`, when given, holds the row
+    numbers of each block and is merged alongside.
+    """
+    blocks.append(block)
+    if row_ids is not None:
+        row_ids.append(block_row_ids)
+    while len(blocks) - fixed >= 2 and blocks[-2].shape[0] <= blocks[-1].shape[0]:
+        last = blocks.pop()
+        blocks[-1] = sparse.vstack([blocks[-1], last], format="csr")
+        if row_ids is not None:
+            last_ids = row_ids.pop()
+            row_ids[-1] = np.concatenate([row_ids[-1], last_ids])
+
+
+# scikit-learn's default token pattern skips single characters; kept so
+# TF-IDF terms are unchanged from the vectorizer's own analysis
+TFIDF_MIN_TOKEN_LENGTH = 2
+
+
+# Shards per worker in a sharded build, so uneven shards still balance out
+SHARDS_PER_WORKER = 4
+
+
+def _pretokenized(tokens: List[str]) -> List[str]:
+    return tokens
+
+
+def build_tfidf(texts: List[str], workers: int = 1) -> Tuple[TfidfVectorizer, sparse.csr_matrix]:
+    """
+    Fit TF-IDF over `texts`, counting terms in shards.
+
+    Each shard is tokenized into its own sorted terms and term-count rows,
+    in a process pool when `workers` is above one. The shards are merged into
+    the global sorted vocabulary with rows in sorted column order, then
+    weighted by scikit-learn's TfidfTransformer (smoothed IDF, L2 rows). The
+    merged counts do not depend on how the corpus was split, so the
+    vocabulary, IDF and matrix are identical for any number of workers.
+    """
+    if workers <= 1:
+        counted = [_count_shard(texts)]
+    else:
+        shard_size = max(1, math.ceil(len(texts) / (workers * SHARDS_PER_WORKER)))
+        shards = [texts[start:start + shard_size] for start in range(0, len(texts), shard_size)]
+        with process_pool(workers) as executor:
+            counted = list(executor.map(_count_shard, shards))
+
+    terms = sorted(set().union(*(shard_terms for shard_terms, _ in counted)))
+    if not terms:
+        raise ValueError("empty vocabulary; the documents contain no indexable terms")
+    vocabulary = {term: column for column, term in enumerate(terms)}
+    blocks = []
+    for shard_terms, counts in counted:
+        # Both term lists are sorted, so remapping keeps row indices sorted
+        columns = np.fromiter((vocabulary[term] for term in shard_terms), dtype=counts.indices.dtype)
+        blocks.append(
+            sparse.csr_matrix((counts.data, columns[counts.indices], counts.indptr), shape=(counts.shape[0], len(terms)))
+        )
+    counts = sparse.vstack(blocks, format="csr")
+
+    transformer = TfidfTransformer()
+    matrix = transformer.fit_transform(counts)
+    vectorizer = TfidfVectorizer(analyzer=_pretokenized)
+    vectorizer.vocabulary_ = vocabulary
+    vectorizer.idf_ = transformer.idf_
+    return vectorizer, matrix
+
+
+def _count_shard(texts: List[str]) -> Tuple[List[str], sparse.csr_matrix]:
+    """Sorted terms of one shard and its term-count rows over them"""
+    vocabulary: Dict[str, int] = {}
+    indptr, indices = [0], []
+    for text in texts:
+        for token in tokenize(text, TFIDF_MIN_TOKEN_LENGTH):
+            indices.append(vocabulary.setdefault(token, len(vocabulary)))
+        indptr.append(len(indices))
+    terms = sorted(vocabulary)
+    order = np.empty(len(terms), dtype=np.int64)
+    order[[vocabulary[term] for term in terms]] = np.arange(len(terms))
+    counts = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.int64), order[np.asarray(indices, dtype=np.int64)], indptr),
+        shape=(len(texts), len(terms)),
+    )
+    counts.sum_duplicates()
+    return terms, counts
+
+
+def tfidf_tokens(texts: List[str]) -> List[List[str]]:
+    """Normalized terms of each text, as the TF-IDF vocabulary is built from them"""
+    return [tokenize(text, TFIDF_MIN_TOKEN_LENGTH) for text in texts]
+
+
+def vectorize(texts: List[str], vectorizer) -> Tuple[sparse.csr_matrix, int, int]:
+    """
+    TF-IDF rows for `texts` against a fitted vocabulary in a single tokenization
+    pass. Returns the rows plus the total and in-vocabulary token counts.
+    `vectorizer` only needs the fitted `vocabulary_` and `idf_`.
+    """
+    return vectorize_tokens(tfidf_tokens(texts), vectorizer)
+
+
+def vectorize_tokens(token_lists: List[List[str]], vectorizer) -> Tuple[sparse.csr_matrix, int, int]:
+    """`vectorize` for texts already split by `tfidf_tokens`"""
+    vocabulary = vectorizer.vocabulary_
+    indptr, indices = [0], []
+    total_tokens = 0
+    for tokens in token_lists:
+        indices.extend(vocabulary[token] for token in tokens if token in vocabulary)
+        indptr.append(len(indices))
+        total_tokens += len(tokens)
+    counts = sparse.csr_matrix(
+        (np.ones(len(indices)), indices, indptr),
+        shape=(len(token_lists), len(vocabulary)),
+    )
+    counts.sum_duplicates()
+    return normalize(counts.multiply(vectorizer.idf_).tocsr()), total_tokens, len(indices)
+
+
+def score_top_k(
+    queries: sparse.csr_matrix,
+    blocks: List[sparse.csr_matrix],
+    top_ks: List[int],
+    min_scores: List[float],
+    dead_rows: Optional[np.ndarray] = None,
+    row_ids: Optional[List[np.ndarray]] = None,
+    masks: Optional[List[Optional[np.ndarray]]] = None,
+) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Best (row, score) pairs of each query vector against the rows of
+    consecutive matrix `blocks`, scored with one sparse product per block,
+    and all rows scoring above the query's minimum. Rows are numbered across
+    the blocks in order, or taken from `row_ids` (one array per block) when
+    given; those are the numbers returned and looked up in the boolean
+    `dead_rows` mask of tombstoned rows and the per-query boolean row `masks`.
+    """
+    # One row per query, holding the scores of the documents it touches
+    with timed("score"):
+        products = block_products(queries, blocks)
+    results = []
+    with timed("topk"):
+        for i, (top_k, min_score) in enumerate(zip(top_ks, min_scores)):
+            rows, scores = query_hits(products, i, row_ids)
+            results.append(select_top_k(rows, scores, top_k, min_score, dead_rows, None if masks is None else masks[i]))
+    return results
+
+
+def block_products(queries: sparse.csr_matrix, blocks: List[sparse.csr_matrix]) -> List[sparse.csr_matrix]:
+    """Scores of the queries (rows) against the rows of each block (columns)"""
+    return [(queries @ block.T).tocsr() for block in blocks]
+
+
+def query_hits(
+    products: List[sparse.csr_matrix], query: int, row_ids: Optional[List[np.ndarray]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Rows and scores of one query over the `block_products` of consecutive blocks"""
+    rows, scores = [], []
+    offset = 0
+    for block, product in enumerate(products):
+        start, end = product.indptr[query], product.indptr[query + 1]
+        block_rows = product.indices[start:end]
+        rows.append(row_ids[block][block_rows] if row_ids is not None else block_rows.astype(np.int64) + offset)
+        scores.append(product.data[start:end])
+        offset += product.shape[1]
+    if len(rows) == 1:
+        return rows[0], scores[0]
+    return np.concatenate(rows), np.concatenate(scores)
+
+
+def select_top_k(
+    rows: np.ndarray,
+    scores: np.ndarray,
+    top_k: int,
+    min_score: float,
+    dead_rows: Optional[np.ndarray] = None,
+    mask: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Best (row, score) pairs among scored rows that are above `min_score`,
+    not flagged in the boolean `dead_rows` mask and accepted by the boolean
+    row `mask`, and all such rows
+    """
+    keep = scores > min_score
+    if dead_rows is not None:
+        keep &= ~dead_rows[rows]
+    if mask is not None:
+        keep &= mask[rows]
+    matched = rows[keep]
+    return (*top_k_rows(matched, scores[keep], top_k), matched)
+
+
+def top_k_rows(rows: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Select the k best (row, score) pairs without sorting every candidate"""
+    if len(scores) > k:
+        best = np.argpartition(-scores, k - 1)[:k]
+        rows, scores = rows[best], scores[best]
+    # Highest score first, lower row first on ties
+    order = np.lexsort((rows, -scores))
+    return rows[order], scores[order]
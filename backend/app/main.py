@@ -1,16 +1,74 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 import uvicorn
-import re
+import asyncio
+import base64
+import binascii
+import json
+import threading
+import time
+import zlib
 from datetime import datetime
-import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
-from app.models import LegalDocument, SearchQuery, SearchResponse, DocumentSummary
+from app.cache import QueryCache
+from app.content import ContentFile
+from app.config import (
+    CONTENT_DIR,
+    DENSE_DIMENSIONS,
+    DENSE_MIN_SCORE,
+    DENSE_MODEL,
+    DENSE_PROBES,
+    DENSE_QUANTIZED,
+    DENSE_RETRIEVAL,
+    DENSE_RRF_K,
+    INDEX_BUILD_WORKERS,
+    INDEX_PASSAGES,
+    INDEX_PASSAGES_PER_RESULT,
+    INDEX_REFIT_DRIFT,
+    INDEX_SHARD_KEY,
+    INDEX_SHARDS,
+    INDEX_SNAPSHOT,
+    INDEX_SNAPSHOT_VERIFY,
+    GENERATE_BATCH_MAX,
+    LIST_PAGE_SIZE,
+    LIST_PAGE_SIZE_MAX,
+    QUERY_CACHE_SIZE,
+    QUERY_CACHE_TTL,
+    SCORING_QUEUE_SIZE,
+    SCORING_WORKERS,
+    SEARCH_ENGINE,
+    SERVER_TIMING,
+    SUMMARY_CACHE_SIZE,
+    SUMMARY_CACHE_TTL,
+    SUMMARY_MAX_CONCURRENCY,
+    SUMMARY_MODEL,
+    SUMMARY_PROVIDER,
+    SUMMARY_TIMEOUT,
+    SUMMARY_URL,
+)
+from app.engines import create_index
+from app.executor import BoundedExecutor, ExecutorSaturated
+from app.features import CONCEPT_MATCHER, document_features
+from app.metrics import (
+    REGISTRY,
+    Counter,
+    Histogram,
+    Observed,
+    collect_timings,
+    resident_memory_bytes,
+    server_timing,
+    stop_collecting,
+    timed,
+)
+from app.models import LegalDocument, DocumentPage, SearchQuery, SearchResponse, DocumentSummary, PassageMatch
 from app.mock_data import LEGAL_DOCUMENTS
+from app.snapshot import load_snapshot
+from app.store import DocumentStore
+from app.summary import Summarizer, create_summary_provider
 
 app = FastAPI(
     title="Legal Document Search API",
@@ -27,76 +85,510 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage (simulating database)
-documents_db = LEGAL_DOCUMENTS.copy()
+# In-memory storage (simulating database), keyed by document id. Documents
+# carry their key points, concept tags and passages, which the document
+# endpoints leave out through their field lists and response models: ingested
+# documents get them when stored, the seed corpus on first use (see
+# `features_of`), so startup does not scan every document's text.
+# Their content is kept in a memory-mapped file and read back on demand.
+content_file = ContentFile(CONTENT_DIR)
+documents_db = DocumentStore(LEGAL_DOCUMENTS, content=content_file)
+documents_write_lock = threading.Lock()
+
+# --- Retrieval Engine ---
+index = create_index(
+    SEARCH_ENGINE,
+    shards=INDEX_SHARDS,
+    shard_key=INDEX_SHARD_KEY,
+    passages=INDEX_PASSAGES,
+    passages_per_document=INDEX_PASSAGES_PER_RESULT,
+    dense={
+        "model": DENSE_MODEL,
+        "dimensions": DENSE_DIMENSIONS,
+        "quantized": DENSE_QUANTIZED,
+        "probes": DENSE_PROBES,
+        "dense_min_score": DENSE_MIN_SCORE,
+        "rrf_k": DENSE_RRF_K,
+    } if DENSE_RETRIEVAL else None,
+    refit_drift=INDEX_REFIT_DRIFT,
+    workers=INDEX_BUILD_WORKERS,
+)
 
-# --- TF-IDF Implementation ---
-vectorizer = TfidfVectorizer()
-tfidf_matrix = None
-document_ids = []
+# Responses for repeated queries, keyed on the index generation so any change
+# to the corpus invalidates them
+query_cache = QueryCache(max_entries=QUERY_CACHE_SIZE, ttl_seconds=QUERY_CACHE_TTL)
 
-def preprocess_text(text: str) -> str:
-    """Simple text preprocessing: lowercase, remove non-alphanumeric, remove extra spaces."""
-    text = text.lower()
-    text = re.sub(r'[^a-z0-9\s]', '', text)  # Remove special characters
-    text = re.sub(r'\s+', ' ', text).strip()  # Remove extra spaces
-    return text
 
-def initialize_tfidf():
-    global tfidf_matrix, document_ids
-    
-    corpus = []
-    for doc in documents_db:
-        processed_content = preprocess_text(doc["content"])
-        doc["processed_content"] = processed_content  # Store processed content
-        corpus.append(processed_content)
-        document_ids.append(doc["id"])
-    
-    if corpus:
-        tfidf_matrix = vectorizer.fit_transform(corpus)
-    else:
-        tfidf_matrix = None
+class CachedSearch(NamedTuple):
+    """A cached response, with the documents and the query as written that its summary was made from"""
+    response: SearchResponse
+    documents: List[dict]
+    query: str
+
+
+# CPU-bound scoring runs here rather than on the shared request threadpool;
+# requests beyond its queue are rejected with 503 instead of piling up
+scoring_pool = BoundedExecutor(SCORING_WORKERS, SCORING_QUEUE_SIZE, name="scoring")
+
+# Summaries for /generate, awaited on the event loop with bounded concurrency
+# and a timeout, falling back to the templates
+summarizer = Summarizer(
+    create_summary_provider(
+        SUMMARY_PROVIDER, SUMMARY_URL, SUMMARY_MODEL, max_connections=SUMMARY_MAX_CONCURRENCY, timeout=SUMMARY_TIMEOUT
+    ),
+    timeout=SUMMARY_TIMEOUT,
+    max_concurrency=SUMMARY_MAX_CONCURRENCY,
+    cache=QueryCache(max_entries=SUMMARY_CACHE_SIZE, ttl_seconds=SUMMARY_CACHE_TTL),
+)
+
+# --- Metrics ---
+# Request counts and latencies by route, search counters, and gauges read
+# from the store, index and pools whenever /metrics is scraped
+http_requests = REGISTRY.register(Counter(
+    "legal_search_http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+))
+http_request_seconds = REGISTRY.register(Histogram(
+    "legal_search_http_request_seconds", "HTTP request latency by route", ("method", "route")
+))
+searches_received = REGISTRY.register(Counter("legal_search_queries_total", "Search queries received"))
+search_fallbacks = REGISTRY.register(Counter(
+    "legal_search_fallbacks_total", "Searches answered with the first documents because nothing matched"
+))
+for metric in (
+    Observed("legal_search_query_cache_hits_total", "Searches answered from the query cache",
+             lambda: query_cache.stats()["hits"], kind="counter"),
+    Observed("legal_search_query_cache_misses_total", "Searches not found in the query cache",
+             lambda: query_cache.stats()["misses"], kind="counter"),
+    Observed("legal_search_query_cache_entries", "Responses in the query cache", lambda: query_cache.stats()["entries"]),
+    Observed("legal_search_summaries_total", "Summaries by outcome", lambda: {
+        ("generated",): summarizer.stats()["generated"], ("fallback",): summarizer.stats()["fallbacks"]
+    }, labels=("outcome",), kind="counter"),
+    Observed("legal_search_scoring_in_flight", "Searches running or queued on the scoring pool",
+             lambda: scoring_pool.stats()["in_flight"]),
+    Observed("legal_search_scoring_rejected_total", "Searches rejected with 503 because the scoring pool was full",
+             lambda: scoring_pool.stats()["rejected"], kind="counter"),
+    Observed("legal_search_documents", "Documents in the store", lambda: len(documents_db)),
+    Observed("legal_search_index_documents", "Documents in the search index", lambda: len(index)),
+    Observed("legal_search_index_generation", "Changes applied to the search index", lambda: index.generation),
+    Observed("legal_search_index_refitting", "1 while a background refit is running", lambda: int(index.refitting)),
+    Observed("legal_search_content_file_bytes", "Bytes written to the content file, replaced documents included",
+             lambda: len(content_file)),
+    Observed("legal_search_resident_memory_bytes", "Resident memory of the process", resident_memory_bytes),
+):
+    REGISTRY.register(metric)
+
+
+def index_texts(docs: List[dict]) -> List[str]:
+    """
+    Text handed to the index. The index tokenizes it itself, so no normalized
+    copy is ever stored on the documents.
+    """
+    return [documents_db.content(doc) for doc in docs]
+
+
+def initialize_index():
+    docs = list(documents_db.values())
+    index.fit([doc["id"] for doc in docs], index_texts(docs), docs)
+
+
+def restore_index(path: str):
+    """
+    Memory-map a prebuilt index snapshot instead of fitting at startup.
+    Documents missing from the snapshot are appended incrementally.
+    """
+    load_snapshot(path, index, documents_db, verify=INDEX_SNAPSHOT_VERIFY)
+    missing = [doc for doc_id, doc in documents_db.items() if doc_id not in index]
+    index.add([doc["id"] for doc in missing], index_texts(missing), missing)
+
+
+def load_index_corpus(ids: List[str]) -> List[Optional[tuple]]:
+    """(text, document) pairs for the given ids, used by background refits"""
+    docs = [documents_db.get(doc_id) for doc_id in ids]
+    return [(documents_db.content(doc), doc) if doc else None for doc in docs]
+
+
+def stored_document(document: LegalDocument) -> dict:
+    """Document as stored: its fields plus key points and concept tags extracted once at ingest"""
+    doc = document.model_dump()
+    doc.update(document_features(doc))
+    return doc
+
+
+def ingest_documents(documents: List[LegalDocument]) -> List[dict]:
+    """
+    Add documents to the store and append them to the search index.
+    Only the new documents are vectorized; a full refit is scheduled in the
+    background once the index has drifted too far from its last fit.
+    """
+    new_docs = [stored_document(document) for document in documents]
+    new_ids = [doc["id"] for doc in new_docs]
+
+    with documents_write_lock:
+        if len(set(new_ids)) != len(new_ids) or any(doc_id in documents_db for doc_id in new_ids):
+            raise HTTPException(status_code=409, detail="Document with this ID already exists")
+        documents_db.update((doc["id"], doc) for doc in new_docs)
+        # The index keeps the stored documents, whose content lives in the content file
+        index.add(new_ids, index_texts(new_docs), [documents_db[doc_id] for doc_id in new_ids])
+        refresh_index()
+    return new_docs
+
+
+def refresh_index():
+    """Schedule a background refit once the index has drifted past its threshold"""
+    if index.needs_refit:
+        index.schedule_refit(load_index_corpus)
+
+# Build the search index on startup, or map a prebuilt snapshot when configured
+# (snapshots hold document-level TF-IDF matrices, so other engines, the
+# passage index and dense retrieval always fit at startup)
+if INDEX_SNAPSHOT and SEARCH_ENGINE == "tfidf" and not INDEX_PASSAGES and not DENSE_RETRIEVAL:
+    restore_index(INDEX_SNAPSHOT)
+else:
+    initialize_index()
+
+
+class RequestMetricsMiddleware:
+    """
+    Count and time every request by its route template (not its path, so
+    document ids do not become labels), and add a Server-Timing header with
+    the stage timings to requests that ask for it with `X-Server-Timing: 1`,
+    when SERVER_TIMING allows it. Streamed responses only carry the stages
+    finished before their first byte. Plain ASGI rather than
+    BaseHTTPMiddleware, so it adds no task or body copy per request, and
+    requests whose endpoint raises are still recorded (as 500).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        wants_timing = SERVER_TIMING and Headers(scope=scope).get("x-server-timing", "").strip() in ("1", "true")
+        timings, token = collect_timings() if wants_timing else (None, None)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_recorded(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if timings is not None:
+                    MutableHeaders(scope=message).append("Server-Timing", server_timing(timings, time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_recorded)
+        finally:
+            if token is not None:
+                stop_collecting(token)
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            http_requests.increment(scope["method"], route_path, str(status))
+            http_request_seconds.observe(elapsed, scope["method"], route_path)
+
+
+app.add_middleware(RequestMetricsMiddleware)
 
-# Initialize TF-IDF on startup
-initialize_tfidf()
+
+@app.on_event("shutdown")
+async def close_summarizer():
+    await summarizer.close()
 
 
 @app.get("/")
-def read_root():
+async def read_root():
     """Root endpoint with API information"""
     return {
         "message": "Legal Document Search API",
         "version": "1.0.0",
         "endpoints": {
-            "GET /api/documents": "Get all legal documents",
-            "GET /api/documents/{document_id}": "Get specific document",
-            "POST /generate": "Generate AI search results"
+            "GET /api/documents": "List legal documents (paginated)",
+            "GET /api/documents/{document_id}": "Get specific document, or a character range or section of its content",
+            "GET /api/documents/{document_id}/content": "Get document content as text, with HTTP byte ranges",
+            "GET /api/documents/export": "Stream all documents as NDJSON",
+            "POST /api/documents": "Add a legal document",
+            "POST /api/documents/bulk": "Add multiple legal documents",
+            "PUT /api/documents/{document_id}": "Replace a legal document",
+            "DELETE /api/documents/{document_id}": "Delete a legal document",
+            "POST /generate": "Generate AI search results",
+            "POST /generate/batch": "Generate AI search results for many queries",
+            "POST /generate/stream": "Stream AI search results as NDJSON events",
+            "GET /metrics": "Prometheus metrics"
         }
     }
 
 
-@app.get("/api/documents", response_model=List[LegalDocument])
-def get_documents():
+# Fields returned by the document listing unless `fields` asks for others
+LIST_FIELDS = [name for name in LegalDocument.model_fields if name != "content"]
+
+
+@app.get("/api/documents", response_model=DocumentPage)
+def get_documents(
+    limit: int = Query(default=LIST_PAGE_SIZE, ge=1, le=LIST_PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    category: Optional[str] = None,
+    jurisdiction: Optional[str] = None,
+):
+    """
+    Get legal documents a page at a time
+    Documents come in id order; pass `next_cursor` back as `cursor` for the
+    next page. `fields` is a comma-separated projection (content is left out
+    by default) and `category`/`jurisdiction` filter by exact value.
+    """
+    selected = parse_fields(fields) if fields else LIST_FIELDS
+    after = decode_cursor(cursor) if cursor else None
+    filters = {name: value for name, value in (("category", category), ("jurisdiction", jurisdiction)) if value}
+    predicate = (lambda doc: all(doc.get(name) == value for name, value in filters.items())) if filters else None
+
+    docs, last_id = documents_db.page(after, limit, predicate)
+    return DocumentPage(
+        documents=[document_fields(doc, selected) for doc in docs],
+        next_cursor=encode_cursor(last_id) if last_id is not None else None,
+        total=None if filters else len(documents_db),
+    )
+
+
+def document_fields(doc: dict, names: List[str]) -> dict:
+    """The named fields of a stored document, reading its content back only when asked for"""
+    return {name: documents_db.content(doc) if name == "content" else doc.get(name) for name in names}
+
+
+def parse_fields(fields: str) -> List[str]:
+    selected = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in LegalDocument.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return selected
+
+
+def encode_cursor(doc_id: str) -> str:
+    return base64.urlsafe_b64encode(doc_id.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return base64.b64decode(cursor.encode(), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+EXPORT_FIELDS = list(LegalDocument.model_fields)
+EXPORT_BATCH_SIZE = 100
+
+
+@app.get("/api/documents/export")
+def export_documents(request: Request, after: Optional[str] = None):
     """
-    Get all legal documents
-    Returns a list of all available legal documents in the system
+    Stream every document as newline-delimited JSON, in id order
+    Documents are read and written a batch at a time, so memory use does not
+    grow with the corpus. Pass the last id received as `after` to resume an
+    interrupted export. Compressed with gzip when the client accepts it.
     """
-    return documents_db
+    lines = iter_export_lines(after)
+    # The body depends on Accept-Encoding, so shared caches must key on it
+    headers = {"Vary": "Accept-Encoding"}
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        lines = gzip_stream(lines)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(lines, media_type="application/x-ndjson", headers=headers)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip: listed (or covered by `*`
+    when not listed) with a q-value above 0. Malformed q-values count as 0.
+    """
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def iter_export_lines(after: Optional[str]):
+    """NDJSON chunks of EXPORT_BATCH_SIZE documents, starting after the given id"""
+    cursor = after
+    while True:
+        docs, cursor = documents_db.page(cursor, EXPORT_BATCH_SIZE)
+        if docs:
+            yield "".join(json.dumps(document_fields(doc, EXPORT_FIELDS)) + "\n" for doc in docs).encode()
+        if cursor is None:
+            return
+
+
+def gzip_stream(chunks):
+    """
+    Compress a byte stream incrementally into a single gzip member, flushing
+    after every chunk so clients can decode each batch as it arrives
+    """
+    compressor = zlib.compressobj(wbits=31)  # 31 selects the gzip container
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
 
 
 @app.get("/api/documents/{document_id}", response_model=LegalDocument)
-def get_document(document_id: str):
+def get_document(
+    document_id: str,
+    response: Response,
+    start: Optional[int] = Query(default=None, ge=0),
+    end: Optional[int] = Query(default=None, ge=1),
+    section: Optional[str] = None,
+):
     """
     Get a specific document by ID
+    `start`/`end` (characters, end exclusive) or `section` (a heading such as
+    "CONCLUSION", matched case-insensitively) return only that span of the
+    content, described by an X-Content-Range header ("chars first-last/length")
+    """
+    doc = documents_db.get(document_id)
+    if doc is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    if start is None and end is None and section is None:
+        return documents_db.with_content(doc)
+
+    length = documents_db.content_length(doc)
+    if section is not None:
+        if start is not None or end is not None:
+            raise HTTPException(status_code=400, detail="Pass either a section or a start/end range, not both")
+        start, end = section_span(doc, section)
+    else:
+        start = start or 0
+        end = length if end is None else min(end, length)
+        if start >= length or start >= end:
+            raise HTTPException(
+                status_code=416, detail="Range not satisfiable", headers={"X-Content-Range": f"chars */{length}"}
+            )
+    response.headers["X-Content-Range"] = f"chars {start}-{end - 1}/{length}"
+    return {**doc, "content": documents_db.content(doc, start, end)}
+
+
+@app.get("/api/documents/{document_id}/content")
+def get_document_content(document_id: str, request: Request):
+    """
+    Raw UTF-8 content of a document as text/plain, honoring a single
+    `Range: bytes=...` request header with a 206 partial response
+    """
+    doc = documents_db.get(document_id)
+    if doc is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    size = documents_db.content_size(doc)
+    headers = {"Accept-Ranges": "bytes"}
+    byte_range = parse_byte_range(request.headers.get("range"), size)
+    if byte_range is None:
+        return Response(documents_db.content_bytes(doc), media_type="text/plain", headers=headers)
+    first, last = byte_range
+    if first >= size:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+    return Response(
+        documents_db.content_bytes(doc, first, last + 1),
+        status_code=206,
+        media_type="text/plain",
+        headers=headers,
+    )
+
+
+def section_span(doc: dict, section: str) -> tuple:
+    """Character span from the first to the last passage under a section heading"""
+    name = section.strip().lower()
+    spans = [
+        (passage["start"], passage["end"])
+        for passage in features_of(doc)["passages"]
+        if (passage["section"] or "").lower() == name
+    ]
+    if not spans:
+        raise HTTPException(status_code=404, detail="Section not found")
+    return spans[0][0], spans[-1][1]
+
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[tuple]:
+    """
+    First and last byte of a single `bytes=` range, clamped to `size`; None
+    for no header, other units or several ranges, which get the full content
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if not first:
+            # A suffix range: the last N bytes
+            return max(size - int(last), 0), size - 1
+        first = int(first)
+        last = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if first > last and first < size:
+        return None
+    return first, last
+
+
+@app.post("/api/documents", response_model=LegalDocument, status_code=201)
+def create_document(document: LegalDocument):
+    """
+    Add a single document
+    The document is searchable immediately without refitting the index
+    """
+    return ingest_documents([document])[0]
+
+
+@app.post("/api/documents/bulk", response_model=List[LegalDocument], status_code=201)
+def create_documents(documents: List[LegalDocument]):
+    """
+    Add multiple documents in one request
+    """
+    return ingest_documents(documents)
+
+
+@app.put("/api/documents/{document_id}", response_model=LegalDocument)
+def update_document(document_id: str, document: LegalDocument):
+    """
+    Replace an existing document
     """
-    for doc in documents_db:
-        if doc["id"] == document_id:
-            return doc
-    raise HTTPException(status_code=404, detail="Document not found")
+    if document.id != document_id:
+        raise HTTPException(status_code=400, detail="Document ID does not match the URL")
+    doc = stored_document(document)
+
+    with documents_write_lock:
+        if document_id not in documents_db:
+            raise HTTPException(status_code=404, detail="Document not found")
+        documents_db[document_id] = doc
+        index.replace([document_id], index_texts([doc]), [documents_db[document_id]])
+        refresh_index()
+    return doc
+
+
+@app.delete("/api/documents/{document_id}", status_code=204)
+def delete_document(document_id: str):
+    """
+    Delete a document and drop it from search results
+    """
+    with documents_write_lock:
+        if documents_db.pop(document_id, None) is None:
+            raise HTTPException(status_code=404, detail="Document not found")
+        index.remove([document_id])
+        refresh_index()
 
 
 @app.post("/generate", response_model=SearchResponse)
-def generate_search_results(query: SearchQuery):
+async def generate_search_results(query: SearchQuery):
     """
     Generate AI-powered search results
     
@@ -106,175 +598,304 @@ def generate_search_results(query: SearchQuery):
     3. Identifying relevant documents
     4. Extracting key legal concepts
     """
-    if not query.query or len(query.query.strip()) == 0:
-        raise HTTPException(status_code=400, detail="Query cannot be empty")
-    
-    if tfidf_matrix is None:
-        raise HTTPException(status_code=500, detail="TF-IDF not initialized. No documents available.")
+    return (await run_searches_async([query]))[0]
 
-    processed_query = preprocess_text(query.query)
-    query_vector = vectorizer.transform([processed_query])
-    
-    cosine_similarities = cosine_similarity(query_vector, tfidf_matrix).flatten()
-    
-    # Combine documents with their similarity scores
-    scored_documents = []
-    for i, doc_id in enumerate(document_ids):
-        doc = next((d for d in documents_db if d["id"] == doc_id), None)
-        if doc:
-            scored_documents.append({"document": doc, "score": cosine_similarities[i]})
-            
-    # Sort documents by score in descending order
-    scored_documents.sort(key=lambda x: x["score"], reverse=True)
-    
-    relevant_docs = [item["document"] for item in scored_documents if item["score"] > 0.1] # Threshold for relevance
-    relevance_scores = [item["score"] for item in scored_documents if item["score"] > 0.1]
 
-    # Fallback if no relevant documents found
-    if not relevant_docs:
-        relevant_docs = documents_db[:2]  # Return first 2 if no matches
-        relevance_scores = [0.1, 0.05] # Assign minimal scores
+@app.post("/generate/batch", response_model=List[SearchResponse])
+async def generate_batch_search_results(queries: List[SearchQuery]):
+    """
+    Generate search results for many queries in one request
+    All queries are vectorized together and scored with a single sparse
+    matrix product; responses are returned in request order
+    """
+    if len(queries) > GENERATE_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"Batch cannot exceed {GENERATE_BATCH_MAX} queries")
+    return await run_searches_async(queries)
+
+
+@app.post("/generate/stream")
+async def stream_search_results(query: SearchQuery):
+    """
+    Stream search results as newline-delimited JSON events
+    The ranked documents and facet counts are sent as soon as scoring
+    finishes, then the legal concepts, the summary in chunks and a final
+    "done" event, so the time to the first result does not depend on summary
+    generation
+    """
+    (cached,), generation = cached_responses([query])
+    if cached is not None:
+        events = iter_response_events(await reuse_response(query, cached))
+    else:
+        results, facets = (await run_scoring(search_queries, [query]))[0]
+        events = iter_search_events(query, results, facets, generation)
+    return StreamingResponse(events, media_type="application/x-ndjson")
+
+
+async def iter_search_events(query: SearchQuery, results: List[tuple], facets: dict, generation: int):
+    """Events for freshly ranked results; the assembled response is cached once the stream completes"""
+    relevant_docs, relevance_scores, passages = ranked_documents(results)
+    relevant_documents = document_summaries(relevant_docs, relevance_scores, passages)
+    yield ndjson_event("documents", relevant_documents=[summary.model_dump() for summary in relevant_documents])
+    yield ndjson_event("facets", facets=facets)
 
-    # Generate mock AI summary based on query type
-    summary = generate_mock_summary(query.query, relevant_docs)
-    
-    # Extract legal concepts
     legal_concepts = extract_legal_concepts(query.query, relevant_docs)
-    
-    return SearchResponse(
+    yield ndjson_event("concepts", legal_concepts=legal_concepts)
+
+    with timed("summary"):
+        summary, cacheable = await summarizer.summarize(query.query, relevant_docs)
+    for chunk in summary.splitlines(keepends=True):
+        yield ndjson_event("summary", text=chunk)
+
+    response = SearchResponse(
         summary=summary,
-        relevant_documents=[
-            DocumentSummary(
-                id=doc["id"],
-                title=doc["title"],
-                relevance_score=int(score * 100),  # Convert to percentage
-                key_points=generate_key_points(doc)
-            )
-            for doc, score in zip(relevant_docs[:3], relevance_scores[:3])
-        ],
+        relevant_documents=relevant_documents,
         legal_concepts=legal_concepts,
+        facets=facets,
         timestamp=datetime.utcnow().isoformat()
     )
+    if cacheable:
+        query_cache.put(query_cache_key(query, generation), CachedSearch(response, relevant_docs, query.query))
+    yield ndjson_event("done", timestamp=response.timestamp)
 
 
-def generate_mock_summary(query: str, relevant_docs: List[dict]) -> str:
-    """Generate a mock AI summary based on query and documents"""
-    query_lower = query.lower()
-    
-    # Contract-related queries
-    if any(word in query_lower for word in ["contract", "breach", "agreement", "lease"]):
-        return f"""Based on your query regarding "{query}", I've analyzed the relevant legal documents in our database.
+def iter_response_events(response: SearchResponse):
+    """The same events replayed from a complete (cached) response"""
+    yield ndjson_event("documents", relevant_documents=[summary.model_dump() for summary in response.relevant_documents])
+    yield ndjson_event("facets", facets=response.facets)
+    yield ndjson_event("concepts", legal_concepts=response.legal_concepts)
+    for chunk in response.summary.splitlines(keepends=True):
+        yield ndjson_event("summary", text=chunk)
+    yield ndjson_event("done", timestamp=response.timestamp)
 
-Contract law principles indicate that when parties enter into an agreement, they create legally binding obligations. A breach occurs when one party fails to fulfill their contractual duties without legal justification.
 
-The relevant documents show that remedies for breach of contract typically include:
-1. Compensatory damages to put the non-breaching party in the position they would have been in had the contract been performed
-2. Specific performance in cases where monetary damages are inadequate
-3. Rescission and restitution to restore parties to pre-contract positions
+def ndjson_event(event: str, **fields) -> bytes:
+    return (json.dumps({"event": event, **fields}) + "\n").encode()
 
-Key considerations include whether an implied contract was formed through conduct, policies, or representations, even in the absence of a formal written agreement. Courts examine the totality of circumstances, including employee handbooks, established practices, and oral assurances."""
 
-    # Privacy/CCPA queries
-    elif any(word in query_lower for word in ["privacy", "data", "ccpa", "personal information"]):
-        return f"""Regarding your query about "{query}", the California Consumer Privacy Act (CCPA) establishes comprehensive data protection rights for California residents.
+async def run_searches_async(queries: List[SearchQuery]) -> List[SearchResponse]:
+    """
+    Answer queries from the cache where possible, on the event loop. The
+    misses are scored as one batch on the scoring pool (or rejected with 503
+    when it is full) and their summaries are awaited from the summarizer
+    concurrently.
+    """
+    entries, generation = cached_responses(queries)
+    responses: List[Optional[SearchResponse]] = [None] * len(queries)
+    hits = [position for position, entry in enumerate(entries) if entry is not None]
+    misses = [position for position, entry in enumerate(entries) if entry is None]
+    if hits:
+        reused = await asyncio.gather(*(reuse_response(queries[position], entries[position]) for position in hits))
+        for position, response in zip(hits, reused):
+            responses[position] = response
+    if misses:
+        missed = [queries[position] for position in misses]
+        scored = await run_scoring(search_queries, missed)
+        built = await asyncio.gather(
+            *(summarize_search(query, results, facets) for query, (results, facets) in zip(missed, scored))
+        )
+        for position, query, (entry, cacheable) in zip(misses, missed, built):
+            # Responses with a fallback summary are not cached, so the provider gets another try
+            if cacheable:
+                query_cache.put(query_cache_key(query, generation), entry)
+            responses[position] = entry.response
+    return responses
+
+
+async def run_scoring(fn, *args):
+    """Run CPU-bound search work on the scoring pool, answering 503 when it is saturated"""
+    try:
+        return await scoring_pool.run(fn, *args)
+    except ExecutorSaturated:
+        raise HTTPException(
+            status_code=503, detail="Search is at capacity, retry shortly", headers={"Retry-After": "1"}
+        )
+
+
+def cached_responses(queries: List[SearchQuery]) -> tuple:
+    """CachedSearch (or None) for each query, and the index generation they were looked up at"""
+    if any(not query.query or len(query.query.strip()) == 0 for query in queries):
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    searches_received.increment(amount=len(queries))
 
-Under CCPA, consumers have the right to:
-1. Know what personal information is collected about them
-2. Request deletion of their personal information
-3. Opt-out of the sale of their personal information
-4. Non-discrimination for exercising their privacy rights
+    with timed("cache"):
+        # Read the generation before searching so a concurrent ingest can only
+        # leave behind an entry that is never hit again
+        generation = index.generation
+        entries = [query_cache.get(query_cache_key(query, generation)) for query in queries]
+    return entries, generation
 
-Businesses subject to CCPA must have annual gross revenues exceeding $25 million, or handle personal information of 50,000+ consumers/devices, or derive 50% or more of annual revenues from selling consumer personal information.
 
-The statute provides enforcement mechanisms including civil penalties up to $7,500 per intentional violation and a private right of action for data breaches ranging from $100-$750 per consumer per incident."""
+async def reuse_response(query: SearchQuery, cached: CachedSearch) -> SearchResponse:
+    """
+    A cached response for `query`. Keys ignore case and whitespace but the
+    summary quotes the query, so it is written again when the caller worded
+    the query differently.
+    """
+    update = {"timestamp": datetime.utcnow().isoformat()}
+    if cached.query != query.query:
+        with timed("summary"):
+            update["summary"], _ = await summarizer.summarize(query.query, cached.documents)
+    return cached.response.model_copy(update=update)
 
-    # Employment law queries
-    elif any(word in query_lower for word in ["employment", "termination", "wrongful", "employee"]):
-        return f"""In response to your question about "{query}", employment law principles generally follow the at-will doctrine, but important exceptions exist.
 
-While at-will employment allows termination for any lawful reason, exceptions include:
-1. Public policy violations (e.g., refusing to commit illegal acts)
-2. Implied contract exceptions created through handbooks, policies, or practices
-3. Implied covenant of good faith and fair dealing
+# Minimal scores of the documents returned when a query matches nothing
+FALLBACK_SCORES = (0.1, 0.05)
 
-Courts have held that detailed progressive discipline policies in employee handbooks can create enforceable implied contracts, limiting an employer's right to terminate without following stated procedures. This is particularly true when policy language suggests mandatory compliance rather than discretionary application.
 
-Employers should carefully review their written policies to ensure they don't create unintended contractual obligations that limit at-will employment flexibility."""
+def search_queries(queries: List[SearchQuery]) -> List[tuple]:
+    """
+    Ranked (document, score) pairs and facet counts for each query, or the
+    first documents passing its filters when nothing matched. Queries asking
+    for facets are searched as one batch and the others as another, so
+    counting never disables pruning for queries that did not ask for it.
+    """
+    if len(index) == 0:
+        raise HTTPException(status_code=500, detail="Search index not initialized. No documents available.")
+
+    searched: List[Optional[tuple]] = [None] * len(queries)
+    for facet_counts in (False, True):
+        positions = [position for position, query in enumerate(queries) if query.facets == facet_counts]
+        if not positions:
+            continue
+        batch = [queries[position] for position in positions]
+        # Best top_k documents above the relevance threshold that pass the
+        # query's filters, highest score first
+        found = index.search_batch(
+            [query.query for query in batch],
+            [query.top_k for query in batch],
+            [query.min_score for query in batch],
+            [query.filters.model_dump() if query.filters else None for query in batch],
+            facet_counts=facet_counts,
+        )
+        for position, hits in zip(positions, found):
+            searched[position] = hits if facet_counts else (hits, {})
+    for position, (results, facets) in enumerate(searched):
+        if not results:
+            # Fallback if no relevant documents found: the first documents passing
+            # the query's filters, taken from the facet bitmaps
+            search_fallbacks.increment()
+            filters = queries[position].filters
+            fallback = index.first_documents(len(FALLBACK_SCORES), filters.model_dump() if filters else None)
+            searched[position] = list(zip(fallback, FALLBACK_SCORES)), facets
+    # Extract the features of results that have none yet here rather than on the event loop
+    for results, _ in searched:
+        for hit in results:
+            features_of(hit[0])
+    return searched
+
+
+async def summarize_search(query: SearchQuery, results: List[tuple], facets: dict) -> tuple:
+    """CachedSearch for one query's ranked results with the summarizer's summary, and whether it may be cached"""
+    relevant_docs, relevance_scores, passages = ranked_documents(results)
+    with timed("summary"):
+        summary, cacheable = await summarizer.summarize(query.query, relevant_docs)
+    response = search_response(query, relevant_docs, relevance_scores, passages, facets, summary)
+    return CachedSearch(response, relevant_docs, query.query), cacheable
+
+
+def search_response(
+    query: SearchQuery,
+    relevant_docs: List[dict],
+    relevance_scores: List[float],
+    passages: list,
+    facets: dict,
+    summary: str,
+) -> SearchResponse:
+    # Extract legal concepts
+    legal_concepts = extract_legal_concepts(query.query, relevant_docs)
+    
+    return SearchResponse(
+        summary=summary,
+        relevant_documents=document_summaries(relevant_docs, relevance_scores, passages),
+        legal_concepts=legal_concepts,
+        facets=facets,
+        timestamp=datetime.utcnow().isoformat()
+    )
 
-    # General/fallback summary
-    else:
-        doc_titles = [doc["title"] for doc in relevant_docs[:2]]
-        return f"""Based on your query "{query}", I've identified relevant legal precedents and documentation.
 
-The analysis draws from multiple sources including {doc_titles[0] if doc_titles else 'case law'} and related legal materials. 
+def ranked_documents(results: List[tuple]) -> tuple:
+    """Documents, scores and best passages (None without the passage index) of the results"""
+    relevant_docs = [hit[0] for hit in results]
+    relevance_scores = [hit[1] for hit in results]
+    passages = [hit[2] if len(hit) > 2 else None for hit in results]
+    return relevant_docs, relevance_scores, passages
 
-Key findings indicate that legal principles in this area emphasize:
-1. The importance of documented agreements and established procedures
-2. Balance between statutory requirements and contractual obligations
-3. Protection of individual rights while maintaining institutional flexibility
 
-The documents demonstrate how courts interpret both explicit contractual terms and implied obligations arising from conduct, custom, and practice. Legal remedies are designed to restore injured parties to their rightful position while deterring future violations.
+def document_summaries(
+    relevant_docs: List[dict], relevance_scores: List[float], passages: Optional[list] = None
+) -> List[DocumentSummary]:
+    return [
+        DocumentSummary(
+            id=doc["id"],
+            title=doc["title"],
+            relevance_score=int(score * 100),  # Convert to percentage
+            key_points=features_of(doc)["key_points"],
+            passages=passage_matches(doc_passages)
+        )
+        for doc, score, doc_passages in zip(relevant_docs, relevance_scores, passages or [None] * len(relevant_docs))
+    ]
 
-For comprehensive legal advice tailored to your specific situation, consultation with a qualified attorney is recommended."""
 
-    return summary
+def passage_matches(passages: Optional[list]) -> Optional[List[PassageMatch]]:
+    if passages is None:
+        return None
+    return [
+        PassageMatch(section=passage["section"], start=passage["start"], end=passage["end"], relevance_score=int(score * 100))
+        for passage, score in passages
+    ]
 
 
-def generate_key_points(doc: dict) -> str:
-    """Generate key points for a document"""
-    category = doc.get("category", "")
-    
-    if category == "case_law":
-        return "Establishes precedent on implied contract formation; demonstrates how employer policies can create enforceable obligations"
-    elif category == "contract":
-        return "Details comprehensive lease terms including rent escalation, maintenance obligations, and early termination provisions"
-    elif category == "statute":
-        return "Grants consumers rights to access, delete, and control sale of personal information; establishes enforcement mechanisms"
-    else:
-        return "Relevant legal document providing guidance on applicable law and precedent"
+def query_cache_key(query: SearchQuery, generation: int) -> tuple:
+    """Cache key from the case- and whitespace-normalized query, its options and the index generation"""
+    options = json.dumps(query.model_dump(mode="json", exclude={"query"}), sort_keys=True)
+    return " ".join(query.query.lower().split()), options, generation
+
+
+def features_of(doc: dict) -> dict:
+    """
+    The stored document with its key points, concept tags and passages,
+    extracted from its content and kept on it the first time they are needed
+    """
+    if "key_points" not in doc:
+        doc.update(document_features(documents_db.with_content(doc)))
+    return doc
 
 
 def extract_legal_concepts(query: str, docs: List[dict]) -> List[str]:
     """Extract relevant legal concepts from query and documents"""
-    query_lower = query.lower()
-    concepts = set()
-    
-    # Keyword-based concept extraction
-    concept_keywords = {
-        "Breach of Contract": ["breach", "contract", "agreement", "violation"],
-        "Implied Contract": ["implied", "handbook", "policy", "expectation"],
-        "At-Will Employment": ["at-will", "employment", "termination", "fire"],
-        "Consumer Privacy Rights": ["privacy", "data", "personal information", "ccpa"],
-        "Right to Delete": ["delete", "removal", "erasure", "data"],
-        "Commercial Lease": ["lease", "rent", "landlord", "tenant"],
-        "Progressive Discipline": ["discipline", "warning", "progressive", "termination"],
-        "Damages and Remedies": ["damages", "remedy", "compensation", "penalty"],
-        "Good Faith": ["good faith", "fair dealing", "honest"],
-        "Legal Compliance": ["compliance", "statute", "regulation", "law"]
-    }
-    
-    for concept, keywords in concept_keywords.items():
-        if any(keyword in query_lower for keyword in keywords):
-            concepts.add(concept)
-    
-    # Add concepts from document keywords
-    for doc in docs[:2]:
-        if doc.get("keywords"):
-            for keyword in doc["keywords"][:2]:
-                concepts.add(keyword.title())
-    
-    return list(concepts)[:5]  # Return max 5 concepts
+    with timed("concepts"):
+        # Concepts whose keywords occur in the query, in one pass of the matcher
+        concepts = CONCEPT_MATCHER.match(query)
+
+        # Add the leading concept tags of the top documents
+        for doc in docs[:2]:
+            concepts.extend(features_of(doc)["concept_tags"][:2])
+
+        # Keep the first spelling of concepts differing only in case
+        unique = {}
+        for concept in concepts:
+            unique.setdefault(concept.lower(), concept)
+        return list(unique.values())[:5]  # Return max 5 concepts
 
 
 @app.get("/health")
-def health_check():
-    """Health check endpoint"""
+async def health_check():
+    """Health check endpoint, answered on the event loop so it stays responsive under search load"""
     return {
         "status": "healthy",
         "documents_count": len(documents_db),
+        "query_cache": query_cache.stats(),
+        "scoring_pool": scoring_pool.stats(),
+        "summarizer": summarizer.stats(),
         "timestamp": datetime.utcnow().isoformat()
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Counters, stage timing histograms and gauges in the Prometheus text format"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
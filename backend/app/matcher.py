@@ -0,0 +1,76 @@
+from collections import deque
+from typing import Dict, Iterable, List
+
+from app.text import tokenize
+
+
+class ConceptMatcher:
+    """
+    Multi-pattern matcher from keywords to the concepts they signal.
+
+    Keywords and text go through the shared tokenizer, and the keywords are
+    compiled into an Aho-Corasick automaton whose transitions are whole
+    tokens. Matches therefore always fall on word boundaries ("law" does not
+    match "lawful"), multi-word keywords match across any whitespace, and a
+    text is matched in one pass whose cost depends on its length, not on the
+    size of the taxonomy.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]]):
+        self.concepts: List[str] = list(taxonomy)
+        # One dict of token transitions, failure link and concept list per state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]
+        for concept_id, keywords in enumerate(taxonomy.values()):
+            for keyword in keywords:
+                self._insert(tokenize(keyword), concept_id)
+        self._link()
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Keyword occurrences per matched concept, in taxonomy order"""
+        hits = [0] * len(self.concepts)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for token in tokenize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for concept_id in outputs[state]:
+                hits[concept_id] += 1
+        return {self.concepts[concept_id]: count for concept_id, count in enumerate(hits) if count}
+
+    def match(self, text: str) -> List[str]:
+        """Concepts with at least one keyword in `text`, in taxonomy order"""
+        return list(self.counts(text))
+
+    def _insert(self, tokens: List[str], concept_id: int) -> None:
+        if not tokens:
+            return
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        if concept_id not in self._outputs[state]:
+            self._outputs[state].append(concept_id)
+
+    def _link(self) -> None:
+        # Breadth-first, so each failure link points at an already linked state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0)
+                # A match here also completes every (shorter) keyword ending at the
+                # failure state; each concept is still listed once per state
+                self._outputs[child] = list(dict.fromkeys(self._outputs[child] + self._outputs[self._fail[child]]))
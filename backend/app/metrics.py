@@ -0,0 +1,187 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+
+# Upper bounds in seconds of the timing histogram buckets, from 100 µs to 10 s
+TIMING_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Stage durations of the current request, collected for its Server-Timing
+# header while one is being built, None otherwise
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+# Guards the timings dicts, which stages running on shard and scoring threads update
+_timings_lock = threading.Lock()
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram per label set, in the Prometheus sense.
+    Observing takes one bisect and one short lock, so it is cheap enough to
+    stay on in the search hot path.
+    """
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = TIMING_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series: Dict[tuple, list] = {}  # label values -> [bucket counts, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][position] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = [(values, list(counts), total) for values, (counts, total) in sorted(self._series.items())]
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for values, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labels + ('le',), values + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, values)} {total!r}")
+            lines.append(f"{self.name}_count{_labels(self.labels, values)} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Monotonic count per label set"""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines.extend(f"{self.name}{_labels(self.labels, labels)} {value!r}" for labels, value in values)
+        return lines
+
+
+class Observed:
+    """
+    Gauge or counter whose value is read from elsewhere when rendered, such
+    as a pool's stats; `read` returns a number, or numbers per label values
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        read: Callable[[], Union[float, Dict[tuple, float]]],
+        labels: Tuple[str, ...] = (),
+        kind: str = "gauge",
+    ):
+        self.name = name
+        self.help = help
+        self.read = read
+        self.labels = labels
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        value = self.read()
+        values = value if isinstance(value, dict) else {(): value}
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{self.name}{_labels(self.labels, labels)} {float(number)!r}" for labels, number in values.items())
+        return lines
+
+
+class Registry:
+    """Metrics rendered together in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        # Re-registering a name replaces the metric, so reloaded modules do not duplicate it
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics.values() for line in metric.render()) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "legal_search_stage_seconds", "Time spent in each stage of answering searches", ("stage",)
+))
+
+
+@contextmanager
+def timed(stage: str):
+    """
+    Record the time spent in the block under `stage`, and add it to the
+    current request's Server-Timing when one is being collected. Stages run
+    in parallel threads (such as shards) each record their own time.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            with _timings_lock:
+                timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def collect_timings():
+    """Start collecting stage timings for the current context; returns (timings, token)"""
+    timings: Dict[str, float] = {}
+    return timings, _request_timings.set(timings)
+
+
+def stop_collecting(token) -> None:
+    _request_timings.reset(token)
+
+
+def server_timing(timings: Dict[str, float], total: float) -> str:
+    """Server-Timing header value, with durations in milliseconds"""
+    with _timings_lock:
+        entries = [f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in timings.items()]
+    entries.append(f"total;dur={total * 1000:.3f}")
+    return ", ".join(entries)
+
+
+def _labels(names: Tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = (f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def resident_memory_bytes() -> int:
+    """Resident set size of this process, or its peak where the current size is not available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS; /proc covers Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
@@ -45,50 +45,6 @@ This case reinforces the principle that employers must carefully review their ha
 
 IT IS SO ORDERED.
 
-Judge Patricia Martinez
-Superior Court of California
-June 15, 2022""",
-        "jurisdiction": "California",
-        "parties": "Michael Smith (Plaintiff) v. Johnson Manufacturing Corp. (Defendant)",
-        "keywords": ["employment law", "breach of contract", "implied contract", "wrongful termination", "progressive discipline", "at-will employment"],
-        "processed_content": """SUPERIOR COURT OF CALIFORNIA
-COUNTY OF LOS ANGELES
-
-Case No. 2022-CV-8845
-
-MICHAEL SMITH, Plaintiff,
-v.
-JOHNSON MANUFACTURING CORP., Defendant.
-
-OPINION
-
-This case concerns the termination of Michael Smith, a 15-year employee of Johnson Manufacturing Corp., without adherence to the company's established progressive discipline policy outlined in the employee handbook.
-
-FACTS:
-Plaintiff Michael Smith was employed by Johnson Manufacturing Corp. from January 2007 through March 2022. During his tenure, Smith received consistent positive performance reviews and was promoted twice. In March 2022, Smith was terminated immediately following a single incident involving a disagreement with a supervisor, with no prior warnings or documentation of poor performance.
-
-The company's employee handbook, distributed to all employees including Smith, contained a detailed progressive discipline policy that included: (1) verbal warning, (2) written warning, (3) suspension, and (4) termination. The handbook stated that this policy would be followed "in all cases except those involving gross misconduct."
-
-LEGAL ANALYSIS:
-California follows the at-will employment doctrine, which generally allows employers to terminate employees for any reason or no reason, absent an illegal motive. However, exceptions to at-will employment exist, including:
-
-1. Public policy exceptions
-2. Implied contract exceptions
-3. Implied covenant of good faith and fair dealing
-
-In this case, the Court finds that Johnson Manufacturing Corp. created an implied contract through its employee handbook. The specific and detailed progressive discipline policy, combined with language indicating it would be followed, created a reasonable expectation of continued employment absent proper adherence to stated procedures.
-
-The Court relies on the precedent established in Foley v. Interactive Data Corp. (1988) 47 Cal.3d 654, which held that implied-in-fact contracts can arise from personnel policies, practices, and oral representations.
-
-CONCLUSION:
-The Court holds that Johnson Manufacturing Corp. breached the implied employment contract by failing to follow its stated progressive discipline policy. While Smith's employment was at-will, the company's own policies created contractual obligations that limited its right to terminate without following established procedures.
-
-Damages are awarded to Plaintiff in the amount of $185,000, representing lost wages, benefits, and emotional distress.
-
-This case reinforces the principle that employers must carefully review their handbooks and policies, as specific procedural promises can create enforceable contractual obligations that limit at-will employment rights.
-
-IT IS SO ORDERED.
-
 Judge Patricia Martinez
 Superior Court of California
 June 15, 2022""",
@@ -206,115 +162,6 @@ _______________________            _______________________
 Robert Chen, Managing Partner      Sarah Williams, CEO
 Date: March 1, 2023                Date: March 1, 2023
 
-Attachments:
-- Exhibit A: Floor Plan of Premises
-- Exhibit B: Building Rules and Regulations
-- Exhibit C: Parking Agreement (5 assigned spaces)""",
-        "jurisdiction": "California",
-        "parties": "Tech Plaza Properties LLC (Landlord) v. DataCore Systems Inc. (Tenant)",
-        "keywords": ["commercial lease", "real estate", "contract law", "landlord-tenant", "rent escalation", "early termination", "maintenance obligations"],
-        "processed_content": """COMMERCIAL LEASE AGREEMENT
-
-This Lease Agreement ("Agreement") is entered into as of March 1, 2023, by and between:
-
-LANDLORD: Tech Plaza Properties LLC
-Address: 500 Innovation Drive, Suite 100, San Francisco, CA 94105
-
-TENANT: DataCore Systems Inc.
-Address: 1200 Market Street, San Francisco, CA 94102
-
-PREMISES:
-Landlord hereby leases to Tenant, and Tenant hereby leases from Landlord, the following described premises ("Premises"):
-
-Office Suite 850, consisting of approximately 5,500 square feet of rentable space located on the 8th floor of Tech Plaza at 500 Innovation Drive, San Francisco, California 94105.
-
-TERM:
-The initial term of this Lease shall be five (5) years, commencing on April 1, 2023 ("Commencement Date") and ending on March 31, 2028 ("Expiration Date").
-
-RENT:
-1. Base Rent: Tenant shall pay Landlord monthly base rent as follows:
-   - Years 1-2: $16,500 per month ($3.00 per sq ft)
-   - Years 3-4: $17,875 per month ($3.25 per sq ft)
-   - Year 5: $19,250 per month ($3.50 per sq ft)
-
-2. Additional Rent: Tenant shall pay as additional rent:
-   - Property taxes (estimated $825/month)
-   - Insurance premiums (estimated $275/month)
-   - Common area maintenance ("CAM") charges (estimated $1,100/month)
-
-3. Payment Terms: Rent is due on the first day of each month without demand or deduction. Late payments will incur a 5% late fee after a 5-day grace period.
-
-SECURITY DEPOSIT:
-Tenant has deposited $33,000 (equal to two months' base rent) as security for the faithful performance of Tenant's obligations. This deposit will be held in an interest-bearing account and returned within 30 days after lease termination, minus any deductions for damages or unpaid obligations.
-
-PERMITTED USE:
-The Premises shall be used solely for general office purposes related to software development and technology services. No retail operations, manufacturing, or residential use is permitted.
-
-MAINTENANCE AND REPAIRS:
-1. Landlord's Obligations:
-   - Maintain structural elements (roof, foundation, exterior walls)
-   - Maintain and repair common areas
-   - Provide HVAC maintenance and repairs
-   - Maintain elevators and building systems
-
-2. Tenant's Obligations:
-   - Maintain interior of Premises in good condition
-   - Replace interior lighting and fixtures
-   - Maintain any Tenant improvements
-   - Keep Premises clean and sanitary
-
-ALTERATIONS:
-Tenant may make non-structural alterations with Landlord's prior written consent. All alterations become property of Landlord unless Landlord requires removal at lease end. Tenant must obtain all necessary permits and comply with building codes.
-
-INSURANCE:
-Tenant must maintain:
-- Commercial general liability insurance ($2,000,000 minimum)
-- Property insurance covering Tenant's personal property
-- Workers' compensation insurance as required by law
-
-Landlord must be named as additional insured on all policies.
-
-EARLY TERMINATION:
-Tenant may terminate this Lease early only under the following conditions:
-1. After 36 months of the initial term
-2. With 180 days' written notice
-3. Payment of early termination fee equal to 6 months' base rent
-4. Premises returned in good condition
-
-DEFAULT AND REMEDIES:
-The following constitute events of default:
-- Failure to pay rent within 10 days of due date
-- Violation of any lease term that continues for 30 days after written notice
-- Bankruptcy or insolvency of Tenant
-- Abandonment of Premises
-
-Upon default, Landlord may:
-- Terminate the Lease
-- Pursue eviction proceedings
-- Recover all unpaid rent and damages
-- Recover attorney's fees and costs
-
-ASSIGNMENT AND SUBLETTING:
-Tenant may not assign this Lease or sublet the Premises without Landlord's prior written consent, which shall not be unreasonably withheld. Landlord may require credit checks and financial statements of proposed assignees or subtenants.
-
-HOLDOVER:
-If Tenant remains in possession after lease expiration without a new agreement, tenancy becomes month-to-month at 150% of the last month's base rent, and Tenant must provide 60 days' notice to vacate.
-
-GENERAL PROVISIONS:
-- This Agreement shall be governed by California law
-- Any disputes shall be resolved through binding arbitration
-- All notices must be in writing and delivered by certified mail
-- Time is of the essence in this Agreement
-- This Agreement constitutes the entire agreement between parties
-
-IN WITNESS WHEREOF, the parties have executed this Lease Agreement as of the date first written above.
-
-TECH PLAZA PROPERTIES LLC          DATACORE SYSTEMS INC.
-
-_______________________            _______________________
-Robert Chen, Managing Partner      Sarah Williams, CEO
-Date: March 1, 2023                Date: March 1, 2023
-
 Attachments:
 - Exhibit A: Floor Plan of Premises
 - Exhibit B: Building Rules and Regulations
@@ -417,96 +264,6 @@ Businesses must:
 EFFECTIVE DATE: January 1, 2020
 ENFORCEMENT BEGIN: July 1, 2020
 
-This statute represents a significant shift in privacy law, establishing California as a national leader in consumer data protection and influencing privacy legislation nationwide.""",
-        "jurisdiction": "California",
-        "parties": "N/A - State Statute",
-        "keywords": ["privacy law", "CCPA", "consumer rights", "personal information", "data protection", "right to delete", "opt-out", "California law"],
-        "processed_content": """CALIFORNIA CIVIL CODE
-DIVISION 3. OBLIGATIONS
-PART 4. OBLIGATIONS ARISING FROM PARTICULAR TRANSACTIONS
-TITLE 1.81.5. CALIFORNIA CONSUMER PRIVACY ACT OF 2018
-
-§ 1798.100. Consumer Rights to Know About Personal Information Collected
-
-(a) A consumer shall have the right to request that a business that collects a consumer's personal information disclose to that consumer the categories and specific pieces of personal information the business has collected.
-
-(b) A business that collects a consumer's personal information shall, at or before the point of collection, inform consumers as to the categories of personal information to be collected and the purposes for which the categories of personal information shall be used. A business shall not collect additional categories of personal information or use personal information collected for additional purposes without providing the consumer with notice consistent with this section.
-
-(c) A business shall provide the information specified in subdivision (a) to a consumer only upon receipt of a verifiable consumer request.
-
-(d) A business that receives a verifiable consumer request from a consumer to access personal information shall promptly take steps to disclose and deliver, free of charge to the consumer, the personal information required by this section. The information may be delivered by mail or electronically, and if provided electronically, the information shall be in a portable and, to the extent technically feasible, readily useable format that allows the consumer to transmit this information to another entity without hindrance. A business may provide personal information to a consumer at any time, but shall not be required to provide personal information to a consumer more than twice in a 12-month period.
-
-(e) The disclosure required by subdivision (a) shall cover the 12-month period preceding the business's receipt of the verifiable consumer request and shall be made in writing and delivered through the consumer's account with the business, if the consumer maintains an account with the business, or by mail or electronically at the consumer's option if the consumer does not maintain an account with the business, in a readily useable format that allows the consumer to transmit this information from one entity to another entity without hindrance.
-
-DEFINITIONS (from § 1798.140):
-
-(1) "Business" means:
-   (A) A sole proprietorship, partnership, limited liability company, corporation, association, or other legal entity that is organized or operated for the profit or financial benefit of its shareholders or other owners, that collects consumers' personal information, or on the behalf of which such information is collected and that alone, or jointly with others, determines the purposes and means of the processing of consumers' personal information, that does business in the State of California, and that satisfies one or more of the following thresholds:
-      (i) Has annual gross revenues in excess of twenty-five million dollars ($25,000,000)
-      (ii) Alone or in combination, annually buys, receives for the business's commercial purposes, sells, or shares for commercial purposes, alone or in combination, the personal information of 50,000 or more consumers, households, or devices.
-      (iii) Derives 50 percent or more of its annual revenues from selling consumers' personal information.
-
-(2) "Consumer" means a natural person who is a California resident.
-
-(3) "Personal information" means information that identifies, relates to, describes, is reasonably capable of being associated with, or could reasonably be linked, directly or indirectly, with a particular consumer or household. Personal information includes, but is not limited to:
-   - Identifiers such as name, alias, postal address, unique personal identifier, online identifier, IP address, email address, account name, social security number, driver's license number
-   - Commercial information, including records of personal property, products or services purchased
-   - Biometric information
-   - Internet or other electronic network activity information
-   - Geolocation data
-   - Audio, electronic, visual, thermal, olfactory, or similar information
-   - Professional or employment-related information
-   - Education information
-   - Inferences drawn from any of the above to create a profile about a consumer
-
-§ 1798.105. Consumer Right to Delete Personal Information
-
-(a) A consumer shall have the right to request that a business delete any personal information about the consumer which the business has collected from the consumer.
-
-(b) A business that collects personal information about consumers shall disclose the consumer's rights to request the deletion of the consumer's personal information.
-
-(c) A business that receives a verifiable consumer request from a consumer to delete the consumer's personal information shall delete the consumer's personal information from its records and direct any service providers to delete the consumer's personal information from their records.
-
-(d) A business or a service provider may deny a consumer's deletion request if retaining the information is necessary for the business or service provider to:
-   (1) Complete the transaction for which the personal information was collected
-   (2) Detect security incidents, protect against malicious, deceptive, fraudulent, or illegal activity
-   (3) Debug to identify and repair errors
-   (4) Exercise free speech or ensure another consumer's right to exercise free speech
-   (5) Comply with the California Electronic Communications Privacy Act
-   (6) Engage in public or peer-reviewed scientific, historical, or statistical research
-   (7) Enable solely internal uses that are reasonably aligned with the expectations of the consumer
-   (8) Comply with a legal obligation
-   (9) Otherwise use the consumer's personal information, internally, in a lawful manner compatible with the context in which the consumer provided the information
-
-§ 1798.120. Right to Opt-Out of Sale of Personal Information
-
-(a) A consumer shall have the right, at any time, to direct a business that sells personal information about the consumer to third parties not to sell the consumer's personal information. This right may be referred to as the right to opt-out.
-
-(b) A business that sells consumers' personal information to third parties shall provide notice to consumers that their information may be sold and that consumers have the right to opt-out of the sale of their personal information.
-
-(c) A business that has received direction from a consumer not to sell the consumer's personal information or, in the case of a minor consumer's personal information has not received consent to sell the minor consumer's personal information, shall be prohibited from selling the consumer's personal information after receipt of such direction, unless the consumer subsequently provides express authorization for the sale of their personal information.
-
-ENFORCEMENT AND PENALTIES:
-
-Violations of the CCPA may result in:
-- Civil penalties up to $2,500 per violation
-- Civil penalties up to $7,500 per intentional violation
-- Private right of action for data breaches: $100-$750 per consumer per incident
-- Injunctive or declaratory relief
-
-BUSINESS OBLIGATIONS:
-
-Businesses must:
-1. Provide two or more methods for consumers to submit requests (toll-free number and website required)
-2. Respond to consumer requests within 45 days (extendable by 45 additional days with notice)
-3. Not discriminate against consumers who exercise their CCPA rights
-4. Maintain reasonable security procedures
-5. Provide training to employees who handle consumer inquiries
-6. Update privacy policies at least once every 12 months
-
-EFFECTIVE DATE: January 1, 2020
-ENFORCEMENT BEGIN: July 1, 2020
-
 This statute represents a significant shift in privacy law, establishing California as a national leader in consumer data protection and influencing privacy legislation nationwide.""",
         "jurisdiction": "California",
         "parties": "N/A - State Statute",
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
 
 
 class LegalDocument(BaseModel):
@@ -15,11 +15,38 @@ class LegalDocument(BaseModel):
     jurisdiction: Optional[str] = None
     parties: Optional[str] = None
     keywords: Optional[List[str]] = None
-    processed_content: Optional[str] = None
+
+
+class DocumentPage(BaseModel):
+    documents: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+class SearchFilters(BaseModel):
+    # Accepted values of each facet (any of them), and an inclusive date range
+    category: Optional[List[str]] = None
+    court: Optional[List[str]] = None
+    jurisdiction: Optional[List[str]] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
 
 
 class SearchQuery(BaseModel):
     query: str
+    top_k: int = Field(default=3, ge=1, le=100)
+    min_score: float = Field(default=0.1, ge=0.0, le=1.0)
+    filters: Optional[SearchFilters] = None
+    # Count matching documents per facet value. Off by default: counting
+    # visits every match, which keeps BM25 from pruning
+    facets: bool = False
+
+
+class PassageMatch(BaseModel):
+    section: Optional[str] = None
+    start: int
+    end: int
+    relevance_score: int
 
 
 class DocumentSummary(BaseModel):
@@ -27,10 +54,16 @@ class DocumentSummary(BaseModel):
     title: str
     relevance_score: int
     key_points: str
+    # Best-matching passages, as character offsets into the document content,
+    # when searching the passage index
+    passages: Optional[List[PassageMatch]] = None
 
 
 class SearchResponse(BaseModel):
     summary: str
     relevant_documents: List[DocumentSummary]
     legal_concepts: List[str]
+    # Documents scoring above min_score and passing the filters, per value of
+    # each facet field; empty unless the query asked for facets
+    facets: Dict[str, Dict[str, int]] = {}
     timestamp: str
\ No newline at end of file
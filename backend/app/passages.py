@@ -0,0 +1,241 @@
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.index import CorpusLoader, SearchIndex
+
+
+# Paragraphs shorter than this are merged into the next one of their section,
+# and longer ones are cut at the last sentence end before the limit
+PASSAGE_MIN_CHARS = 200
+PASSAGE_MAX_CHARS = 1500
+
+# A heading line such as "LEGAL ANALYSIS:" opening a paragraph
+_HEADING_PATTERN = re.compile(r"([A-Z][A-Z &'()/-]+):[ \t]*(?:\n|\Z)")
+# Paragraphs are separated by blank lines; spans exclude surrounding whitespace
+_PARAGRAPH_PATTERN = re.compile(r"\S.*?(?=\n[ \t]*\n|\s*\Z)", re.DOTALL)
+_SENTENCE_END = re.compile(r"[.!?]\s")
+
+# Separates a document id from its passage number in passage ids
+PASSAGE_ID_SEPARATOR = "#"
+
+
+def split_passages(content: str) -> List[dict]:
+    """
+    Character spans of the passages of a document, in text order, with the
+    heading of the section they belong to (None before the first heading).
+    """
+    passages: List[dict] = []
+    section: Optional[str] = None
+    pending: Optional[dict] = None
+    for paragraph in _PARAGRAPH_PATTERN.finditer(content):
+        start, end = paragraph.span()
+        heading = _HEADING_PATTERN.match(content, start, end)
+        if heading:
+            if pending is not None:
+                passages.append(pending)
+                pending = None
+            section = heading.group(1).strip()
+            start = heading.end()
+            while start < end and content[start].isspace():
+                start += 1
+            if start >= end:
+                continue  # A heading on its own line before a blank line
+        if pending is not None:
+            start = pending["start"]
+        for span_start, span_end in _cut(content, start, end):
+            pending = {"section": section, "start": span_start, "end": span_end}
+            if span_end - span_start >= PASSAGE_MIN_CHARS:
+                passages.append(pending)
+                pending = None
+    if pending is not None:
+        if passages and passages[-1]["section"] == pending["section"]:
+            passages[-1]["end"] = pending["end"]  # A short closing paragraph joins the previous passage
+        else:
+            passages.append(pending)
+    return passages
+
+
+def _cut(content: str, start: int, end: int) -> List[Tuple[int, int]]:
+    spans = []
+    while end - start > PASSAGE_MAX_CHARS:
+        limit = start + PASSAGE_MAX_CHARS
+        cut = max((match.start() + 1 for match in _SENTENCE_END.finditer(content, start, limit)), default=None)
+        if cut is None or cut - start < PASSAGE_MIN_CHARS:
+            cut = content.rfind(" ", start, limit)
+            cut = limit if cut <= start else cut
+        spans.append((start, cut))
+        start = cut
+        while start < end and content[start].isspace():
+            start += 1
+    spans.append((start, end))
+    return spans
+
+
+class PassageIndex:
+    """
+    Document search backed by an index over passages.
+
+    Each document is split into passages (see `split_passages`), and the
+    wrapped engine indexes every passage as a row of its own under the id
+    "<document id>#<passage number>", with a (document, passage) pair as its
+    row document. A query ranks passages, and documents are ranked by their
+    best passage, so a long opinion is no longer diluted by its unrelated
+    sections. Each result carries its best `per_document` passages with
+    their character offsets into the document content.
+
+    The index takes the same ids, texts and documents as a document-level
+    `SearchIndex`, and delegates generations, drift and background refits to
+    the wrapped engine.
+    """
+
+    def __init__(self, passages: SearchIndex, per_document: int = 3, fanout: int = 8):
+        self.passages = passages
+        self.per_document = max(1, per_document)
+        # Passages scored per requested document, as several may come from one document
+        self.fanout = max(1, fanout)
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._counts
+
+    @property
+    def generation(self) -> int:
+        return self.passages.generation
+
+    @property
+    def needs_refit(self) -> bool:
+        return self.passages.needs_refit
+
+    @property
+    def refitting(self) -> bool:
+        return self.passages.refitting
+
+    def fit(self, ids: List[str], texts: List[str], documents: List[Any]) -> None:
+        with self._lock:
+            passage_ids, passage_texts, rows = self._expand(ids, texts, documents)
+            self._counts = {}
+            self.passages.fit(passage_ids, passage_texts, rows)
+            self._count(rows)
+
+    def add(self, ids: List[str], texts: List[str], documents: List[Any]) -> None:
+        with self._lock:
+            passage_ids, passage_texts, rows = self._expand(ids, texts, documents)
+            self.passages.add(passage_ids, passage_texts, rows)
+            self._count(rows)
+
+    def remove(self, ids: List[str]) -> None:
+        with self._lock:
+            passage_ids = []
+            for doc_id in ids:
+                count = self._counts.pop(doc_id, 0)
+                passage_ids.extend(passage_id(doc_id, number) for number in range(count))
+            self.passages.remove(passage_ids)
+
+    def replace(self, ids: List[str], texts: List[str], documents: List[Any]) -> None:
+        with self._lock:
+            self.remove(ids)
+            self.add(ids, texts, documents)
+
+    def schedule_refit(self, load_corpus: CorpusLoader) -> bool:
+        """Refit the passage index in the background, loading passages through their documents"""
+        return self.passages.schedule_refit(lambda ids: self._load_passages(ids, load_corpus))
+
+    def search(
+        self, text: str, top_k: int, min_score: float = 0.0, filters: Optional[dict] = None
+    ) -> List[Tuple[Any, float, list]]:
+        return self.search_batch([text], [top_k], [min_score], [filters])[0]
+
+    def search_batch(
+        self,
+        texts: List[str],
+        top_ks: List[int],
+        min_scores: List[float],
+        filters: Optional[List[Optional[dict]]] = None,
+        facet_counts: bool = False,
+    ) -> list:
+        """
+        (document, score, passages) for the top documents of each query, where
+        the score is the document's best passage score and `passages` are its
+        best (passage, score) pairs. Only the top `top_k * fanout` passages are
+        kept, so a document none of whose passages ranks among them is missed.
+        Filters and facet counts work as in `SearchIndex.search_batch`; every
+        passage carries the facets of its document, and counts are per document.
+        """
+        hits = self.passages.search_batch(
+            texts, [top_k * self.fanout for top_k in top_ks], min_scores, filters, facet_counts
+        )
+        if not facet_counts:
+            return [self._group(passage_hits, top_k) for passage_hits, top_k in zip(hits, top_ks)]
+        return [(self._group(passage_hits, top_k), counts) for (passage_hits, counts), top_k in zip(hits, top_ks)]
+
+    def first_documents(self, count: int, filters: Optional[dict] = None) -> List[Any]:
+        """The first `count` documents with a passage accepted by `filters`, in row order"""
+        limit = count * self.fanout
+        while True:
+            rows = self.passages.first_documents(limit, filters)
+            documents = list({doc["id"]: doc for doc, _ in rows}.values())
+            if len(documents) >= count or len(rows) < limit:
+                return documents[:count]
+            limit *= 2
+
+    def _group(self, passage_hits: List[Tuple[Any, float]], top_k: int) -> List[Tuple[Any, float, list]]:
+        # Passages arrive best first, so a document's first passage is its best
+        results: Dict[str, Tuple[Any, float, list]] = {}
+        for (doc, passage), score in passage_hits:
+            result = results.get(doc["id"])
+            if result is None:
+                if len(results) == top_k:
+                    continue
+                result = results[doc["id"]] = (doc, score, [])
+            if len(result[2]) < self.per_document:
+                result[2].append((passage, score))
+        return list(results.values())
+
+    def _expand(self, ids: List[str], texts: List[str], documents: List[Any]) -> tuple:
+        passage_ids, passage_texts, rows = [], [], []
+        for doc_id, text, doc in zip(ids, texts, documents):
+            for number, passage in enumerate(document_passages(doc, text)):
+                passage_ids.append(passage_id(doc_id, number))
+                passage_texts.append(text[passage["start"]:passage["end"]])
+                rows.append((doc, passage))
+        return passage_ids, passage_texts, rows
+
+    def _count(self, rows: List[Tuple[Any, dict]]) -> None:
+        for doc, _ in rows:
+            self._counts[doc["id"]] = self._counts.get(doc["id"], 0) + 1
+
+    def _load_passages(self, ids: List[str], load_corpus: CorpusLoader) -> List[Optional[tuple]]:
+        doc_ids = list(dict.fromkeys(passage_document_id(pid) for pid in ids))
+        loaded = dict(zip(doc_ids, load_corpus(doc_ids)))
+        passages = {
+            doc_id: document_passages(item[1], item[0]) for doc_id, item in loaded.items() if item is not None
+        }
+        corpus = []
+        for pid in ids:
+            doc_id, number = passage_document_id(pid), int(pid.rpartition(PASSAGE_ID_SEPARATOR)[2])
+            if number >= len(passages.get(doc_id, ())):
+                corpus.append(None)  # Deleted, or replaced by a version with fewer passages
+                continue
+            text, doc = loaded[doc_id]
+            passage = passages[doc_id][number]
+            corpus.append((text[passage["start"]:passage["end"]], (doc, passage)))
+        return corpus
+
+
+def document_passages(doc: dict, text: str) -> List[dict]:
+    """Passages stored on the document at ingest, or split from `text` for documents stored without them"""
+    passages = doc.get("passages")
+    return passages if passages is not None else split_passages(text)
+
+
+def passage_id(doc_id: str, number: int) -> str:
+    return f"{doc_id}{PASSAGE_ID_SEPARATOR}{number}"
+
+
+def passage_document_id(pid: str) -> str:
+    return pid.rpartition(PASSAGE_ID_SEPARATOR)[0]
@@ -0,0 +1,160 @@
+import zlib
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from app.index import (
+    ScoredQuery, TfidfIndex, append_block, score_top_k, tfidf_tokens, top_k_rows, vectorize, vectorize_tokens
+)
+from app.metrics import timed
+
+
+# Document fields that can place a document on a shard; the value is hashed
+SHARD_KEYS: Dict[str, Callable[[Any], str]] = {
+    "id": lambda doc: doc["id"],
+    "jurisdiction": lambda doc: doc.get("jurisdiction") or "",
+}
+
+
+class IndexShard:
+    """
+    The rows of the global TF-IDF matrix held by one shard, with their global
+    row numbers. New rows are appended as blocks after the shard's fitted
+    rows and merged geometrically (see `append_block`).
+
+    A shard is only handed query vectors built with the global vocabulary and
+    IDF and only answers with global row numbers and scores (`score_top_k`),
+    so it can later move behind a service boundary without changing how
+    queries are scattered and gathered.
+    """
+
+    def __init__(self, rows: np.ndarray, matrix: sparse.csr_matrix):
+        self._rows = [rows]
+        self._blocks = [matrix]
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self._rows)
+
+    def append(self, rows: np.ndarray, block: sparse.csr_matrix) -> None:
+        append_block(self._blocks, block, 1, self._rows, rows)
+
+    def arrays(self) -> Tuple[List[np.ndarray], List[sparse.csr_matrix]]:
+        """Global row numbers and matrix rows of each block"""
+        return list(self._rows), list(self._blocks)
+
+
+class ShardedTfidfIndex(TfidfIndex):
+    """
+    TF-IDF index split into `shards` by a hash of each document's `shard_key`
+    field, with queries scattered to all shards in parallel threads.
+
+    The vocabulary and IDF are fit once over the whole corpus and shared by
+    every shard, so scores are the same as in an unsharded index. Each shard
+    returns its own top k, and the per-shard lists are merged into the global
+    top k. Rows keep their global numbers, so tombstones, refits and
+    snapshots work as in `TfidfIndex`.
+    """
+
+    def __init__(self, refit_drift: float = 0.2, workers: int = 1, shards: int = 2, shard_key: str = "id"):
+        super().__init__(refit_drift, workers)
+        if shard_key not in SHARD_KEYS:
+            raise ValueError(f"Unknown shard key {shard_key!r}; expected one of {sorted(SHARD_KEYS)}")
+        self.shard_count = max(1, shards)
+        self.shard_key = shard_key
+        self._shards: List[IndexShard] = []
+        self._executor = ThreadPoolExecutor(max_workers=self.shard_count, thread_name_prefix="index-shard")
+
+    @property
+    def shard_sizes(self) -> List[int]:
+        with self._lock:
+            return [len(shard) for shard in self._shards]
+
+    @property
+    def matrix(self):
+        """Global document-term matrix reassembled from the shards, in row order"""
+        with self._lock:
+            if not self._shards:
+                return None
+            arrays = [shard.arrays() for shard in self._shards]
+        rows = np.concatenate([block_rows for shard_rows, _ in arrays for block_rows in shard_rows])
+        stacked = sparse.vstack([block for _, blocks in arrays for block in blocks], format="csr")
+        return stacked[np.argsort(rows, kind="stable")]
+
+    def _score_batch(
+        self, texts: List[str], top_ks: List[int], min_scores: List[float], filters: List[Optional[dict]], facet_counts: bool
+    ) -> List[ScoredQuery]:
+        """Score the query vectors on every shard in parallel and merge the top k lists"""
+        with self._lock:
+            vectorizer = self.vectorizer
+            if vectorizer is None or not self._shards:
+                return [([], {} if facet_counts else None) for _ in texts]
+            shards = [shard.arrays() for shard in self._shards]
+            documents = self.row_documents
+            dead_rows = self._dead_row_mask()
+            facets = self.facets
+            masks = [facets.mask(query_filters) for query_filters in filters]
+        with timed("preprocess"):
+            tokens = tfidf_tokens(texts)
+        with timed("vectorize"):
+            queries = vectorize_tokens(tokens, vectorizer)[0]
+        # Each shard runs in a copy of the caller's context, so its stage timings reach the request
+        per_shard = list(
+            self._executor.map(
+                lambda context, arrays: context.run(
+                    score_top_k, queries, arrays[1], top_ks, min_scores, dead_rows, arrays[0], masks
+                ),
+                [copy_context() for _ in shards],
+                shards,
+            )
+        )
+        results = []
+        for i, top_k in enumerate(top_ks):
+            with timed("topk"):
+                rows = np.concatenate([hits[i][0] for hits in per_shard])
+                scores = np.concatenate([hits[i][1] for hits in per_shard])
+                rows, scores = top_k_rows(rows, scores, top_k)
+            counts = self._counts(facets, np.concatenate([hits[i][2] for hits in per_shard]), facet_counts)
+            results.append((self._results(documents, rows, scores), counts))
+        return results
+
+    def _install(self, model: Any, ids: List[str], documents: List[Any]) -> None:
+        super()._install(model, ids, documents)
+        matrix = self._blocks[0] if self._blocks else None
+        # The shards take over the rows, so the full matrix is not kept twice
+        self._blocks = []
+        self._shards = []
+        if matrix is not None:
+            assignment = self._assign(documents)
+            for shard in range(self.shard_count):
+                rows = np.flatnonzero(assignment == shard)
+                self._shards.append(IndexShard(rows, matrix[rows]))
+
+    def _prepare_rows(self, texts: List[str], documents: List[Any]):
+        return (*vectorize(texts, self.vectorizer), self._assign(documents))
+
+    def _append_rows(self, prepared, documents: List[Any]) -> Tuple[int, int]:
+        block, total_tokens, known_tokens, assignment = prepared
+        first_row = len(self.row_documents)
+        for shard_number, shard in enumerate(self._shards):
+            offsets = np.flatnonzero(assignment == shard_number)
+            if len(offsets):
+                shard.append(first_row + offsets, block[offsets])
+        return total_tokens, total_tokens - known_tokens
+
+    def _assign(self, documents: List[Any]) -> np.ndarray:
+        """
+        Shard number of each document; tombstoned slots go to shard 0. Passage
+        rows, (document, passage) pairs, go to the shard of their document.
+        """
+        key = SHARD_KEYS[self.shard_key]
+        return np.fromiter(
+            (
+                0 if doc is None else zlib.crc32(key(doc[0] if isinstance(doc, tuple) else doc).encode()) % self.shard_count
+                for doc in documents
+            ),
+            dtype=np.int64,
+            count=len(documents),
+        )
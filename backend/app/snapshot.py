@@ -0,0 +1,199 @@
+import json
+import mmap
+import os
+import shutil
+import zlib
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from app.index import SearchIndex, TfidfIndex
+
+
+# Bump whenever the layout of the snapshot files changes
+SNAPSHOT_FORMAT_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing, corrupt or from another format version"""
+
+
+class Utf8Strings(Sequence):
+    """
+    Read-only strings stored as one UTF-8 buffer plus the byte offset of
+    each string, so every string takes its own length rather than the
+    longest one's. Strings are decoded when accessed.
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    def encoded(self, position: int) -> bytes:
+        return self.data[self.offsets[position]:self.offsets[position + 1]].tobytes()
+
+    def __getitem__(self, position: int) -> str:
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return self.encoded(position).decode()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+def encode_strings(strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """UTF-8 buffer and offsets of `strings`, the arrays of a Utf8Strings"""
+    encoded = [string.encode() for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(string) for string in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+class SortedVocabulary(Mapping):
+    """
+    Read-only term -> column mapping over sorted terms.
+
+    scikit-learn numbers vocabulary columns in sorted term order, so a term's
+    column is its position among the sorted terms and lookups are a binary
+    search over the memory-mapped strings instead of a dict built at startup.
+    UTF-8 bytes sort in code point order, so the search compares bytes.
+    """
+
+    def __init__(self, terms: Utf8Strings):
+        self.terms = terms
+
+    def __getitem__(self, term: str) -> int:
+        target = term.encode()
+        low, high = 0, len(self.terms)
+        while low < high:
+            middle = (low + high) // 2
+            if self.terms.encoded(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.terms) and self.terms.encoded(low) == target:
+            return low
+        raise KeyError(term)
+
+    def __contains__(self, term) -> bool:
+        try:
+            self[term]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self.terms)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+
+class SnapshotVectorizer:
+    """Query-time stand-in for a fitted TfidfVectorizer backed by snapshot arrays"""
+
+    def __init__(self, terms: Utf8Strings, idf: np.ndarray):
+        self.vocabulary_ = SortedVocabulary(terms)
+        self.idf_ = idf
+
+
+def save_snapshot(index: SearchIndex, path: str) -> None:
+    """
+    Write a fitted TF-IDF index to `path` as .npy arrays plus a manifest.
+    The directory is replaced atomically so readers never see a partial write.
+    """
+    if not isinstance(index, TfidfIndex):
+        raise SnapshotError("Snapshots are only supported for the tfidf engine")
+    matrix = index.matrix
+    if matrix is None:
+        raise SnapshotError("Cannot snapshot an empty index")
+
+    # Compact away tombstoned rows so the snapshot only holds live documents
+    live_rows = [row for row, doc in enumerate(index.row_documents) if doc is not None]
+    matrix = matrix[live_rows]
+    vocabulary = index.vectorizer.vocabulary_
+    terms = sorted(vocabulary, key=vocabulary.__getitem__)
+    ids = [index.row_documents[row]["id"] for row in live_rows]
+    terms_data, terms_offsets = encode_strings(terms)
+    ids_data, ids_offsets = encode_strings(ids)
+
+    arrays = {
+        "data": matrix.data,
+        "indices": matrix.indices,
+        "indptr": matrix.indptr,
+        "idf": np.asarray(index.vectorizer.idf_),
+        "terms_data": terms_data,
+        "terms_offsets": terms_offsets,
+        "ids_data": ids_data,
+        "ids_offsets": ids_offsets,
+    }
+
+    staging = path.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    files = {}
+    for name, array in arrays.items():
+        filename = f"{name}.npy"
+        np.save(os.path.join(staging, filename), array)
+        files[name] = {"file": filename, "crc32": _file_crc32(os.path.join(staging, filename))}
+    manifest = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "engine": "tfidf",
+        "shape": list(matrix.shape),
+        "arrays": files,
+    }
+    with open(os.path.join(staging, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    previous = path.rstrip(os.sep) + ".old"
+    if os.path.exists(path):
+        shutil.rmtree(previous, ignore_errors=True)
+        os.rename(path, previous)
+    os.rename(staging, path)
+    shutil.rmtree(previous, ignore_errors=True)
+
+
+def load_snapshot(path: str, index: SearchIndex, documents: Dict[str, dict], verify: bool = True) -> None:
+    """
+    Memory-map the snapshot at `path` read-only and install it into `index`.
+    Rows are matched to `documents` by id; ids no longer present are tombstoned.
+    """
+    if not isinstance(index, TfidfIndex):
+        raise SnapshotError("Snapshots are only supported for the tfidf engine")
+    try:
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"Cannot read snapshot manifest in {path}: {e}")
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(
+            f"Snapshot format version {manifest.get('format_version')} is not supported "
+            f"(expected {SNAPSHOT_FORMAT_VERSION}); rebuild it with app.build_index"
+        )
+
+    arrays = {}
+    for name, entry in manifest["arrays"].items():
+        filename = os.path.join(path, entry["file"])
+        if verify and _file_crc32(filename) != entry["crc32"]:
+            raise SnapshotError(f"Checksum mismatch for {filename}")
+        arrays[name] = np.load(filename, mmap_mode="r")
+
+    matrix = sparse.csr_matrix(
+        (arrays["data"], arrays["indices"], arrays["indptr"]),
+        shape=tuple(manifest["shape"]),
+        copy=False,
+    )
+    vectorizer = SnapshotVectorizer(Utf8Strings(arrays["terms_data"], arrays["terms_offsets"]), arrays["idf"])
+    ids = list(Utf8Strings(arrays["ids_data"], arrays["ids_offsets"]))
+    index.restore((vectorizer, matrix), ids, [documents.get(doc_id) for doc_id in ids])
+
+
+def _file_crc32(filename: str) -> int:
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return zlib.crc32(buffer)
@@ -0,0 +1,140 @@
+import sys
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import MutableMapping
+from typing import Callable, Iterator, List, Optional
+
+from app.content import ContentFile
+
+
+# Metadata fields drawn from a small set of values, shared across documents
+INTERNED_FIELDS = ("court", "category", "jurisdiction")
+
+# Key of the ContentRef that replaces `content` in documents stored with a ContentFile
+CONTENT_REF = "_content"
+
+
+class DocumentStore(MutableMapping):
+    """
+    In-memory documents keyed by id, iterated in id order.
+
+    Besides the id -> document dict, a sorted list of ids supports keyset
+    pagination: a page resumes right after the last id of the previous page,
+    so cursors stay valid while documents are added or removed.
+
+    Only the fields of the API model are kept. Derived text such as the
+    normalized token stream lives in the search index, and repeated metadata
+    values are interned so all documents share one copy of each.
+
+    With a `content` file, each document's text is moved there when it is
+    stored: the stored dict holds a reference under CONTENT_REF instead of
+    `content`, and the text is read back in full or by range through
+    `content`, `content_bytes` and `with_content`. The caller's dict is left
+    untouched.
+    """
+
+    def __init__(self, documents: Optional[List[dict]] = None, content: Optional[ContentFile] = None):
+        self._documents = {}
+        self._ids: List[str] = []
+        self._content = content
+        if documents:
+            self.update((doc["id"], doc) for doc in documents)
+
+    def __getitem__(self, doc_id: str) -> dict:
+        return self._documents[doc_id]
+
+    def __setitem__(self, doc_id: str, doc: dict) -> None:
+        if doc_id not in self._documents:
+            insort(self._ids, doc_id)
+        self._documents[doc_id] = self._stored(doc)
+
+    def __delitem__(self, doc_id: str) -> None:
+        del self._documents[doc_id]
+        del self._ids[bisect_left(self._ids, doc_id)]
+
+    def __contains__(self, doc_id) -> bool:
+        return doc_id in self._documents
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def update(self, items=(), **kwargs) -> None:
+        """Bulk insert that sorts new ids once instead of inserting one by one"""
+        items = items.items() if hasattr(items, "items") else items
+        new_ids = []
+        for doc_id, doc in items:
+            if doc_id not in self._documents:
+                new_ids.append(doc_id)
+            self._documents[doc_id] = self._stored(doc)
+        if new_ids:
+            self._ids = sorted(self._ids + new_ids)
+        for doc_id, doc in kwargs.items():
+            self[doc_id] = doc
+
+    def clear(self) -> None:
+        self._documents = {}
+        self._ids = []
+
+    def page(self, after: Optional[str], limit: int, predicate: Optional[Callable[[dict], bool]] = None):
+        """
+        Up to `limit` documents with ids greater than `after`, in id order, that
+        match `predicate`. Returns the documents and the cursor for the next
+        page, which is None once the end of the store is reached.
+        """
+        start = bisect_right(self._ids, after) if after is not None else 0
+        ids = self._ids
+        documents = []
+        position = start
+        while position < len(ids) and len(documents) < limit:
+            doc = self._documents.get(ids[position])
+            if doc is not None and (predicate is None or predicate(doc)):
+                documents.append(doc)
+            position += 1
+        has_more = position < len(ids)
+        return documents, (ids[position - 1] if has_more and position > start else None)
+
+
+    def content(self, doc: dict, start: int = 0, end: Optional[int] = None) -> str:
+        """Characters [start, end) of a document's content, clamped to its length"""
+        if CONTENT_REF not in doc:
+            return doc.get("content", "")[start:end]
+        return self._content.read(doc[CONTENT_REF], start, end)
+
+    def content_bytes(self, doc: dict, start: int = 0, end: Optional[int] = None) -> bytes:
+        """Bytes [start, end) of a document's UTF-8 content, clamped to its size"""
+        if CONTENT_REF not in doc:
+            return doc.get("content", "").encode()[start:end]
+        return self._content.read_bytes(doc[CONTENT_REF], start, end)
+
+    def content_length(self, doc: dict) -> int:
+        """Length of a document's content in characters"""
+        return doc[CONTENT_REF].length if CONTENT_REF in doc else len(doc.get("content", ""))
+
+    def content_size(self, doc: dict) -> int:
+        """Size of a document's UTF-8 content in bytes"""
+        return doc[CONTENT_REF].size if CONTENT_REF in doc else len(doc.get("content", "").encode())
+
+    def with_content(self, doc: dict) -> dict:
+        """Copy of a stored document with its full content read back"""
+        if CONTENT_REF not in doc:
+            return doc
+        full = {name: value for name, value in doc.items() if name != CONTENT_REF}
+        full["content"] = self.content(doc)
+        return full
+
+    def _stored(self, doc: dict) -> dict:
+        if self._content is not None and isinstance(doc.get("content"), str):
+            ref = self._content.append(doc["content"])
+            doc = {name: value for name, value in doc.items() if name != "content"}
+            doc[CONTENT_REF] = ref
+        return _compact(doc)
+
+
+def _compact(doc: dict) -> dict:
+    for field in INTERNED_FIELDS:
+        value = doc.get(field)
+        if isinstance(value, str):
+            doc[field] = sys.intern(value)
+    return doc
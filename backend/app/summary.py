@@ -0,0 +1,209 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.cache import QueryCache
+from app.matcher import ConceptMatcher
+
+
+# Query topics that select a summary template, checked in this order
+SUMMARY_TOPICS = {
+    "contract": ["contract", "contracts", "breach", "breached", "agreement", "agreements", "lease", "leases"],
+    "privacy": ["privacy", "data", "ccpa", "personal information"],
+    "employment": ["employment", "termination", "wrongful", "employee", "employees"],
+}
+summary_topic_matcher = ConceptMatcher(SUMMARY_TOPICS)
+
+
+def generate_mock_summary(query: str, relevant_docs: List[dict]) -> str:
+    """Generate a mock AI summary based on query and documents"""
+    topics = summary_topic_matcher.match(query)
+    
+    # Contract-related queries
+    if "contract" in topics:
+        return f"""Based on your query regarding "{query}", I've analyzed the relevant legal documents in our database.
+
+Contract law principles indicate that when parties enter into an agreement, they create legally binding obligations. A breach occurs when one party fails to fulfill their contractual duties without legal justification.
+
+The relevant documents show that remedies for breach of contract typically include:
+1. Compensatory damages to put the non-breaching party in the position they would have been in had the contract been performed
+2. Specific performance in cases where monetary damages are inadequate
+3. Rescission and restitution to restore parties to pre-contract positions
+
+Key considerations include whether an implied contract was formed through conduct, policies, or representations, even in the absence of a formal written agreement. Courts examine the totality of circumstances, including employee handbooks, established practices, and oral assurances."""
+
+    # Privacy/CCPA queries
+    elif "privacy" in topics:
+        return f"""Regarding your query about "{query}", the California Consumer Privacy Act (CCPA) establishes comprehensive data protection rights for California residents.
+
+Under CCPA, consumers have the right to:
+1. Know what personal information is collected about them
+2. Request deletion of their personal information
+3. Opt-out of the sale of their personal information
+4. Non-discrimination for exercising their privacy rights
+
+Businesses subject to CCPA must have annual gross revenues exceeding $25 million, or handle personal information of 50,000+ consumers/devices, or derive 50% or more of annual revenues from selling consumer personal information.
+
+The statute provides enforcement mechanisms including civil penalties up to $7,500 per intentional violation and a private right of action for data breaches ranging from $100-$750 per consumer per incident."""
+
+    # Employment law queries
+    elif "employment" in topics:
+        return f"""In response to your question about "{query}", employment law principles generally follow the at-will doctrine, but important exceptions exist.
+
+While at-will employment allows termination for any lawful reason, exceptions include:
+1. Public policy violations (e.g., refusing to commit illegal acts)
+2. Implied contract exceptions created through handbooks, policies, or practices
+3. Implied covenant of good faith and fair dealing
+
+Courts have held that detailed progressive discipline policies in employee handbooks can create enforceable implied contracts, limiting an employer's right to terminate without following stated procedures. This is particularly true when policy language suggests mandatory compliance rather than discretionary application.
+
+Employers should carefully review their written policies to ensure they don't create unintended contractual obligations that limit at-will employment flexibility."""
+
+    # General/fallback summary
+    else:
+        doc_titles = [doc["title"] for doc in relevant_docs[:2]]
+        return f"""Based on your query "{query}", I've identified relevant legal precedents and documentation.
+
+The analysis draws from multiple sources including {doc_titles[0] if doc_titles else 'case law'} and related legal materials. 
+
+Key findings indicate that legal principles in this area emphasize:
+1. The importance of documented agreements and established procedures
+2. Balance between statutory requirements and contractual obligations
+3. Protection of individual rights while maintaining institutional flexibility
+
+The documents demonstrate how courts interpret both explicit contractual terms and implied obligations arising from conduct, custom, and practice. Legal remedies are designed to restore injured parties to their rightful position while deterring future violations.
+
+For comprehensive legal advice tailored to your specific situation, consultation with a qualified attorney is recommended."""
+
+
+class SummaryProvider:
+    """Source of query summaries over the top documents; implementations are async"""
+
+    async def generate(self, query: str, relevant_docs: List[dict]) -> str:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class TemplateSummaryProvider(SummaryProvider):
+    """The built-in template summaries"""
+
+    async def generate(self, query: str, relevant_docs: List[dict]) -> str:
+        return generate_mock_summary(query, relevant_docs)
+
+
+class HttpSummaryProvider(SummaryProvider):
+    """
+    Summaries from a local inference server with an OpenAI-compatible chat
+    completions endpoint (llama.cpp server, vLLM, Ollama, ...).
+
+    One AsyncClient is shared by all requests, so connections to the server
+    are pooled and kept alive instead of opened per summary.
+    """
+
+    def __init__(self, url: str, model: str, max_connections: int = 4, timeout: float = 10.0):
+        self.url = url
+        self.model = model
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def generate(self, query: str, relevant_docs: List[dict]) -> str:
+        response = await self.client.post(self.url, json={
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                {"role": "user", "content": summary_prompt(query, relevant_docs)},
+            ],
+            "max_tokens": SUMMARY_MAX_TOKENS,
+            "temperature": 0.2,
+        })
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"].strip()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You are a legal research assistant. Answer the user's query in a few short "
+    "paragraphs using only the documents provided, and name the documents you rely on."
+)
+SUMMARY_MAX_TOKENS = 512
+
+
+def summary_prompt(query: str, relevant_docs: List[dict]) -> str:
+    # Summaries and key points are precomputed on the stored documents, so
+    # building the prompt never reads their content back
+    sections = [f"Query: {query}"]
+    for number, doc in enumerate(relevant_docs, 1):
+        excerpt = (doc.get("summary") or "") + "\n" + (doc.get("key_points") or "")
+        sections.append(f"Document {number}: {doc['title']}\n{excerpt.strip()}")
+    return "\n\n".join(sections)
+
+
+class Summarizer:
+    """
+    Front for a summary provider: at most `max_concurrency` summaries are
+    generated at once, each request gets `timeout` seconds including the wait
+    for a slot, and a failed or timed-out request falls back to the template
+    summary. Provider summaries are cached by the query as written, which
+    they may quote, and the ids of the documents summarized.
+    """
+
+    def __init__(self, provider: SummaryProvider, timeout: float, max_concurrency: int, cache: QueryCache):
+        self.provider = provider
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache = cache
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._generated = 0
+        self._fallbacks = 0
+
+    async def summarize(self, query: str, relevant_docs: List[dict]) -> Tuple[str, bool]:
+        """The summary, and False when it is a fallback that should not be cached downstream"""
+        if isinstance(self.provider, TemplateSummaryProvider):
+            return generate_mock_summary(query, relevant_docs), True
+        key = (query, tuple(doc["id"] for doc in relevant_docs))
+        summary = self.cache.get(key)
+        if summary is not None:
+            return summary, True
+        try:
+            summary = await asyncio.wait_for(self._generate(query, relevant_docs), self.timeout)
+        except (asyncio.TimeoutError, httpx.HTTPError, KeyError, IndexError, TypeError, ValueError):
+            # Fallbacks are not cached, so the provider is tried again next time
+            self._fallbacks += 1
+            return generate_mock_summary(query, relevant_docs), False
+        self._generated += 1
+        self.cache.put(key, summary)
+        return summary, True
+
+    async def close(self) -> None:
+        await self.provider.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "provider": type(self.provider).__name__,
+            "generated": self._generated,
+            "fallbacks": self._fallbacks,
+            "cache": self.cache.stats(),
+        }
+
+    async def _generate(self, query: str, relevant_docs: List[dict]) -> str:
+        if self._slots is None:
+            # Created on first use so it belongs to the server's event loop
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        async with self._slots:
+            return await self.provider.generate(query, relevant_docs)
+
+
+def create_summary_provider(name: str, url: str, model: str, max_connections: int, timeout: float) -> SummaryProvider:
+    """Summary provider registered under `name`: template or http"""
+    if name == "template":
+        return TemplateSummaryProvider()
+    if name == "http":
+        return HttpSummaryProvider(url, model, max_connections=max_connections, timeout=timeout)
+    raise ValueError(f"Unknown summary provider {name!r}; expected 'template' or 'http'")
@@ -0,0 +1,65 @@
+import multiprocessing
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+
+# Everything that is neither a lowercase letter, a digit nor whitespace. Runs
+# are deleted without a break, so "don't" becomes "dont" and "1798.100"
+# becomes "1798100".
+_STRIP_PATTERN = re.compile(r"[^a-z0-9\s]+")
+
+# Texts per process pool task in tokenize_corpus
+TOKENIZE_CHUNK_SIZE = 256
+
+# Build pools start workers from a fork server (or spawn them where there is
+# none) rather than forking: refits build from a background thread of a
+# multithreaded server, and a forked child inherits locks held by other threads
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def tokenize(text: str, min_length: int = 1) -> List[str]:
+    """
+    Normalize and split text: lowercase it, delete non-alphanumerics with the
+    precompiled pattern, then split on whitespace (three C-level passes over
+    the text, no Python-level loop). Shared by indexing and querying so both
+    sides see the same terms.
+    """
+    tokens = _STRIP_PATTERN.sub("", text.lower()).split()
+    if min_length > 1:
+        tokens = [token for token in tokens if len(token) >= min_length]
+    return tokens
+
+
+def tokenize_corpus(texts: Iterable[str], min_length: int = 1, workers: int = 1) -> Iterator[List[str]]:
+    """
+    Token lists for `texts`, in order, produced lazily so a build never holds
+    the whole tokenized corpus. With several workers, chunks of texts are
+    tokenized in a process pool with a bounded number of chunks in flight.
+    """
+    if workers <= 1:
+        for text in texts:
+            yield tokenize(text, min_length)
+        return
+    texts = iter(texts)
+    with process_pool(workers) as executor:
+        pending = deque()
+        while True:
+            chunk = list(islice(texts, TOKENIZE_CHUNK_SIZE))
+            if chunk:
+                pending.append(executor.submit(_tokenize_chunk, chunk, min_length))
+            if pending and (not chunk or len(pending) >= 2 * workers):
+                yield from pending.popleft().result()
+            elif not chunk:
+                return
+
+
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool for CPU-bound build work, safe to start from any thread"""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(POOL_START_METHOD))
+
+
+def _tokenize_chunk(texts: List[str], min_length: int) -> List[List[str]]:
+    return [tokenize(text, min_length) for text in texts]
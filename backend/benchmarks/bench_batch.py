@@ -0,0 +1,56 @@
+"""
+Per-query cost of POST /generate/batch versus serial /generate calls.
+
+    python -m benchmarks.bench_batch [--docs 10000] [--queries 1000] [--http]
+
+Runs in-process by default, through the endpoints' path with the scoring
+pool and summarizer; --http goes through the ASGI stack with the FastAPI
+test client, which adds the per-request overhead batching removes.
+The query cache is disabled so every query is scored.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app import main
+from benchmarks.corpus import TERMS, synthetic_corpus
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--words", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--http", action="store_true")
+    args = parser.parse_args()
+
+    docs = synthetic_corpus(args.docs, words=args.words)
+    main.documents_db.clear()
+    main.documents_db.update((doc["id"], doc) for doc in docs)
+    main.initialize_index()
+    main.query_cache.max_entries = 0
+
+    rng = random.Random(2)
+    texts = [" ".join(rng.sample(TERMS, rng.randint(2, 5))) for _ in range(args.queries)]
+
+    if args.http:
+        from fastapi.testclient import TestClient
+        client = TestClient(main.app)
+        serial = lambda: [client.post("/generate", json={"query": text}) for text in texts]
+        batch = lambda: client.post("/generate/batch", json=[{"query": text} for text in texts])
+    else:
+        queries = [main.SearchQuery(query=text) for text in texts]
+        loop = asyncio.new_event_loop()
+        serial = lambda: [loop.run_until_complete(main.run_searches_async([query])) for query in queries]
+        batch = lambda: loop.run_until_complete(main.run_searches_async(queries))
+
+    for name, fn in (("serial", serial), ("batch", batch)):
+        start = time.perf_counter()
+        fn()
+        per_query = (time.perf_counter() - start) * 1000 / len(texts)
+        print(f"{name:>8}: {per_query:.3f} ms/query")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,50 @@
+"""
+Full TF-IDF build time by number of worker processes.
+
+    python -m benchmarks.bench_build [--docs 100000] [--workers 1,2,4,8]
+
+Each sharded build is checked against the single-process build: vocabulary,
+IDF and matrix must be identical, not just close. Speedup is relative to
+the first entry of --workers and tops out at the number of available cores.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.index import build_tfidf
+from benchmarks.corpus import synthetic_corpus
+
+
+def identical(reference, model):
+    (ref_vectorizer, ref_matrix), (vectorizer, matrix) = reference, model
+    return (
+        ref_vectorizer.vocabulary_ == vectorizer.vocabulary_
+        and np.array_equal(ref_vectorizer.idf_, vectorizer.idf_)
+        and all(np.array_equal(getattr(ref_matrix, name), getattr(matrix, name)) for name in ("data", "indices", "indptr"))
+    )
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--workers", default="1,2,4,8")
+    args = parser.parse_args()
+
+    texts = [doc["content"] for doc in synthetic_corpus(args.docs, words=args.words)]
+    print(f"{args.docs} documents, {os.cpu_count()} cores")
+    print(f"{'workers':>8} {'build s':>9} {'speedup':>8} {'identical':>10}")
+    reference = baseline = None
+    for workers in [int(w) for w in args.workers.split(",")]:
+        start = time.perf_counter()
+        model = build_tfidf(texts, workers)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference, baseline = model, elapsed
+        print(f"{workers:>8} {elapsed:>9.2f} {baseline / elapsed:>8.2f} {str(identical(reference, model)):>10}")
+
+
+if __name__ == "__main__":
+    run()
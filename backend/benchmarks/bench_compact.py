@@ -0,0 +1,93 @@
+"""
+Memory and ranking quality of the compact TF-IDF index against float64.
+
+    python -m benchmarks.bench_compact [--docs 100000] [--queries 200]
+
+Fits a TfidfIndex and CompactTfidfIndex (8-bit and float16 weights) over the
+same synthetic corpus and compares the bytes held by each matrix, per
+document and in total, and query latency. `overlap` is the share of the
+float64 top-k each compact index returns, and `max error` the largest
+difference between the scores it reports for the same documents. Exits with
+status 1 when a compact index falls outside MIN_OVERLAP or MAX_SCORE_ERROR.
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from app.compact import CompactTfidfIndex
+from app.index import TfidfIndex
+from benchmarks.corpus import TERMS, synthetic_corpus
+
+# Tolerances a compact index must stay within; top-k lists may differ where
+# quantization reorders documents whose float64 scores are nearly tied
+MIN_OVERLAP = 0.95
+MAX_SCORE_ERROR = 0.01
+
+
+def matrix_bytes(matrix):
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+
+def run_queries(index, queries, top_k):
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = index.search(query, top_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({doc["id"]: score for doc, score in hits})
+    return np.percentile(latencies, [50, 95]), results
+
+
+def compare(results, reference):
+    matched = 0
+    total = sum(len(expected) for expected in reference)
+    worst = 0.0
+    for got, expected in zip(results, reference):
+        shared = got.keys() & expected.keys()
+        matched += len(shared)
+        worst = max([worst] + [abs(got[doc_id] - expected[doc_id]) for doc_id in shared])
+    return matched / max(total, 1), worst
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    docs = synthetic_corpus(args.docs, words=args.words)
+    ids, texts = [doc["id"] for doc in docs], [doc["content"] for doc in docs]
+    rng = random.Random(1)
+    queries = [" ".join(rng.sample(TERMS, rng.randint(2, 5))) for _ in range(args.queries)]
+
+    baseline = TfidfIndex()
+    baseline.fit(ids, texts, docs)
+    baseline_bytes = matrix_bytes(baseline.matrix)
+    (p50, p95), reference = run_queries(baseline, queries, args.top_k)
+    print(f"{args.docs} documents")
+    print(f"{'matrix':>9} {'MB':>8} {'B/doc':>7} {'ratio':>6} {'p50 ms':>7} {'p95 ms':>7} {'overlap':>8} {'max error':>10}")
+    print(f"{'float64':>9} {baseline_bytes / 2**20:>8.1f} {baseline_bytes / args.docs:>7.0f} {1:>6.1f} {p50:>7.2f} {p95:>7.2f} {1:>8.3f} {0:>10.5f}")
+
+    failed = False
+    for weights in ("uint8", "float16"):
+        index = CompactTfidfIndex(weights=weights)
+        index.fit(ids, texts, docs)
+        (p50, p95), results = run_queries(index, queries, args.top_k)
+        overlap, error = compare(results, reference)
+        failed |= overlap < MIN_OVERLAP or error > MAX_SCORE_ERROR
+        print(
+            f"{weights:>9} {index.nbytes / 2**20:>8.1f} {index.nbytes / args.docs:>7.0f} {baseline_bytes / index.nbytes:>6.1f}"
+            f" {p50:>7.2f} {p95:>7.2f} {overlap:>8.3f} {error:>10.5f}"
+        )
+    print(f"tolerance (overlap >= {MIN_OVERLAP}, max error <= {MAX_SCORE_ERROR}): {'failed' if failed else 'ok'}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run()
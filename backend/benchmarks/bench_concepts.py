@@ -0,0 +1,65 @@
+"""
+Concept extraction cost as the taxonomy grows.
+
+    python -m benchmarks.bench_concepts [--concepts 10,1000,10000] [--docs 200]
+
+Times the compiled ConceptMatcher against the previous approach, a substring
+scan of the text for every keyword of every concept. The matcher makes a
+bounded number of transitions per token whatever the taxonomy size, so it
+only slows down from the cache footprint of a larger automaton, while the
+scan slows down in proportion to the number of keywords.
+"""
+import argparse
+import random
+import time
+
+from app.features import CONCEPT_KEYWORDS
+from app.matcher import ConceptMatcher
+from benchmarks.corpus import TERMS, synthetic_corpus
+
+
+def synthetic_taxonomy(size: int, rng: random.Random):
+    """The built-in concepts padded with made-up multi-word legal terms"""
+    taxonomy = dict(CONCEPT_KEYWORDS)
+    for i in range(size - len(taxonomy)):
+        taxonomy[f"Concept {i}"] = [" ".join(rng.sample(TERMS, 2)) + f" {i}" for _ in range(4)]
+    return taxonomy
+
+
+def substring_scan(taxonomy, text):
+    text = text.lower()
+    return [concept for concept, keywords in taxonomy.items() if any(keyword in text for keyword in keywords)]
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concepts", default="10,1000,10000")
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--words", type=int, default=400)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    texts = [doc["content"] for doc in synthetic_corpus(args.docs, words=args.words)]
+    megabytes = sum(len(text) for text in texts) / 2**20
+    print(f"{args.docs} documents, {megabytes:.2f} MB")
+    print(f"{'concepts':>9} {'compile ms':>11} {'matcher MB/s':>13} {'scan MB/s':>10}")
+    for size in [int(s) for s in args.concepts.split(",")]:
+        taxonomy = synthetic_taxonomy(size, rng)
+        start = time.perf_counter()
+        matcher = ConceptMatcher(taxonomy)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for text in texts:
+            matcher.match(text)
+        matcher_rate = megabytes / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for text in texts:
+            substring_scan(taxonomy, text)
+        scan_rate = megabytes / (time.perf_counter() - start)
+        print(f"{size:>9} {compile_ms:>11.1f} {matcher_rate:>13.2f} {scan_rate:>10.2f}")
+
+
+if __name__ == "__main__":
+    run()
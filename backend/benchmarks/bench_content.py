@@ -0,0 +1,82 @@
+"""
+Cost of viewing a large document in full, by character range, by section
+and by HTTP byte range.
+
+    python -m benchmarks.bench_content [--pages 500]
+
+Builds one opinion of `--pages` pages (about 3,000 characters each) with
+FACTS / LEGAL ANALYSIS / CONCLUSION sections and requests it through the
+API in-process. Content is read from the memory-mapped content file, so a
+range request costs roughly the span it returns, not the whole document.
+"""
+import argparse
+import random
+import time
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.models import LegalDocument
+from benchmarks.corpus import TERMS
+
+PAGE_CHARS = 3000
+
+
+def opinion(pages: int) -> dict:
+    rng = random.Random(0)
+
+    def paragraphs(count):
+        return "\n\n".join(" ".join(rng.choice(TERMS) for _ in range(60)) + "." for _ in range(count))
+
+    # Paragraphs of 60 words run about 500 characters; most of them are analysis
+    count = pages * PAGE_CHARS // 500
+    content = (
+        "OPINION\n\nFACTS:\n" + paragraphs(count // 5)
+        + "\n\nLEGAL ANALYSIS:\n" + paragraphs(count * 3 // 4)
+        + "\n\nCONCLUSION:\n" + paragraphs(max(count // 20, 1))
+    )
+    return {
+        "id": "bench-opinion",
+        "title": "Benchmark v. Opinion",
+        "category": "case_law",
+        "content": content,
+    }
+
+
+def per_call_ms(client, url, repeat, headers=None):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(url, headers=headers)
+    return (time.perf_counter() - start) * 1000 / repeat, response
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    doc = opinion(args.pages)
+    main.ingest_documents([LegalDocument(**doc)])
+    client = TestClient(main.app)
+    url = f"/api/documents/{doc['id']}"
+    print(f"{len(doc['content']) / 2**20:.1f} MB document, {args.pages} pages")
+    print(f"{'request':>22} {'ms':>9} {'bytes':>10} {'status':>6}")
+    # One page from the middle of the document; the content is ASCII, so
+    # character and byte offsets coincide
+    length = len(doc["content"])
+    offset = max(length // 2 - PAGE_CHARS // 2, 0)
+    end = min(offset + PAGE_CHARS, length)
+    cases = [
+        ("full document", url, None),
+        ("chars 1 page", f"{url}?start={offset}&end={end}", None),
+        ("section CONCLUSION", f"{url}?section=CONCLUSION", None),
+        ("bytes 1 page", f"{url}/content", {"Range": f"bytes={offset}-{end - 1}"}),
+    ]
+    for name, case_url, headers in cases:
+        ms, response = per_call_ms(client, case_url, args.repeat, headers)
+        print(f"{name:>22} {ms:>9.2f} {len(response.content):>10} {response.status_code:>6}")
+
+
+if __name__ == "__main__":
+    run()
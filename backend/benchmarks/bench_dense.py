@@ -0,0 +1,147 @@
+"""
+Recall and latency of dense retrieval against the number of IVF lists probed.
+
+    python -m benchmarks.bench_dense [--sizes 10000,100000] [--probes 1,4,16,64]
+    python -m benchmarks.bench_dense --vectors 1000000
+
+With `--sizes`, builds a DenseIndex (LSA embeddings, int8 IVF) over a
+synthetic corpus whose documents each lean on a few topics, then times
+`search` (query embedding included) for each probe count. `recall` is the
+share of the exact top-k (every list scanned) the probed search returns.
+The `hybrid` row times TF-IDF and dense retrieval fused by RRF.
+
+With `--vectors`, skips text altogether and indexes that many clustered
+random unit vectors of `--dimensions`, to measure the IVF index at sizes
+where embedding a text corpus would dominate the run.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.dense import DenseIndex, build_ivf
+from app.hybrid import HybridIndex
+from app.index import TfidfIndex
+from benchmarks.corpus import TERMS, synthetic_corpus
+
+TOPIC_TERMS = 6
+TOPIC_SHARE = 0.7
+
+
+def topical_corpus(size: int, words: int, topics: int = 40):
+    """Synthetic documents drawing most of their words from one of `topics` term groups"""
+    rng = random.Random(2)
+    groups = [rng.sample(TERMS, TOPIC_TERMS) for _ in range(topics)]
+    docs = synthetic_corpus(size, words=words)
+    for doc in docs:
+        group = rng.choice(groups)
+        doc["content"] = " ".join(
+            rng.choice(group) if rng.random() < TOPIC_SHARE else rng.choice(TERMS) for _ in range(words)
+        )
+    return docs, groups
+
+
+def percentiles(latencies):
+    return np.percentile(latencies, [50, 95, 99])
+
+
+def recall(results, reference):
+    matched = sum(len(set(got) & set(expected)) for got, expected in zip(results, reference))
+    return matched / max(sum(len(expected) for expected in reference), 1)
+
+
+def print_row(size, name, probes, build_seconds, latencies, recall_value):
+    p50, p95, p99 = percentiles(latencies)
+    print(f"{size:>8} {name:>8} {probes:>7} {build_seconds:>8.2f} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f} {recall_value:>7.3f}")
+
+
+def bench_text(size, args, queries):
+    docs, _ = topical_corpus(size, args.words)
+    ids, texts = [doc["id"] for doc in docs], [doc["content"] for doc in docs]
+    dense = DenseIndex(dimensions=args.dimensions)
+    start = time.perf_counter()
+    dense.fit(ids, texts, docs)
+    build_seconds = time.perf_counter() - start
+
+    dense.probes = len(dense.vectors.centroids)
+    reference = [[doc["id"] for doc, _ in dense.search(query, args.top_k)] for query in queries]
+    for probes in args.probes:
+        dense.probes = probes
+        latencies, results = [], []
+        for query in queries:
+            start = time.perf_counter()
+            hits = dense.search(query, args.top_k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            results.append([doc["id"] for doc, _ in hits])
+        print_row(size, "dense", probes, build_seconds, latencies, recall(results, reference))
+
+    sparse = TfidfIndex()
+    sparse.fit(ids, texts, docs)
+    dense.probes = args.hybrid_probes
+    hybrid = HybridIndex(sparse, dense)
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        hybrid.search(query, args.top_k, min_score=0.1)
+        latencies.append((time.perf_counter() - start) * 1000)
+    print_row(size, "hybrid", args.hybrid_probes, build_seconds, latencies, float("nan"))
+
+
+def bench_vectors(size, args):
+    rng = np.random.default_rng(3)
+    centers = rng.standard_normal((args.clusters, args.dimensions)).astype(np.float32)
+    vectors = centers[rng.integers(0, args.clusters, size)]
+    # Noise is added in chunks to keep peak memory near the size of the vectors
+    for start in range(0, size, 100_000):
+        chunk = vectors[start:start + 100_000]
+        chunk += 0.6 * rng.standard_normal(chunk.shape, dtype=np.float32)
+        chunk /= np.linalg.norm(chunk, axis=1, keepdims=True)
+    queries = vectors[rng.choice(size, args.queries, replace=False)] + 0.3 * rng.standard_normal(
+        (args.queries, args.dimensions), dtype=np.float32
+    )
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    start = time.perf_counter()
+    index = build_ivf(vectors, quantized=True)
+    build_seconds = time.perf_counter() - start
+    list_count = len(index.centroids)
+    print(f"{size} vectors, {list_count} lists, {index.nbytes / 2**20:.0f} MB index")
+    reference = [index.search(query, args.top_k, -1.0, list_count)[0] for query in queries]
+    del vectors
+    for probes in args.probes:
+        latencies, results = [], []
+        for query in queries:
+            start = time.perf_counter()
+            rows = index.search(query, args.top_k, -1.0, probes)[0]
+            latencies.append((time.perf_counter() - start) * 1000)
+            results.append(rows.tolist())
+        print_row(size, "ivf", probes, build_seconds, latencies, recall(results, [r.tolist() for r in reference]))
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--vectors", type=int, default=0, help="Index this many random vectors instead of text")
+    parser.add_argument("--words", type=int, default=100)
+    parser.add_argument("--dimensions", type=int, default=256)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--probes", default="1,4,16,64")
+    parser.add_argument("--hybrid-probes", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+    args.probes = [int(p) for p in args.probes.split(",")]
+
+    print(f"{'rows':>8} {'search':>8} {'probes':>7} {'build s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'recall':>7}")
+    if args.vectors:
+        bench_vectors(args.vectors, args)
+        return
+    rng = random.Random(1)
+    queries = [" ".join(rng.sample(TERMS, rng.randint(2, 5))) for _ in range(args.queries)]
+    for size in [int(s) for s in args.sizes.split(",")]:
+        bench_text(size, args, queries)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,57 @@
+"""
+Document lookup and per-query scaling from 3 to 100k documents.
+
+    python -m benchmarks.bench_lookup [--sizes 3,1000,10000,100000]
+
+With the id index `get_document` stays flat and `/generate` grows linearly
+with corpus size (one cosine score per row), instead of quadratically.
+Searches take the endpoint's path, scoring pool and summarizer included,
+with the query cache disabled so every repeat is scored.
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import Response
+
+from app import main
+from benchmarks.corpus import synthetic_corpus
+
+
+def load(docs):
+    main.documents_db.clear()
+    main.documents_db.update((doc["id"], doc) for doc in docs)
+    main.initialize_index()
+    main.query_cache.max_entries = 0
+
+
+def per_call_ms(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="3,1000,10000,100000")
+    parser.add_argument("--words", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'docs':>8} {'get_document ms':>16} {'generate ms':>12}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        docs = synthetic_corpus(size, words=args.words)
+        load(docs)
+        last_id = docs[-1]["id"]
+        query = main.SearchQuery(query="breach of implied contract damages")
+        loop = asyncio.new_event_loop()
+        lookup = per_call_ms(
+            lambda: loop.run_until_complete(main.get_document(last_id, Response(), start=None, end=None, section=None)), 1000
+        )
+        search = per_call_ms(lambda: loop.run_until_complete(main.run_searches_async([query])), args.repeat)
+        print(f"{size:>8} {lookup:>16.4f} {search:>12.2f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,69 @@
+"""
+Resident memory of the document store and search index at 100k documents.
+
+    python -m benchmarks.bench_memory [--docs 100000] [--words 400]
+
+Compares the old layout, where every document dict carried a
+`processed_content` copy of its text next to `content`, with the current
+store, where normalized text is only derived to build the index. Memory is
+measured with tracemalloc as the growth over the raw corpus, so the numbers
+cover what loading and indexing adds on top of the source documents.
+"""
+import argparse
+import gc
+import tracemalloc
+
+from app import main
+from app.text import tokenize
+from benchmarks.corpus import synthetic_corpus
+
+
+def measure(fn):
+    """Bytes still allocated after `fn` returns, and its peak"""
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def legacy_layout(docs):
+    store = {}
+    for doc in docs:
+        doc = dict(doc)
+        # The normalized copy the old preprocessing stored on every document
+        doc["processed_content"] = " ".join(tokenize(doc["content"]))
+        store[doc["id"]] = doc
+    main.index.fit(list(store), [doc["processed_content"] for doc in store.values()], list(store.values()))
+    return store
+
+
+def compact_layout(docs):
+    main.documents_db.clear()
+    main.documents_db.update((doc["id"], dict(doc)) for doc in docs)
+    main.initialize_index()
+    return main.documents_db
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--words", type=int, default=400)
+    args = parser.parse_args()
+
+    docs = synthetic_corpus(args.docs, words=args.words)
+    text_mb = sum(len(doc["content"]) for doc in docs) / 2**20
+    print(f"{args.docs} documents, {text_mb:.1f} MB of content")
+    print(f"{'layout':>8} {'retained MB':>12} {'peak MB':>10}")
+    for name, layout in (("legacy", legacy_layout), ("compact", compact_layout)):
+        main.index.fit([], [], [])
+        main.documents_db.clear()
+        store, current, peak = measure(lambda: layout(docs))
+        print(f"{name:>8} {current / 2**20:>12.1f} {peak / 2**20:>10.1f}")
+        del store
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,77 @@
+"""
+Recall and latency of the retrieval engines on a synthetic corpus.
+
+    python -m benchmarks.bench_retrieval [--sizes 10000,100000] [--queries 200]
+
+Compares the sklearn TF-IDF cosine path with BM25, both exhaustive and with
+MaxScore pruning. `bm25 recall` is the share of exhaustive BM25 top-k hits
+the pruned engine returns; pruning is exact, so anything below 1.0 comes from
+documents tied at the k-th score. `tfidf overlap` is how many of the TF-IDF
+top-k hits each engine also returns.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.bm25 import Bm25Index
+from app.index import TfidfIndex
+from benchmarks.corpus import TERMS, synthetic_corpus
+
+
+def build(engine, docs):
+    texts = [doc["content"] for doc in docs]
+    start = time.perf_counter()
+    engine.fit([doc["id"] for doc in docs], texts, docs)
+    return time.perf_counter() - start
+
+
+def run_queries(engine, queries, top_k):
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = engine.search(query, top_k=top_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({doc["id"] for doc, _ in hits})
+    return np.percentile(latencies, [50, 95]), results
+
+
+def overlap(results, reference):
+    matched = sum(len(got & expected) for got, expected in zip(results, reference))
+    return matched / max(sum(len(expected) for expected in reference), 1)
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--words", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    queries = [" ".join(rng.sample(TERMS, rng.randint(2, 5))) for _ in range(args.queries)]
+
+    print(f"{'docs':>8} {'engine':>14} {'build s':>8} {'p50 ms':>8} {'p95 ms':>8} {'bm25 recall':>12} {'tfidf overlap':>14}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        docs = synthetic_corpus(size, words=args.words)
+        engines = {
+            "tfidf": TfidfIndex(),
+            "bm25-exhaustive": Bm25Index(pruning=False),
+            "bm25-maxscore": Bm25Index(),
+        }
+        measured = {}
+        for name, engine in engines.items():
+            build_seconds = build(engine, docs)
+            percentiles, results = run_queries(engine, queries, args.top_k)
+            measured[name] = (build_seconds, percentiles, results)
+
+        for name, (build_seconds, (p50, p95), results) in measured.items():
+            recall = overlap(results, measured["bm25-exhaustive"][2])
+            tfidf_overlap = overlap(results, measured["tfidf"][2])
+            print(f"{size:>8} {name:>14} {build_seconds:>8.2f} {p50:>8.2f} {p95:>8.2f} {recall:>12.3f} {tfidf_overlap:>14.3f}")
+
+
+if __name__ == "__main__":
+    run()
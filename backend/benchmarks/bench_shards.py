@@ -0,0 +1,53 @@
+"""
+Query latency of the sharded TF-IDF index by number of shards.
+
+    python -m benchmarks.bench_shards [--docs 100000] [--shards 1,2,4,8]
+
+Every configuration must return the same results as the unsharded index,
+since the vocabulary and IDF are global. Shards score in parallel threads,
+so latency only drops when there are cores to spare.
+"""
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+
+from app.engines import create_index
+from benchmarks.corpus import TERMS, synthetic_corpus
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--words", type=int, default=100)
+    parser.add_argument("--shards", default="1,2,4,8")
+    parser.add_argument("--shard-key", default="id")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    docs = synthetic_corpus(args.docs, words=args.words)
+    rng = random.Random(0)
+    queries = [" ".join(rng.sample(TERMS, 3)) for _ in range(args.queries)]
+
+    print(f"{args.docs} documents, {os.cpu_count()} cores, shard key {args.shard_key}")
+    print(f"{'shards':>7} {'p50 ms':>8} {'p95 ms':>8} {'identical':>10}")
+    reference = None
+    for shards in [int(s) for s in args.shards.split(",")]:
+        index = create_index("tfidf", shards=shards, shard_key=args.shard_key)
+        index.fit([doc["id"] for doc in docs], [doc["content"] for doc in docs], docs)
+        latencies, results = [], []
+        for query in queries:
+            start = time.perf_counter()
+            hits = index.search(query, top_k=10)
+            latencies.append((time.perf_counter() - start) * 1000)
+            results.append([(doc["id"], score) for doc, score in hits])
+        if reference is None:
+            reference = results
+        p50, p95 = np.percentile(latencies, [50, 95])
+        print(f"{shards:>7} {p50:>8.2f} {p95:>8.2f} {str(results == reference):>10}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,67 @@
+"""
+Text normalization and tokenization throughput in MB/s.
+
+    python -m benchmarks.bench_tokenize [--docs 20000] [--workers 1,4]
+
+Compares the previous pipeline (`re.sub` normalization followed by the
+vectorizer's own regex analysis) with the shared `app.text.tokenize`,
+serially and over a process pool, and the full TF-IDF build on top of each
+tokenizer setting.
+"""
+import argparse
+import re
+import time
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app.index import TFIDF_MIN_TOKEN_LENGTH, TfidfIndex
+from app.text import tokenize_corpus
+from benchmarks.corpus import synthetic_corpus
+
+
+def legacy_preprocess(text):
+    text = text.lower()
+    text = re.sub(r'[^a-z0-9\s]', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def legacy_tokens(texts):
+    analyzer = TfidfVectorizer().build_analyzer()
+    for text in texts:
+        yield analyzer(legacy_preprocess(text))
+
+
+def throughput(megabytes, fn):
+    start = time.perf_counter()
+    fn()
+    return megabytes / (time.perf_counter() - start)
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--workers", default="1,4")
+    args = parser.parse_args()
+
+    docs = synthetic_corpus(args.docs, words=args.words)
+    # Give the synthetic text the punctuation and casing of real opinions
+    texts = [doc["content"].replace(" ", ", ", 20).title() + " § 1798.100." for doc in docs]
+    megabytes = sum(len(text.encode()) for text in texts) / 2**20
+    print(f"{args.docs} documents, {megabytes:.1f} MB")
+
+    print(f"{'pipeline':>24} {'tokenize MB/s':>14} {'build MB/s':>11}")
+    tokens = throughput(megabytes, lambda: sum(1 for _ in legacy_tokens(texts)))
+    build = throughput(megabytes, lambda: TfidfVectorizer().fit_transform(legacy_preprocess(t) for t in texts))
+    print(f"{'re.sub + analyzer':>24} {tokens:>14.1f} {build:>11.1f}")
+    ids = [doc["id"] for doc in docs]
+    for workers in [int(w) for w in args.workers.split(",")]:
+        tokens = throughput(
+            megabytes, lambda: sum(1 for _ in tokenize_corpus(texts, TFIDF_MIN_TOKEN_LENGTH, workers))
+        )
+        build = throughput(megabytes, lambda: TfidfIndex(workers=workers).fit(ids, texts, docs))
+        print(f"{f'tokenize, {workers} workers':>24} {tokens:>14.1f} {build:>11.1f}")
+
+
+if __name__ == "__main__":
+    run()
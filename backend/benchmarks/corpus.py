@@ -0,0 +1,452 @@
+import argparse
+import json
+import random
+from typing import Dict, Iterator, List
+
+
+CATEGORIES = ["case_law", "contract", "statute"]
+JURISDICTIONS = ["California", "New York", "Texas", "Delaware", "Federal"]
+COURTS = {
+    "case_law": ["Superior Court of {j}", "Court of Appeal of {j}", "Supreme Court of {j}"],
+    "contract": ["N/A - Private Contract"],
+    "statute": ["{j} State Legislature"],
+}
+TERMS = [
+    "breach", "contract", "agreement", "lease", "tenant", "landlord", "rent", "damages",
+    "remedy", "termination", "employee", "employer", "handbook", "discipline", "privacy",
+    "consumer", "personal", "information", "deletion", "disclosure", "statute", "penalty",
+    "negligence", "liability", "indemnity", "warranty", "arbitration", "jurisdiction",
+    "plaintiff", "defendant", "appeal", "motion", "summary", "judgment", "injunction",
+    "covenant", "good", "faith", "implied", "express", "policy", "procedure", "notice",
+    "compliance", "regulation", "enforcement", "violation", "property", "maintenance",
+]
+
+
+def synthetic_document(i: int, rng: random.Random, words: int = 400) -> Dict:
+    """A document shaped like the entries of LEGAL_DOCUMENTS"""
+    category = rng.choice(CATEGORIES)
+    jurisdiction = rng.choice(JURISDICTIONS)
+    body = " ".join(rng.choice(TERMS) for _ in range(words))
+    return {
+        "id": f"syn-{i:07d}",
+        "title": f"Synthetic {category.replace('_', ' ')} {i}",
+        "case_number": f"SYN-{i:07d}",
+        "court": rng.choice(COURTS[category]).format(j=jurisdiction),
+        "date": f"{rng.randint(1990, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "category": category,
+        "summary": " ".join(rng.choice(TERMS) for _ in range(20)),
+        "content": body,
+        "jurisdiction": jurisdiction,
+        "parties": None,
+        "keywords": rng.sample(TERMS, 4),
+    }
+
+
+def generate_documents(count: int, seed: int = 0, words: int = 400) -> Iterator[Dict]:
+    rng = random.Random(seed)
+    for i in range(count):
+        yield synthetic_document(i, rng, words)
+
+
+def synthetic_corpus(count: int, seed: int = 0, words: int = 400) -> List[Dict]:
+    return list(generate_documents(count, seed, words))
+
+
+# --- Realistic legal documents ---
+# Opinions, contracts and statutes laid out like LEGAL_DOCUMENTS: a caption,
+# then headed sections ("FACTS:", "TERM:", ...) of templated paragraphs. Each
+# document draws its wording from one practice area, and party names, sums,
+# dates and citations vary per document, so the vocabulary keeps growing with
+# the corpus the way a real collection's does.
+
+DOCUMENT_MIX = (("case_law", 0.5), ("contract", 0.3), ("statute", 0.2))
+
+FIRST_NAMES = [
+    "Michael", "Sarah", "David", "Maria", "James", "Linda", "Robert", "Patricia", "Daniel", "Jennifer",
+    "Thomas", "Elizabeth", "Anthony", "Susan", "Kevin", "Karen", "Brian", "Nancy", "Steven", "Angela",
+    "Jose", "Wei", "Aisha", "Priya", "Hiroshi", "Olga", "Samuel", "Fatima", "Carlos", "Grace",
+]
+SURNAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez", "Hernandez",
+    "Lopez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Thompson",
+    "White", "Harris", "Clark", "Lewis", "Robinson", "Walker", "Young", "Allen", "King", "Wright",
+    "Scott", "Nguyen", "Hill", "Flores", "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera",
+    "Campbell", "Mitchell", "Carter", "Roberts", "Patel", "Chen", "Kowalski", "Okafor", "Schmidt", "Rossi",
+]
+COMPANY_WORDS = [
+    "Pacific", "Summit", "Harbor", "Granite", "Meridian", "Northstar", "Atlas", "Evergreen", "Liberty", "Keystone",
+    "Silverline", "Redwood", "Horizon", "Cascade", "Ironbridge", "Bluewater", "Pinnacle", "Crescent", "Beacon", "Sterling",
+]
+COMPANY_KINDS = [
+    "Manufacturing Corp.", "Properties LLC", "Systems Inc.", "Holdings LLC", "Logistics Inc.", "Health Partners LP",
+    "Software Inc.", "Construction Co.", "Insurance Company", "Capital Partners LLC", "Retail Group Inc.", "Foods Inc.",
+]
+REPORTERS = {
+    "California": ["Cal. App. 4th", "Cal. 5th", "Cal. Rptr. 3d"],
+    "New York": ["N.Y.3d", "A.D.3d", "N.Y.S.3d"],
+    "Texas": ["S.W.3d", "Tex. App."],
+    "Delaware": ["A.3d", "Del. Ch."],
+    "Federal": ["F.3d", "F. Supp. 3d", "U.S."],
+}
+
+# Practice areas: wording of their documents, the kind of contract and code
+# they produce, and the roles of the parties to that contract
+PRACTICE_AREAS = {
+    "employment": {
+        "keywords": ["employment law", "wrongful termination", "implied contract", "at-will employment",
+                     "progressive discipline", "retaliation", "overtime wages", "breach of contract"],
+        "subjects": ["the employee handbook", "the progressive discipline policy", "the termination decision",
+                     "the performance reviews", "the written warning", "the severance package",
+                     "the overtime records", "the complaint to human resources"],
+        "harms": ["lost wages", "lost benefits", "emotional distress", "back pay", "front pay"],
+        "contract": ("Employment Agreement", "EMP", "Employer", "Employee"),
+        "code": ("Labor Code", "LAB", "Employment Practices"),
+    },
+    "lease": {
+        "keywords": ["commercial lease", "real estate", "landlord-tenant", "rent escalation", "early termination",
+                     "maintenance obligations", "security deposit", "holdover tenancy"],
+        "subjects": ["the premises", "the base rent", "the security deposit", "the maintenance obligations",
+                     "the renewal option", "the common area charges", "the notice to quit", "the repair covenant"],
+        "harms": ["unpaid rent", "repair costs", "lost rental income", "the withheld deposit"],
+        "contract": ("Commercial Lease Agreement", "LEASE", "Landlord", "Tenant"),
+        "code": ("Civil Code", "CIV", "Hiring of Real Property"),
+    },
+    "privacy": {
+        "keywords": ["privacy law", "consumer rights", "personal information", "data protection", "right to delete",
+                     "opt-out", "data breach", "notice at collection"],
+        "subjects": ["the personal information", "the privacy notice", "the deletion request", "the data breach",
+                     "the sale of consumer data", "the opt-out request", "the tracking technologies",
+                     "the verifiable consumer request"],
+        "harms": ["statutory damages", "identity theft losses", "credit monitoring costs", "civil penalties"],
+        "contract": ("Data Processing Agreement", "DPA", "Controller", "Processor"),
+        "code": ("Civil Code", "CIV", "Consumer Privacy"),
+    },
+    "negligence": {
+        "keywords": ["negligence", "personal injury", "duty of care", "proximate cause", "premises liability",
+                     "comparative fault", "damages", "tort law"],
+        "subjects": ["the wet floor", "the warning signs", "the inspection logs", "the duty of care",
+                     "the security footage", "the medical records", "the maintenance schedule", "the expert testimony"],
+        "harms": ["medical expenses", "lost earnings", "pain and suffering", "future care costs"],
+        "contract": ("Release and Settlement Agreement", "SETTLE", "Releasor", "Releasee"),
+        "code": ("Code of Civil Procedure", "CCP", "Limitation of Actions"),
+    },
+    "intellectual_property": {
+        "keywords": ["intellectual property", "trade secrets", "software license", "copyright infringement",
+                     "patent license", "royalties", "confidentiality", "misappropriation"],
+        "subjects": ["the source code", "the licensed patents", "the royalty reports", "the confidential information",
+                     "the trade secrets", "the non-disclosure agreement", "the derivative works", "the trademark"],
+        "harms": ["unpaid royalties", "unjust enrichment", "lost profits", "a reasonable royalty"],
+        "contract": ("Software License Agreement", "LIC", "Licensor", "Licensee"),
+        "code": ("Business and Professions Code", "BPC", "Trade Secrets"),
+    },
+    "securities": {
+        "keywords": ["securities law", "fiduciary duty", "merger agreement", "shareholder rights", "disclosure",
+                     "corporate governance", "stock purchase", "indemnification"],
+        "subjects": ["the proxy statement", "the merger consideration", "the board minutes", "the stock purchase",
+                     "the fairness opinion", "the disclosure schedules", "the earn-out payments", "the fiduciary duties"],
+        "harms": ["rescissory damages", "the diminished share price", "disgorgement", "the purchase price adjustment"],
+        "contract": ("Stock Purchase Agreement", "SPA", "Seller", "Purchaser"),
+        "code": ("Corporations Code", "CORP", "Securities Transactions"),
+    },
+    "insurance": {
+        "keywords": ["insurance law", "bad faith", "coverage dispute", "policy exclusion", "duty to defend",
+                     "claims handling", "good faith and fair dealing", "subrogation"],
+        "subjects": ["the policy exclusion", "the claim denial", "the duty to defend", "the coverage limits",
+                     "the adjuster's report", "the proof of loss", "the reservation of rights letter", "the premiums"],
+        "harms": ["the policy benefits", "defense costs", "consequential damages", "punitive damages"],
+        "contract": ("Commercial General Liability Policy", "POL", "Insurer", "Insured"),
+        "code": ("Insurance Code", "INS", "Unfair Claims Settlement Practices"),
+    },
+    "construction": {
+        "keywords": ["construction law", "mechanics lien", "change orders", "delay damages", "warranty",
+                     "prevailing wage", "payment bond", "substantial completion"],
+        "subjects": ["the change orders", "the project schedule", "the mechanics lien", "the punch list",
+                     "the payment application", "the retention", "the certificate of substantial completion",
+                     "the design specifications"],
+        "harms": ["delay damages", "the unpaid contract balance", "repair costs", "liquidated damages"],
+        "contract": ("Construction Contract", "CONST", "Owner", "Contractor"),
+        "code": ("Public Contract Code", "PCC", "Public Works Contracts"),
+    },
+}
+
+OPINION_SECTIONS = {
+    "FACTS": [
+        "Plaintiff {plaintiff} and defendant {defendant} first dealt with one another in {year}.",
+        "The dispute centers on {subject} and {subject2}.",
+        "In {month} {year}, {defendant} acted without regard to {subject}, and {plaintiff} objected in writing.",
+        "{plaintiff} alleges that {defendant} disregarded {subject} despite repeated notice.",
+        "The record shows that {plaintiff} received {subject} in {month} {year}.",
+        "{defendant} contends that {subject2} did not create any enforceable obligation.",
+        "{plaintiff} seeks ${amount} for {harm} together with costs of suit.",
+        "Discovery produced {subject2}, which the parties dispute.",
+    ],
+    "PROCEDURAL HISTORY": [
+        "{plaintiff} filed this action in {month} {year}, asserting claims arising from {subject}.",
+        "{defendant} moved for summary judgment, which the trial court denied in part.",
+        "The matter proceeded to a bench trial of {days} days.",
+        "Both parties submitted post-trial briefs addressing {subject2}.",
+    ],
+    "LEGAL ANALYSIS": [
+        "{jurisdiction} law governs the interpretation of {subject}.",
+        "Under {citation}, a party relying on {subject} must show reasonable reliance.",
+        "The Court finds the reasoning of {citation} persuasive on the question of {keyword}.",
+        "{defendant} relies on {citation}, but that decision concerned facts unlike {subject2}.",
+        "The evidence establishes that {defendant} was aware of {subject} when it acted.",
+        "A claim for {keyword} requires proof of duty, breach, causation and damages.",
+        "The Court is not persuaded that {subject2} excused {defendant}'s performance.",
+        "Courts applying {jurisdiction} law have consistently treated {keyword} as a question of fact.",
+        "The burden then shifts to {defendant} to show a legitimate justification.",
+    ],
+    "HOLDING": [
+        "The Court holds that {defendant} is liable to {plaintiff} for {keyword}.",
+        "{subject} created obligations that {defendant} breached.",
+        "{plaintiff} is entitled to recover ${amount} for {harm}.",
+    ],
+    "CONCLUSION": [
+        "For the foregoing reasons, judgment is entered in favor of {plaintiff}.",
+        "{defendant} shall pay ${amount} in damages for {harm}, with interest from {month} {year}.",
+        "Each party shall bear its own attorney's fees.",
+        "The Court retains jurisdiction to enforce this judgment.",
+    ],
+}
+
+CONTRACT_SECTIONS = {
+    "PARTIES": [
+        "This {contract} is entered into as of {month} {day}, {year}, by and between {first} (\"{role1}\") and {second} (\"{role2}\").",
+        "{role1} is organized under the laws of {jurisdiction}, with offices at {address}.",
+        "{role2} maintains its principal place of business at {address}.",
+    ],
+    "TERM": [
+        "The initial term of this Agreement shall be {years} years, commencing on {month} {day}, {year}.",
+        "{role2} may renew this Agreement for one additional term of {years} years on {days} days' written notice.",
+        "Either party may terminate this Agreement upon a material breach that remains uncured for {days} days.",
+    ],
+    "PAYMENT": [
+        "{role2} shall pay {role1} ${amount} per month, due on the first day of each month.",
+        "Payments received more than {days} days late shall incur a late fee of {percent}% of the amount due.",
+        "Fees shall increase by {percent}% on each anniversary of the commencement date.",
+        "{role2} has deposited ${amount} as security for the faithful performance of its obligations.",
+    ],
+    "OBLIGATIONS": [
+        "{role1} shall be responsible for {subject} throughout the term.",
+        "{role2} shall maintain {subject2} in good condition and repair at its own expense.",
+        "Neither party shall disclose {subject} to any third party without prior written consent.",
+        "{role2} shall comply with all laws and regulations applicable to {subject2}.",
+        "{role1} shall provide written notice of any claim concerning {subject} within {days} days.",
+    ],
+    "INDEMNIFICATION": [
+        "Each party shall indemnify and hold harmless the other from claims arising out of its negligence or breach.",
+        "The indemnifying party shall control the defense of any claim relating to {subject}.",
+        "Liability under this Agreement shall not exceed ${amount} in the aggregate.",
+    ],
+    "TERMINATION": [
+        "{role2} may terminate this Agreement early by paying a termination fee equal to {months} months' payments.",
+        "Upon termination, {role2} shall return {subject} within {days} days.",
+        "Provisions concerning {subject2} shall survive termination of this Agreement.",
+    ],
+    "GOVERNING LAW": [
+        "This Agreement shall be governed by the laws of {jurisdiction}.",
+        "Any dispute arising under this Agreement shall be resolved by binding arbitration in {jurisdiction}.",
+    ],
+}
+
+STATUTE_SECTIONS = {
+    "DEFINITIONS": [
+        "For purposes of this section, \"{keyword}\" means any practice relating to {subject}.",
+        "\"Business\" means any entity that conducts business in {jurisdiction} and exceeds ${amount} in annual gross revenue.",
+        "\"Consumer\" means a natural person who is a resident of {jurisdiction}.",
+    ],
+    "REQUIREMENTS": [
+        "A person subject to this section shall disclose {subject} upon request.",
+        "No person shall condition services on the waiver of rights relating to {subject2}.",
+        "A business shall respond to a request concerning {subject} within {days} days of its receipt.",
+        "Records relating to {subject2} shall be retained for a period of not less than {years} years.",
+        "The obligations of this section apply notwithstanding any contrary provision of {subject2}.",
+    ],
+    "EXCEPTIONS": [
+        "This section shall not apply to {subject} maintained solely for law enforcement purposes.",
+        "Nothing in this section restricts the ability of a person to comply with federal law.",
+    ],
+    "ENFORCEMENT": [
+        "Any person who violates this section shall be liable for a civil penalty of not more than ${amount} for each violation.",
+        "The Attorney General may bring an action to enjoin any violation relating to {subject}.",
+        "A person injured by a violation of this section may recover {harm} in a civil action.",
+        "An action under this section shall be commenced within {years} years after the violation.",
+    ],
+}
+
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+# Courts and legislature of the Federal jurisdiction, which the COURTS templates do not fit
+FEDERAL_COURTS = {
+    "case_law": ["United States District Court", "United States Court of Appeals", "Supreme Court of the United States"],
+    "contract": COURTS["contract"],
+    "statute": ["United States Congress"],
+}
+JURISDICTION_CODES = {"California": "CA", "New York": "NY", "Texas": "TX", "Delaware": "DE", "Federal": "US"}
+STREETS = ["Market Street", "Main Street", "Innovation Drive", "Park Avenue", "Commerce Way", "Harbor Boulevard"]
+
+
+def document_id(i: int) -> str:
+    return f"legal-{i:07d}"
+
+
+def person_name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(SURNAMES)}"
+
+
+def company_name(rng: random.Random) -> str:
+    return f"{rng.choice(COMPANY_WORDS)} {rng.choice(SURNAMES)} {rng.choice(COMPANY_KINDS)}"
+
+
+def citation(rng: random.Random, jurisdiction: str) -> str:
+    return (
+        f"{rng.choice(SURNAMES)} v. {rng.choice(SURNAMES)}, {rng.randint(1, 999)} "
+        f"{rng.choice(REPORTERS[jurisdiction])} {rng.randint(1, 1999)} ({rng.randint(1950, 2024)})"
+    )
+
+
+def _section_text(templates: List[str], rng: random.Random, slots: Dict, paragraphs: int, area: Dict) -> str:
+    """Paragraphs of two to five sentences from `templates`, with subjects, harms and citations redrawn per sentence"""
+    out = []
+    for _ in range(paragraphs):
+        sentences = []
+        for template in rng.sample(templates, min(len(templates), rng.randint(2, 5))):
+            sentence = template.format(
+                subject=rng.choice(area["subjects"]),
+                subject2=rng.choice(area["subjects"]),
+                harm=rng.choice(area["harms"]),
+                keyword=rng.choice(area["keywords"]),
+                citation=citation(rng, slots["jurisdiction"]),
+                amount=f"{rng.randint(1, 2000) * 500:,}",
+                days=rng.choice([5, 10, 15, 30, 45, 60, 90]),
+                months=rng.randint(2, 12),
+                years=rng.randint(1, 10),
+                percent=rng.randint(2, 12),
+                day=rng.randint(1, 28),
+                month=rng.choice(MONTHS),
+                address=f"{rng.randint(10, 9999)} {rng.choice(STREETS)}",
+                **slots,
+            )
+            sentences.append(sentence[0].upper() + sentence[1:])
+        out.append(" ".join(sentences))
+    return "\n\n".join(out)
+
+
+def _sections(layout: Dict[str, List[str]], rng: random.Random, slots: Dict, area: Dict, optional: tuple = ()) -> str:
+    parts = []
+    for heading, templates in layout.items():
+        if heading in optional and rng.random() < 0.5:
+            continue
+        parts.append(f"{heading}:\n{_section_text(templates, rng, slots, rng.randint(1, 3), area)}")
+    return "\n\n".join(parts)
+
+
+def legal_document(i: int, rng: random.Random) -> Dict:
+    """
+    A realistic opinion, contract or statute with the fields of LEGAL_DOCUMENTS,
+    its content split into headed sections
+    """
+    category = rng.choices([name for name, _ in DOCUMENT_MIX], weights=[share for _, share in DOCUMENT_MIX])[0]
+    area_name = rng.choice(list(PRACTICE_AREAS))
+    area = PRACTICE_AREAS[area_name]
+    jurisdiction = rng.choice(JURISDICTIONS)
+    year = rng.randint(1990, 2024)
+    date = f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    courts = FEDERAL_COURTS if jurisdiction == "Federal" else COURTS
+    court = rng.choice(courts[category]).format(j=jurisdiction)
+    slots = {"jurisdiction": jurisdiction, "year": year}
+    topic = area_name.replace("_", " ")
+
+    if category == "case_law":
+        plaintiff = person_name(rng)
+        defendant = company_name(rng) if rng.random() < 0.7 else person_name(rng)
+        case_number = f"{year}-CV-{rng.randint(1000, 99999)}"
+        slots.update(plaintiff=plaintiff, defendant=defendant)
+        title = f"{plaintiff} v. {defendant}"
+        parties = f"{plaintiff} (Plaintiff) v. {defendant} (Defendant)"
+        header = f"{court.upper()}\n\nCase No. {case_number}\n\n{plaintiff.upper()}, Plaintiff,\nv.\n{defendant.upper()}, Defendant.\n\nOPINION"
+        body = _sections(OPINION_SECTIONS, rng, slots, area, optional=("PROCEDURAL HISTORY", "HOLDING"))
+        summary = f"Decision on {rng.choice(area['keywords'])} arising from {rng.choice(area['subjects'])}, resolving claims for {rng.choice(area['harms'])}."
+    elif category == "contract":
+        kind, prefix, role1, role2 = area["contract"]
+        first, second = company_name(rng), company_name(rng) if rng.random() < 0.8 else person_name(rng)
+        case_number = f"{prefix}-{year}-{rng.randint(100, 9999)}"
+        slots.update(contract=kind, first=first, second=second, role1=role1, role2=role2)
+        title = f"{kind} - {first.split()[0]} {first.split()[1]}"
+        parties = f"{first} ({role1}) v. {second} ({role2})"
+        header = kind.upper()
+        body = _sections(CONTRACT_SECTIONS, rng, slots, area, optional=("INDEMNIFICATION",))
+        summary = f"{kind} between {first} and {second} covering {rng.choice(area['subjects'])} and {rng.choice(area['subjects'])}."
+    else:
+        code, prefix, part = area["code"]
+        code = "United States Code" if jurisdiction == "Federal" else f"{jurisdiction} {code}"
+        section = f"{rng.randint(100, 9999)}.{rng.randint(1, 199)}"
+        case_number = f"{JURISDICTION_CODES[jurisdiction]}-{prefix}-§{section}"
+        title = f"{code} § {section} - {part}"
+        parties = "N/A - State Statute"
+        header = (
+            f"{code.upper()}\nDIVISION {rng.randint(1, 12)}. {part.upper()}\n\n"
+            f"§ {section}. {part}"
+        )
+        body = _sections(STATUTE_SECTIONS, rng, slots, area, optional=("EXCEPTIONS",))
+        summary = f"{part} provisions of the {code} governing {rng.choice(area['subjects'])} and {topic} enforcement."
+
+    return {
+        "id": document_id(i),
+        "title": title,
+        "case_number": case_number,
+        "court": court,
+        "date": date,
+        "category": category,
+        "summary": summary,
+        "content": f"{header}\n\n{body}",
+        "jurisdiction": jurisdiction,
+        "parties": parties,
+        "keywords": rng.sample(area["keywords"], rng.randint(3, 6)),
+    }
+
+
+def generate_legal_documents(count: int, seed: int = 0) -> Iterator[Dict]:
+    """Realistic documents, streamed; the first n of a seed are the same whatever the count"""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield legal_document(i, rng)
+
+
+def legal_queries(count: int, seed: int = 0) -> List[str]:
+    """Search queries mixing practice-area wording, as users of /generate would type them"""
+    rng = random.Random(seed)
+    areas = list(PRACTICE_AREAS.values())
+    queries = []
+    for _ in range(count):
+        area = rng.choice(areas)
+        words = [rng.choice(area["keywords"]), rng.choice(area["subjects"]).replace("the ", "", 1)]
+        if rng.random() < 0.5:
+            words.append(rng.choice(area["harms"]))
+        queries.append(" ".join(words))
+    return queries
+
+
+def write_corpus(path: str, count: int, seed: int = 0) -> None:
+    """Write `count` realistic documents to `path` as newline-delimited JSON"""
+    with open(path, "w") as f:
+        for doc in generate_legal_documents(count, seed):
+            f.write(json.dumps(doc) + "\n")
+
+
+def read_corpus(path: str) -> Iterator[Dict]:
+    with open(path) as f:
+        for line in f:
+            yield json.loads(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a realistic synthetic legal corpus as NDJSON")
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+    write_corpus(args.output, args.docs, args.seed)
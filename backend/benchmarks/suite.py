@@ -0,0 +1,410 @@
+"""
+Reproducible benchmark suite over a realistic synthetic legal corpus.
+
+    python -m benchmarks.suite [--sizes 1000,100000] [--requests 500] [--http] [--output results.json]
+    python -m benchmarks.suite --compare baseline.json results.json [--threshold 0.1]
+
+For each size, a corpus of opinions, contracts and statutes generated by
+benchmarks/corpus.py is written as NDJSON under --corpus-dir, and reused by
+later runs with the same size and seed. A fresh process then loads it and
+reports:
+
+- cold start: time from process start until the first /generate is
+  answered, split into importing app.main, loading the corpus into the
+  store (with the ingest-time features) and building the index;
+- memory: resident set after the build, the peak, and growth per document;
+- latency percentiles and throughput of POST /generate, GET /api/documents
+  (a page after a random document) and GET /api/documents/{id}, in-process
+  through the ASGI stack with the test client, one request at a time.
+
+With --http, a uvicorn server is started on the same corpus. Its cold
+start is timed up to its first answered search, and the same requests are
+then sent over HTTP by --concurrency clients. Clients and server share the
+machine, so throughput is only comparable between runs on the same host.
+
+The benchmark processes inherit the environment, so engine settings such as
+SEARCH_ENGINE or INDEX_SHARDS are compared by setting them for a run; the
+settings in effect are recorded in the results. The query cache is disabled
+so every search is scored.
+
+--output writes the results as JSON along with the git commit, machine and
+package versions. --compare prints the metrics of two such files side by side
+and exits with status 1 when one regressed by more than --threshold.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import platform
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+
+import numpy as np
+
+from benchmarks.corpus import document_id, legal_queries, read_corpus, write_corpus
+
+# Results file layout; bumped when metrics are renamed so comparisons do not mix them
+RESULTS_VERSION = 1
+
+# Requests sent to each endpoint before measuring
+WARMUP_REQUESTS = 20
+
+PACKAGES = ("fastapi", "starlette", "pydantic", "uvicorn", "numpy", "scipy", "scikit-learn")
+
+# Settings passed to every benchmark process on top of the caller's environment
+BENCHMARK_ENV = {"QUERY_CACHE_SIZE": "0"}
+
+
+def endpoint_requests(size: int, count: int, seed: int) -> dict:
+    """(method, path, body) of the requests sent to each endpoint, the same for every run with this seed"""
+    rng = random.Random(seed)
+    queries = legal_queries(count, seed)
+    return {
+        "POST /generate": [("POST", "/generate", {"query": query}) for query in queries],
+        "GET /api/documents": [
+            # A cursor is the base64 of the last id of the previous page, as app.main.encode_cursor makes it
+            ("GET", f"/api/documents?cursor={base64.urlsafe_b64encode(document_id(rng.randrange(size)).encode()).decode()}", None)
+            for _ in range(count)
+        ],
+        "GET /api/documents/{id}": [("GET", f"/api/documents/{document_id(rng.randrange(size))}", None) for _ in range(count)],
+    }
+
+
+def latency_stats(latencies: list, errors: int, elapsed: float) -> dict:
+    milliseconds = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "mean_ms": float(milliseconds.mean()),
+        "p50_ms": float(np.percentile(milliseconds, 50)),
+        "p95_ms": float(np.percentile(milliseconds, 95)),
+        "p99_ms": float(np.percentile(milliseconds, 99)),
+        "max_ms": float(milliseconds.max()),
+        "throughput_rps": len(latencies) / elapsed,
+    }
+
+
+def peak_memory_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # kilobytes on Linux
+
+
+def store_corpus(main, path: str) -> None:
+    """Replace the store's documents with the corpus at `path`, with the features computed at startup"""
+    from app.features import document_features
+
+    main.documents_db.clear()
+    main.documents_db.update((doc["id"], {**doc, **document_features(doc)}) for doc in read_corpus(path))
+
+
+def measure_process(path: str, size: int, count: int, seed: int) -> dict:
+    """Cold start, memory and in-process latency, in the fresh process that loads the corpus"""
+    start = time.perf_counter()
+    from fastapi.testclient import TestClient
+    from app import config, main
+    from app.metrics import resident_memory_bytes
+
+    imported = time.perf_counter()
+    baseline = resident_memory_bytes()
+    store_corpus(main, path)
+    loaded = time.perf_counter()
+    main.initialize_index()
+    built = time.perf_counter()
+
+    client = TestClient(main.app)
+    requests = endpoint_requests(size, count + WARMUP_REQUESTS, seed)
+    method, url, body = requests["POST /generate"][0]
+    client.request(method, url, json=body).raise_for_status()
+    ready_at = time.time()
+    answered = time.perf_counter()
+    memory = resident_memory_bytes()
+
+    endpoints = {}
+    for endpoint, specs in requests.items():
+        for method, url, body in specs[:WARMUP_REQUESTS]:
+            client.request(method, url, json=body)
+        latencies, errors = [], 0
+        started = time.perf_counter()
+        for method, url, body in specs[WARMUP_REQUESTS:]:
+            sent = time.perf_counter()
+            response = client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - sent)
+            errors += response.status_code >= 400
+        endpoints[endpoint] = latency_stats(latencies, errors, time.perf_counter() - started)
+
+    return {
+        "ready_at": ready_at,
+        "import_seconds": imported - start,
+        "load_seconds": loaded - imported,
+        "build_seconds": built - loaded,
+        "first_query_seconds": answered - built,
+        "rss_bytes": memory,
+        "peak_rss_bytes": peak_memory_bytes(),
+        "bytes_per_document": (memory - baseline) / size,
+        "inprocess": endpoints,
+        "config": {name: value for name, value in vars(config).items() if name.isupper() and _is_json(value)},
+    }
+
+
+def serve(path: str, port: int) -> None:
+    """Load the corpus and serve the app, for the HTTP measurements"""
+    import uvicorn
+    from app import main
+
+    store_corpus(main, path)
+    main.initialize_index()
+    uvicorn.run(main.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def measure_http(path: str, size: int, count: int, seed: int, concurrency: int) -> dict:
+    """Cold start of a uvicorn server on the corpus, then the endpoints driven over HTTP"""
+    import httpx
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+    requests = endpoint_requests(size, count + WARMUP_REQUESTS, seed)
+
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.suite", "--serve", path, "--port", str(port)],
+        env={**os.environ, **BENCHMARK_ENV},
+    )
+    try:
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError(f"Benchmark server exited with status {server.returncode}")
+                try:
+                    client.get("/health").raise_for_status()
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.05)
+            method, url, body = requests["POST /generate"][0]
+            client.request(method, url, json=body).raise_for_status()
+            cold_start = time.perf_counter() - start
+        endpoints = {
+            endpoint: asyncio.run(drive(base_url, specs, concurrency)) for endpoint, specs in requests.items()
+        }
+    finally:
+        server.terminate()
+        server.wait()
+    return {"cold_start_seconds": cold_start, "concurrency": concurrency, "endpoints": endpoints}
+
+
+async def drive(base_url: str, specs: list, concurrency: int) -> dict:
+    """Send `specs` with `concurrency` requests in flight, after the warmup ones"""
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        for method, url, body in specs[:WARMUP_REQUESTS]:
+            await client.request(method, url, json=body)
+        pending = iter(specs[WARMUP_REQUESTS:])
+        latencies, errors = [], []
+
+        async def worker():
+            for method, url, body in pending:
+                sent = time.perf_counter()
+                response = await client.request(method, url, json=body)
+                latencies.append(time.perf_counter() - sent)
+                errors.append(response.status_code >= 400)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latency_stats(latencies, sum(errors), time.perf_counter() - started)
+
+
+def measure_size(size: int, args) -> dict:
+    path = os.path.join(args.corpus_dir, f"legal-corpus-{size}-{args.seed}.ndjson")
+    corpus_seconds = None
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        write_corpus(path + ".partial", size, args.seed)
+        os.replace(path + ".partial", path)
+        corpus_seconds = time.perf_counter() - start
+
+    with tempfile.NamedTemporaryFile(suffix=".json") as output:
+        spawned_at = time.time()
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.suite", "--worker", path, "--size", str(size),
+             "--requests", str(args.requests), "--seed", str(args.seed), "--worker-output", output.name],
+            env={**os.environ, **BENCHMARK_ENV},
+            check=True,
+        )
+        measured = json.load(open(output.name))
+
+    result = {
+        "size": size,
+        "corpus_bytes": os.path.getsize(path),
+        "corpus_seconds": corpus_seconds,
+        "cold_start_seconds": measured.pop("ready_at") - spawned_at,
+        **measured,
+    }
+    if args.http:
+        result["http"] = measure_http(path, size, args.requests, args.seed, args.concurrency)
+    return result
+
+
+def run_metadata(args) -> dict:
+    def git(*command):
+        try:
+            return subprocess.run(["git", *command], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    packages = {}
+    for name in PACKAGES:
+        try:
+            packages[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            packages[name] = None
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git("rev-parse", "HEAD"),
+        "git_dirty": bool(status) if status is not None else None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "packages": packages,
+        "arguments": {"sizes": args.sizes, "requests": args.requests, "seed": args.seed,
+                      "http": args.http, "concurrency": args.concurrency},
+    }
+
+
+def flatten(results: dict) -> dict:
+    """Numeric metrics of a results file keyed by path, such as '1000/inprocess/POST /generate/p95_ms'"""
+    metrics = {}
+
+    def walk(prefix, value):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key != "config":
+                    walk(f"{prefix}/{key}", item)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[prefix] = value
+
+    for result in results["results"]:
+        walk(str(result["size"]), {key: value for key, value in result.items() if key != "size"})
+    return metrics
+
+
+def compare(baseline_path: str, current_path: str, threshold: float) -> int:
+    """Print both runs' metrics and their relative change; returns 1 when any regressed past `threshold`"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(current_path) as f:
+        current = json.load(f)
+    if baseline.get("version") != current.get("version"):
+        print(f"Results versions differ ({baseline.get('version')} vs {current.get('version')}); metrics may not match")
+    settings = {result["size"]: result.get("config", {}) for result in baseline["results"]}
+    for result in current["results"]:
+        old_settings, new_settings = settings.get(result["size"], {}), result.get("config", {})
+        for name in sorted(old_settings.keys() & new_settings.keys()):
+            if old_settings[name] != new_settings[name]:
+                print(f"{result['size']} docs: {name} was {old_settings[name]!r}, now {new_settings[name]!r}")
+    before, after = flatten(baseline), flatten(current)
+
+    regressions = 0
+    print(f"{'metric':<58}{'baseline':>14}{'current':>14}{'change':>10}")
+    for name in sorted(before.keys() & after.keys()):
+        # Sizes of the run rather than measurements
+        if name.endswith(("/requests", "/concurrency", "/corpus_bytes", "/corpus_seconds")):
+            continue
+        old, new = before[name], after[name]
+        change = (new - old) / old if old else 0.0
+        # Throughput is better higher, everything else (seconds, bytes, errors) lower;
+        # the slowest request is shown but too noisy to gate on
+        worse = -change if name.endswith("_rps") else change
+        flag = ""
+        if (name.endswith("/errors") and new > old) or (worse > threshold and not name.endswith("/max_ms")):
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<58}{old:>14.4g}{new:>14.4g}{change:>+10.1%}{flag}")
+    unmatched = before.keys() ^ after.keys()
+    if unmatched:
+        print(f"{len(unmatched)} metric(s) measured in only one run, such as a size or --http, were not compared")
+    print(f"{regressions} metric(s) regressed by more than {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def print_results(results: list) -> None:
+    print(f"{'docs':>9}{'build s':>10}{'load s':>10}{'cold start s':>14}{'RSS MB':>10}{'peak MB':>10}{'B/doc':>10}")
+    for result in results:
+        print(
+            f"{result['size']:>9}{result['build_seconds']:>10.2f}{result['load_seconds']:>10.2f}"
+            f"{result['cold_start_seconds']:>14.2f}{result['rss_bytes'] / 2**20:>10.1f}"
+            f"{result['peak_rss_bytes'] / 2**20:>10.1f}{result['bytes_per_document']:>10.0f}"
+        )
+    print()
+    print(f"{'docs':>9}  {'mode':<10}{'endpoint':<26}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'errors':>8}")
+    for result in results:
+        modes = [("inprocess", result["inprocess"])]
+        if "http" in result:
+            modes.append(("http", result["http"]["endpoints"]))
+        for mode, endpoints in modes:
+            for endpoint, stats in endpoints.items():
+                print(
+                    f"{result['size']:>9}  {mode:<10}{endpoint:<26}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}"
+                    f"{stats['p99_ms']:>9.2f}{stats['throughput_rps']:>9.0f}{stats['errors']:>8}"
+                )
+    for result in results:
+        if "http" in result:
+            print(f"{result['size']:>9} docs: HTTP cold start {result['http']['cold_start_seconds']:.2f} s")
+
+
+def _is_json(value) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,100000")
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per endpoint")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--http", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--corpus-dir", default=tempfile.gettempdir())
+    parser.add_argument("--output")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"))
+    parser.add_argument("--threshold", type=float, default=0.1)
+    # Entry points of the processes the suite starts
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--serve", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare, args.threshold))
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+    if args.worker:
+        measured = measure_process(args.worker, args.size, args.requests, args.seed)
+        with open(args.worker_output, "w") as f:
+            json.dump(measured, f)
+        return
+
+    results = [measure_size(int(size), args) for size in args.sizes.split(",")]
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"version": RESULTS_VERSION, "metadata": run_metadata(args), "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,58 @@
+import threading
+
+import numpy as np
+
+from app.engines import create_index
+from app.facets import FacetIndex
+
+
+# Indexed against the vocabulary of CORPUS, which a refit started before it was added does not extend
+PARAGRAPH = "Delivery dates slipped under the supply agreement terms. " * 5
+
+CORPUS = [
+    {"id": f"doc-{number}", "category": "contract", "content": f"Agreement {number} on supply terms and delivery dates. " * 6}
+    for number in range(20)
+]
+
+
+def passage_index():
+    index = create_index("tfidf", passages=True, refit_drift=1.0)
+    index.fit([doc["id"] for doc in CORPUS], [doc["content"] for doc in CORPUS], CORPUS)
+    return index
+
+
+def test_document_ingested_during_refit_is_counted_once():
+    index = passage_index()
+    loading, release = threading.Event(), threading.Event()
+    stored = {doc["id"]: doc for doc in CORPUS}
+
+    def load_corpus(ids):
+        loading.set()
+        release.wait(timeout=10)
+        return [(stored[doc_id]["content"], stored[doc_id]) if doc_id in stored else None for doc_id in ids]
+
+    assert index.schedule_refit(load_corpus)
+    assert loading.wait(timeout=10)
+    new_doc = {"id": "new-1", "category": "newcat", "content": "\n\n".join([PARAGRAPH] * 3)}
+    stored[new_doc["id"]] = new_doc
+    index.add([new_doc["id"]], [new_doc["content"]], [new_doc])
+    release.set()
+    index.passages._refit_thread.join(timeout=10)
+
+    results, counts = index.search_batch(["delivery dates slipped"], [30], [0.0], facet_counts=True)[0]
+    assert results[0][0]["id"] == "new-1"
+    assert len(results[0][2]) == 3
+    assert counts["category"] == {"contract": 20, "newcat": 1}
+
+
+def test_facet_counts_are_per_document_across_appends():
+    facets = FacetIndex()
+    doc = {"id": "a", "category": "contract"}
+    facets.add([(doc, {"start": 0}), (doc, {"start": 10})])
+    facets.add([(doc, {"start": 20})])
+    assert facets.counts(np.arange(3))["category"] == {"contract": 1}
+
+    # A new version of the document counts with its own facets
+    replacement = {"id": "a", "category": "statute"}
+    facets.add([(replacement, {"start": 0})])
+    assert facets.counts(np.array([3]))["category"] == {"statute": 1}
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { Search, FileText } from 'lucide-react';
 import DocumentCard from '../components/search/DocumentCard';
 import SkeletonCard from '../components/search/SkeletonCard';
@@ -14,43 +14,72 @@ type Document = {
     keywords?: string[];
 };
 
+// Only the fields the document cards render, so list pages stay small
+const LIST_FIELDS = 'id,title,category,date,case_number,summary,keywords';
+
 export default function LibraryPage() {
     const [searchTerm, setSearchTerm] = useState('');
     const [categoryFilter, setCategoryFilter] = useState('all');
     const [documents, setDocuments] = useState<Document[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [isLoading, setIsLoading] = useState(true);
+    const [isLoadingMore, setIsLoadingMore] = useState(false);
     const containerRef = usePageTransition();
+    // The request in flight; a newer request aborts it so its page is never applied
+    const requestRef = useRef<AbortController | null>(null);
 
     useEffect(() => {
-        fetchDocuments();
-    }, []);
+        setIsLoading(true);
+        setIsLoadingMore(false);
+        fetchDocuments(null);
+        return () => requestRef.current?.abort();
+    }, [categoryFilter]);
+
+    const fetchDocuments = async (cursor: string | null) => {
+        const params = new URLSearchParams({ fields: LIST_FIELDS });
+        if (categoryFilter !== 'all') params.set('category', categoryFilter);
+        if (cursor) params.set('cursor', cursor);
+
+        requestRef.current?.abort();
+        const controller = new AbortController();
+        requestRef.current = controller;
 
-    const fetchDocuments = async () => {
         try {
             const [response] = await Promise.all([
-                fetch('https://acme-ai-lqwv.onrender.com/api/documents'),
-                new Promise((resolve) => setTimeout(resolve, 1000)), // Minimum 1-second delay
+                fetch(`https://acme-ai-lqwv.onrender.com/api/documents?${params}`, { signal: controller.signal }),
+                new Promise((resolve) => setTimeout(resolve, cursor ? 0 : 1000)), // Minimum 1-second delay on first load
             ]);
 
             const data = await response.json();
-            setDocuments(data);
+            if (controller.signal.aborted) return;
+            setDocuments((previous) => (cursor ? [...previous, ...data.documents] : data.documents));
+            setNextCursor(data.next_cursor ?? null);
         } catch (error) {
+            if (controller.signal.aborted) return;
             console.error('Error fetching documents:', error);
         } finally {
-            setIsLoading(false);
+            // A superseded request leaves the loading state to the one that replaced it
+            if (requestRef.current === controller) {
+                requestRef.current = null;
+                setIsLoading(false);
+                setIsLoadingMore(false);
+            }
         }
     };
 
+    const loadMore = () => {
+        if (!nextCursor || requestRef.current) return;
+        setIsLoadingMore(true);
+        fetchDocuments(nextCursor);
+    };
+
     const filteredDocuments = documents.filter((doc: Document) => {
-        const matchesSearch =
+        return (
             !searchTerm ||
             doc.title?.toLowerCase().includes(searchTerm.toLowerCase()) ||
             doc.case_number?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-            doc.summary?.toLowerCase().includes(searchTerm.toLowerCase());
-
-        const matchesCategory = categoryFilter === 'all' || doc.category === categoryFilter;
-
-        return matchesSearch && matchesCategory;
+            doc.summary?.toLowerCase().includes(searchTerm.toLowerCase())
+        );
     });
 
     return (
@@ -119,6 +148,18 @@ export default function LibraryPage() {
                         ))}
                     </div>
                 )}
+
+                {!isLoading && nextCursor && (
+                    <div className="mt-8 flex justify-center">
+                        <button
+                            onClick={loadMore}
+                            disabled={isLoadingMore}
+                            className="px-6 py-2 rounded-lg border border-slate-300 bg-white text-slate-700 hover:border-yellow-500 disabled:opacity-50"
+                        >
+                            {isLoadingMore ? 'Loading...' : 'Load more documents'}
+                        </button>
+                    </div>
+                )}
             </div>
         </div>
     );
@@ -26,12 +26,13 @@ export default function SearchPage() {
     const [searchResults, setSearchResults] = useState<SearchResult | null>(null);
     const [error, setError] = useState<string | null>(null);
     const [documents, setDocuments] = useState<DocumentData[]>([]);
+    const [documentsTotal, setDocumentsTotal] = useState<number>(0);
     const [documentsLoading, setDocumentsLoading] = useState<boolean>(true);
     const containerRef = usePageTransition();
     const searchResultsRef = useRef(null);
     const availableDocsRef = useRef(null);
 
-    // Fetch all documents on mount
+    // Fetch the first few documents (card fields only) on mount
     useEffect(() => {
         fetchDocuments();
     }, []);
@@ -39,12 +40,15 @@ export default function SearchPage() {
     const fetchDocuments = async (): Promise<void> => {
         try {
             const [response] = await Promise.all([
-                fetch('https://acme-ai-lqwv.onrender.com/api/documents'),
+                fetch(
+                    'https://acme-ai-lqwv.onrender.com/api/documents?limit=6&fields=id,title,category,date,case_number,summary,keywords'
+                ),
                 new Promise((resolve) => setTimeout(resolve, 1000)), // Minimum 1-second delay
             ]);
 
             const data = await response.json();
-            setDocuments(data);
+            setDocuments(data.documents);
+            setDocumentsTotal(data.total ?? data.documents.length);
         } catch (err) {
             console.error('Error fetching documents:', err);
         } finally {
@@ -144,7 +148,7 @@ export default function SearchPage() {
                         </div>
                         <p className="text-sm text-slate-500 flex items-center gap-2">
                             <FileText className="w-4 h-4" />
-                            {documents.length} legal documents available for search
+                            {documentsTotal} legal documents available for search
                         </p>
                     </form>
                 </div>